@@ -1,14 +1,18 @@
 import heapq
 import time
 import re
+from array import array
+
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS, MOVIMIENTO_INVERSO
+from tabla_hash import MULTIPLICADOR_HASH, MASCARA_64, CARGA_MAXIMA
 
 # ------------------------------ Configuración base ------------------------------
-TAMANO_TABLERO = 4
-ESTADO_OBJETIVO = tuple(list(range(1, TAMANO_TABLERO * TAMANO_TABLERO)) + [0])
-LISTA_MOVIMIENTOS = ('arriba', 'abajo', 'izquierda', 'derecha')
+# Alias del 4x4 de geometria.py (una sola definición del tablero)
+TAMANO_TABLERO = GEOMETRIA_4x4.filas
+ESTADO_OBJETIVO = GEOMETRIA_4x4.objetivo
 # Si se dibuja el cuadrado de 4x4, y se realiza las operaciones abajo y arriba, se llega justamente a la posicion buscada.
-DESPLAZAMIENTOS = {'arriba': -TAMANO_TABLERO, 'abajo': TAMANO_TABLERO, 'izquierda': -1, 'derecha': 1}
-POSICION_OBJETIVO = {v: (i // TAMANO_TABLERO, i % TAMANO_TABLERO) for i, v in enumerate(ESTADO_OBJETIVO)}
+DESPLAZAMIENTOS = GEOMETRIA_4x4.desplazamientos
+POSICION_OBJETIVO = GEOMETRIA_4x4.posicion_objetivo
 
 """
 Ejemplo posicion objetivo.
@@ -34,6 +38,22 @@ MOSTRAR_METRICAS = True    # muestra g, h, f en cada estado
 
 # Límite operativo para A*
 LIMITE_EXPANSIONES = 1_000_000
+EMPAQUETADO = False   # True => estados como enteros de 64 bits (tablero_bits.py)
+LISTA_ABIERTA = 'heap'  # 'heap' (heapq, desempate FIFO) o 'cubetas' (ColaCubetas por f y h, desempate LIFO)
+USAR_IDA = False      # True => IDA* (memoria O(profundidad)) en lugar de A*
+HEURISTICA = 'mc'     # nombre en heuristicas.py: 'mc', 'pdb' (requiere construir las tablas), 'wd', 'max_wd_mc'
+
+# A* anytime (ARA*): primera solución rápida con f = g + w*h y luego w baja hasta 1 mientras haya tiempo
+USAR_ARA = False
+PESO_INICIAL_ARA = 2.5
+PASO_PESO_ARA = 0.5
+PRESUPUESTO_SEGUNDOS_ARA = 2.0
+
+# Búsqueda con perímetro (perimetro.py): profundidad de la tabla alrededor del objetivo; 0 = desactivada
+PERIMETRO = 0
+
+# Caché persistente de soluciones (cache_soluciones.py); ARA* no la usa porque no garantiza óptimo
+USAR_CACHE = False
 
 # ------------------------------ Utilidades de tablero ------------------------------
 def indice_a_fila_columna(indice):
@@ -46,54 +66,36 @@ def fila_columna_a_indice(fila, columna): # recibe (fila, columna)
                                             # indice = 10
     return fila * TAMANO_TABLERO + columna
 
-def movimiento_valido(indice_cero, movimiento):
-    fila, columna = indice_a_fila_columna(indice_cero)
-    if movimiento == 'arriba':    return fila > 0
-    if movimiento == 'abajo':     return fila < TAMANO_TABLERO - 1
-    if movimiento == 'izquierda': return columna > 0
-    if movimiento == 'derecha':   return columna < TAMANO_TABLERO - 1
-    return False
+def movimiento_valido(indice_cero, movimiento, geometria=None):
+    # Los movimientos válidos de cada casilla ya están en la tabla de vecinos del hueco
+    return any(mov == movimiento for mov, _ in (geometria or GEOMETRIA_4x4).vecinos_hueco[indice_cero])
 
 """
-indice_cero = 10 
-emplea indice_a_fila_columna(indice_cero) -> indice_a_fila_columna(10) 
-indice_a_fila_columna(10) -> return (10//4,10%4) -> return(2,2)
-fila = 2, columna = 2
+indice_cero = 10 -> (fila 2, columna 2)
+GEOMETRIA_4x4.vecinos_hueco[10] = (('arriba', 6), ('abajo', 14), ('izquierda', 9), ('derecha', 11))
 VALIDA:
 arriba    ->  2 > 0    -> TRUE
 abajo     ->  2 < 4-1  -> TRUE
 izquierda ->  2 > 0    -> TRUE
 derecha   ->  2 < 4-1  -> TRUE
-
-
+En una esquina (indice_cero = 0) solo quedan ('abajo', 4) y ('derecha', 1).
 """
-def aplicar_movimiento(estado, movimiento):
-    """Devuelve el nuevo estado al mover el 0; None si no es válido."""
-    indice_cero = estado.index(0)
-    if not movimiento_valido(indice_cero, movimiento):
-        return None
-    delta = DESPLAZAMIENTOS[movimiento]
-    # Evitar cruzar de fila en izquierda/derecha
-    if movimiento in ('izquierda', 'derecha'):
-        f0, _ = indice_a_fila_columna(indice_cero)
-        f1, _ = indice_a_fila_columna(indice_cero + delta)
-        if f0 != f1:
-            return None
-    lista = list(estado)
-    j = indice_cero + delta
-    lista[indice_cero], lista[j] = lista[j], lista[indice_cero]
-    return tuple(lista)
-
-def imprimir_tablero(estado):
-    for fila in range(TAMANO_TABLERO):
-        segmento = estado[fila * TAMANO_TABLERO:(fila + 1) * TAMANO_TABLERO]
+def aplicar_movimiento(estado, movimiento, geometria=None):
+    """Devuelve el nuevo estado al mover el 0; None si no es válido (delega en Geometria.aplicar_movimiento)."""
+    return (geometria or GEOMETRIA_4x4).aplicar_movimiento(estado, movimiento)
+
+def imprimir_tablero(estado, geometria=None):
+    geo = geometria or GEOMETRIA_4x4
+    for fila in range(geo.filas):
+        segmento = estado[fila * geo.columnas:(fila + 1) * geo.columnas]
         print(' '.join(f'{x:2d}' if x != 0 else '  .' for x in segmento))
 
-def imprimir_tablero_resaltado(estado, indice_resaltado=None):
-    for fila in range(TAMANO_TABLERO):
+def imprimir_tablero_resaltado(estado, indice_resaltado=None, geometria=None):
+    geo = geometria or GEOMETRIA_4x4
+    for fila in range(geo.filas):
         celdas = []
-        for columna in range(TAMANO_TABLERO):
-            idx = fila_columna_a_indice(fila, columna)
+        for columna in range(geo.columnas):
+            idx = fila * geo.columnas + columna
             val = estado[idx]
             celda = f'{val:2d}' if val != 0 else '  .'
             if indice_resaltado is not None and idx == indice_resaltado:
@@ -130,51 +132,136 @@ def explicar_paridad(estado):
     print(f"(I + R) = {I + R}  →  {'IMPAR (RESOLUBLE)' if (I+R)%2==1 else 'PAR (NO RESOLUBLE)'}")
 
 # ------------------------------ Heurística: Manhattan + Conflicto Lineal ------------------------------
-def distancia_manhattan(estado):
+# Todas aceptan geometria (geometria.py) para otros tamaños; None = 4x4.
+def distancia_manhattan(estado, geometria=None):
+    distancia_ficha = (geometria or GEOMETRIA_4x4).distancia_ficha  # [v][i] precalculado
     total = 0
     for i, v in enumerate(estado):
-        if v == 0:
-            continue
-        f, c = indice_a_fila_columna(i)
-        fo, co = POSICION_OBJETIVO[v]
-        total += abs(f - fo) + abs(c - co)
+        total += distancia_ficha[v][i]
     return total
 
-def conflicto_lineal(estado):
+def conflicto_fila(valores, f, geometria=None):
+    """Pares invertidos entre las fichas de la fila f (valores en orden de columna) que pertenecen a esa fila."""
+    posicion_objetivo = (geometria or GEOMETRIA_4x4).posicion_objetivo
+    cols_obj = []
+    for v in valores:
+        if v != 0 and posicion_objetivo[v][0] == f:
+            cols_obj.append(posicion_objetivo[v][1])
+    conf = 0
+    for i in range(len(cols_obj)):
+        for j in range(i+1, len(cols_obj)):
+            if cols_obj[i] > cols_obj[j]:
+                conf += 1
+    return conf
+
+def conflicto_columna(valores, c, geometria=None):
+    """Pares invertidos entre las fichas de la columna c (valores en orden de fila) que pertenecen a esa columna."""
+    posicion_objetivo = (geometria or GEOMETRIA_4x4).posicion_objetivo
+    filas_obj = []
+    for v in valores:
+        if v != 0 and posicion_objetivo[v][1] == c:
+            filas_obj.append(posicion_objetivo[v][0])
+    conf = 0
+    for i in range(len(filas_obj)):
+        for j in range(i+1, len(filas_obj)):
+            if filas_obj[i] > filas_obj[j]:
+                conf += 1
+    return conf
+
+def conflicto_lineal(estado, geometria=None):
+    geo = geometria or GEOMETRIA_4x4
     conf = 0
     # Filas
-    for f in range(TAMANO_TABLERO):
-        cols_obj = []
-        for c in range(TAMANO_TABLERO):
-            v = estado[f*TAMANO_TABLERO + c]
-            if v != 0 and POSICION_OBJETIVO[v][0] == f:
-                cols_obj.append(POSICION_OBJETIVO[v][1])
-        for i in range(len(cols_obj)):
-            for j in range(i+1, len(cols_obj)):
-                if cols_obj[i] > cols_obj[j]:
-                    conf += 1
+    for f, indices in enumerate(geo.indices_fila):
+        conf += conflicto_fila([estado[i] for i in indices], f, geo)
     # Columnas
-    for c in range(TAMANO_TABLERO):
-        filas_obj = []
-        for f in range(TAMANO_TABLERO):
-            v = estado[f*TAMANO_TABLERO + c]
-            if v != 0 and POSICION_OBJETIVO[v][1] == c:
-                filas_obj.append(POSICION_OBJETIVO[v][0])
-        for i in range(len(filas_obj)):
-            for j in range(i+1, len(filas_obj)):
-                if filas_obj[i] > filas_obj[j]:
-                    conf += 1
+    for c, indices in enumerate(geo.indices_columna):
+        conf += conflicto_columna([estado[i] for i in indices], c, geo)
     return 2 * conf
 
-def heuristica_mc(estado):
-    return distancia_manhattan(estado) + conflicto_lineal(estado)
+def heuristica_mc(estado, geometria=None):
+    return distancia_manhattan(estado, geometria) + conflicto_lineal(estado, geometria)
+
+# ------------------------------ Heurística incremental ------------------------------
+def _incremento_mc(valores_linea, indice_cero, h_padre, ficha, movimiento, geo):
+    """valores_linea(indices) devuelve las fichas del hijo en esas casillas (de la lista o del código)."""
+    destino = indice_cero - geo.desplazamientos[movimiento]  # donde estaba el hueco, ahora la ficha
+    origen = indice_cero                                       # donde estaba la ficha, ahora el hueco
+    h = h_padre + geo.distancia_ficha[ficha][destino] - geo.distancia_ficha[ficha][origen]
+
+    if movimiento in ('izquierda', 'derecha'):
+        lineas, conflicto = (origen % geo.columnas, destino % geo.columnas), conflicto_columna
+        indices_linea = geo.indices_columna
+    else:
+        lineas, conflicto = (origen // geo.columnas, destino // geo.columnas), conflicto_fila
+        indices_linea = geo.indices_fila
+
+    delta = 0
+    for k in lineas:
+        indices = indices_linea[k]
+        hijo = valores_linea(indices)
+        # en el padre la ficha seguía en origen y el hueco en destino
+        padre = [ficha if i == origen else 0 if i == destino else v for i, v in zip(indices, hijo)]
+        delta += conflicto(hijo, k, geo) - conflicto(padre, k, geo)
+    return h + 2 * delta
+
+def heuristica_mc_incremental(estado, indice_cero, h_padre, ficha, movimiento, geometria=None):
+    """
+    Devuelve heuristica_mc(estado) a partir del h del padre.
+    estado e indice_cero son los del hijo; ficha es la que se movió y movimiento el del hueco.
+    Solo se recalcula la Manhattan de esa ficha y el conflicto de las líneas que cambió:
+    - movimiento horizontal: la ficha cambia de columna (su fila no cambia de orden) -> 2 columnas
+    - movimiento vertical: la ficha cambia de fila -> 2 filas
+    """
+    return _incremento_mc(lambda indices: [estado[i] for i in indices], indice_cero, h_padre, ficha, movimiento,
+                          geometria or GEOMETRIA_4x4)
+
+def heuristica_mc_incremental_codigo(codigo, indice_cero, h_padre, ficha, movimiento, geometria=None):
+    """Igual que heuristica_mc_incremental(), pero el hijo es un código empaquetado: solo se leen las 2 líneas."""
+    geo = geometria or GEOMETRIA_4x4
+    desp, mascara = geo.desplazamiento_bits, geo.mascara_casilla
+    return _incremento_mc(lambda indices: [(codigo >> desp[i]) & mascara for i in indices], indice_cero, h_padre,
+                          ficha, movimiento, geo)
+
+def comprobar_heuristica_incremental(pasos=10000, semilla=0, geometria=None):
+    """Recorre un camino aleatorio y verifica que las versiones incrementales coincidan con heuristica_mc."""
+    import random
+    geo = geometria or GEOMETRIA_4x4
+    generador = random.Random(semilla)
+    estado = geo.objetivo
+    h = heuristica_mc(estado, geo)
+    for paso in range(pasos):
+        mov = generador.choice(LISTA_MOVIMIENTOS)
+        nuevo = geo.aplicar_movimiento(estado, mov)
+        if nuevo is None:
+            continue
+        cero = nuevo.index(0)
+        h_codigo = heuristica_mc_incremental_codigo(geo.empaquetar(nuevo)[0], cero, h, estado[cero], mov, geo)
+        h = heuristica_mc_incremental(nuevo, cero, h, estado[cero], mov, geo)
+        if h != heuristica_mc(nuevo, geo) or h_codigo != h:
+            raise AssertionError(f"Paso {paso}: incremental={h}  completa={heuristica_mc(nuevo, geo)}  estado={nuevo}")
+        estado = nuevo
+    return True
 
 # ------------------------------ A* (h = Manhattan + Conflicto Lineal) ------------------------------
-def a_estrella(estado_inicial, imprimir_progreso=True, frecuencia_progreso=10000, limite_expansiones=LIMITE_EXPANSIONES):
-    """Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si se alcanza el límite."""
-    h = heuristica_mc
-    if estado_inicial == ESTADO_OBJETIVO:
+def a_estrella(estado_inicial, imprimir_progreso=True, frecuencia_progreso=10000, limite_expansiones=LIMITE_EXPANSIONES,
+               empaquetado=False, heuristica=heuristica_mc, timeout_segundos=None, geometria=None, telemetria=None,
+               lista_abierta='heap'):
+    """Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si se alcanza el límite/timeout.
+    Con empaquetado=True los estados internos son enteros de 64 bits (ver tablero_bits.py).
+    lista_abierta='cubetas' usa ColaCubetas en vez de heapq (implica empaquetado).
+    heuristica recibe la tupla de 16 valores; debe ser admisible para que el camino sea óptimo.
+    geometria (geometria.py) permite otros tamaños; None = 4x4.
+    telemetria(g, h, tam_abiertos) se llama en cada expansión si se indica (ver benchmark.py)."""
+    geo = geometria or GEOMETRIA_4x4
+    incremental = heuristica is heuristica_mc  # solo MC tiene versión incremental
+    h = (lambda e: heuristica_mc(e, geo)) if incremental else heuristica
+    objetivo = geo.objetivo
+    if estado_inicial == objetivo:
         return [], 0
+    if empaquetado or lista_abierta == 'cubetas':
+        return a_estrella_empaquetado(estado_inicial, imprimir_progreso, frecuencia_progreso, limite_expansiones,
+                                      heuristica, timeout_segundos, geo, telemetria, lista_abierta=lista_abierta)
 
     costo_desde_inicio = {estado_inicial: 0}  # g
     predecesor = {estado_inicial: (None, None)}  # estado -> (anterior, movimiento)
@@ -182,6 +269,7 @@ def a_estrella(estado_inicial, imprimir_progreso=True, frecuencia_progreso=10000
     abiertos_heap = []  # (f, h, tie, estado)
     contador_orden = 0
     expandidos = 0
+    t0 = time.time()
 
     f0 = h(estado_inicial)
     heapq.heappush(abiertos_heap, (f0, f0, contador_orden, estado_inicial))
@@ -191,29 +279,34 @@ def a_estrella(estado_inicial, imprimir_progreso=True, frecuencia_progreso=10000
         if estado in cerrados:
             continue
 
-        if estado == ESTADO_OBJETIVO:
+        if estado == objetivo:
             # reconstruir camino
             camino = []
             cur = estado
             while predecesor[cur][0] is not None:
                 ant, mov = predecesor[cur]
                 camino.append(mov or "")
-                cur = ant or ESTADO_OBJETIVO
+                cur = ant or objetivo
             camino.reverse()
             return camino, expandidos
 
         cerrados.add(estado)
         expandidos += 1
 
+        if telemetria is not None:
+            telemetria(costo_desde_inicio[estado], h_actual, len(abiertos_heap))
         if imprimir_progreso and expandidos % frecuencia_progreso == 0:
             print(f"[A*] Expandidos: {expandidos:,}  f={f_actual}  h={h_actual}  g={costo_desde_inicio[estado]}")
 
         if expandidos >= limite_expansiones:
             return None, expandidos
+        if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+            return None, expandidos
 
         g_s = costo_desde_inicio[estado]
+        cero = estado.index(0)
         for mov in LISTA_MOVIMIENTOS:  # orden determinista
-            vecino = aplicar_movimiento(estado, mov)
+            vecino = geo.aplicar_movimiento(estado, mov)
             if vecino is None:
                 continue
             tent = g_s + 1
@@ -222,19 +315,416 @@ def a_estrella(estado_inicial, imprimir_progreso=True, frecuencia_progreso=10000
             if tent < costo_desde_inicio.get(vecino, float('inf')):
                 costo_desde_inicio[vecino] = tent
                 predecesor[vecino] = (estado, mov)
-                hv = h(vecino)
+                if incremental:
+                    j = cero + geo.desplazamientos[mov]
+                    hv = heuristica_mc_incremental(vecino, j, h_actual, estado[j], mov, geo)
+                else:
+                    hv = h(vecino)
                 fv = tent + hv
                 contador_orden += 1
                 heapq.heappush(abiertos_heap, (fv, hv, contador_orden, vecino))
     return None, expandidos
 
+# ------------------------------ Almacén de nodos (direccionamiento abierto) ------------------------------
+'''
+a_estrella_empaquetado guarda cada nodo una sola vez, en arreglos paralelos indexados por número de nodo:
+    codigos[n]      -> código empaquetado del estado
+    costos[n]       -> g
+    padres[n]       -> número de nodo del predecesor (-1 en el inicial)
+    movimientos[n]  -> índice en LISTA_MOVIMIENTOS del movimiento de llegada
+    huecos[n]       -> posición del hueco
+    cerrados[n]     -> 1 si ya se expandió
+La tabla ranuras (sondeo lineal sobre el código, como en bfs_compacto) guarda n+1 (0 = libre), así que
+una búsqueda resuelve g, padre y cerrado a la vez. El heap guarda un solo entero por entrada:
+    (f << 80) | (h << 72) | (orden << 32) | n
+que se compara igual que la tupla (f, h, orden) de a_estrella() (h < 256, menos de 2^32 nodos).
+'''
+BITS_NODO = 32
+MASCARA_NODO = (1 << BITS_NODO) - 1
+
+def crecer_ranuras(ranuras, bits, codigos):
+    """Duplica la tabla de ranuras y reinserta todos los nodos."""
+    bits += 1
+    mascara = (1 << bits) - 1
+    nuevas = array('I', [0]) * (1 << bits)
+    for n, codigo in enumerate(codigos):
+        r = ((codigo * MULTIPLICADOR_HASH) & MASCARA_64) >> (64 - bits)
+        while nuevas[r]:
+            r = (r + 1) & mascara
+        nuevas[r] = n + 1
+    return nuevas, bits
+
+# ------------------------------ Lista abierta por cubetas ------------------------------
+class ColaCubetas:
+    """
+    Lista abierta indexada por enteros pequeños: cubetas[f][h] es una pila (LIFO dentro de la cubeta).
+    sacar() devuelve el elemento de menor f y, a igual f, de menor h, sin comparar tuplas: meter es O(1) y
+    sacar es O(1) amortizado (los punteros a la menor f y a la menor h de cada f solo avanzan entre inserciones).
+    """
+
+    def __init__(self):
+        self.cubetas = []   # cubetas[f][h] -> lista
+        self.cuenta = []    # elementos con ese f
+        self.h_min = []     # menor h posiblemente no vacía para ese f
+        self.f_min = 0
+        self.tam = 0
+
+    def __len__(self):
+        return self.tam
+
+    def meter(self, f, h, elemento):
+        while len(self.cubetas) <= f:
+            self.cubetas.append([])
+            self.cuenta.append(0)
+            self.h_min.append(0)
+        por_h = self.cubetas[f]
+        while len(por_h) <= h:
+            por_h.append([])
+        if self.cuenta[f] == 0 or h < self.h_min[f]:
+            self.h_min[f] = h
+        por_h[h].append(elemento)
+        self.cuenta[f] += 1
+        self.tam += 1
+        if f < self.f_min:
+            self.f_min = f
+
+    def sacar(self):
+        """Devuelve (f, h, elemento); IndexError si está vacía."""
+        if not self.tam:
+            raise IndexError("sacar de una ColaCubetas vacía")
+        f = self.f_min
+        while not self.cuenta[f]:
+            f += 1
+        self.f_min = f
+        por_h = self.cubetas[f]
+        h = self.h_min[f]
+        while not por_h[h]:
+            h += 1
+        self.h_min[f] = h
+        self.cuenta[f] -= 1
+        self.tam -= 1
+        return f, h, por_h[h].pop()
+
+def a_estrella_empaquetado(estado_inicial, imprimir_progreso=True, frecuencia_progreso=10000,
+                           limite_expansiones=LIMITE_EXPANSIONES, heuristica=heuristica_mc, timeout_segundos=None,
+                           geometria=None, telemetria=None, bits_iniciales=16, lista_abierta='heap'):
+    """Igual que a_estrella(), pero cada estado es un entero (16 nibbles) y los nodos viven en un almacén compacto.
+    lista_abierta='cubetas' usa ColaCubetas (desempate LIFO) en lugar del heap (desempate FIFO)."""
+    geo = geometria or GEOMETRIA_4x4
+    if geo.bits_codigo > 64:
+        raise ValueError(f"{geo}: el código empaquetado ocupa {geo.bits_codigo} bits y el almacén solo admite 64")
+    incremental = heuristica is heuristica_mc
+    h = (lambda e: heuristica_mc(e, geo)) if incremental else heuristica
+    vecinos_hueco, desp, mascara, desempaquetar = (geo.vecinos_hueco, geo.desplazamiento_bits,
+                                                   geo.mascara_casilla, geo.desempaquetar)
+    codigo_objetivo = geo.codigo_objetivo
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    if codigo_inicial == codigo_objetivo:
+        return [], 0
+    indice_movimiento = {m: i for i, m in enumerate(LISTA_MOVIMIENTOS)}
+
+    codigos, costos, padres = array('Q', [codigo_inicial]), array('H', [0]), array('i', [-1])
+    movimientos, huecos, cerrados = bytearray(1), bytearray([cero_inicial]), bytearray(1)
+    bits = bits_iniciales
+    ranuras = array('I', [0]) * (1 << bits)
+    mascara_ranuras = (1 << bits) - 1
+    r = ((codigo_inicial * MULTIPLICADOR_HASH) & MASCARA_64) >> (64 - bits)
+    ranuras[r] = 1
+
+    abiertos_heap = []  # enteros (f, h, orden, nodo) empaquetados
+    contador_orden = 0
+    expandidos = 0
+    t0 = time.time()
+
+    cubetas = ColaCubetas() if lista_abierta == 'cubetas' else None
+    abiertos = abiertos_heap if cubetas is None else cubetas
+    f0 = h(estado_inicial)
+    if cubetas is None:
+        heapq.heappush(abiertos_heap, (f0 << 80) | (f0 << 72))
+    else:
+        cubetas.meter(f0, f0, 0)
+
+    while abiertos:
+        if cubetas is None:
+            entrada = heapq.heappop(abiertos_heap)
+            nodo = entrada & MASCARA_NODO
+            f_actual, h_actual = entrada >> 80, (entrada >> 72) & 0xFF
+        else:
+            f_actual, h_actual, nodo = cubetas.sacar()
+        if cerrados[nodo]:
+            continue
+        codigo, cero = codigos[nodo], huecos[nodo]
+
+        if codigo == codigo_objetivo:
+            camino = []
+            while padres[nodo] >= 0:
+                camino.append(LISTA_MOVIMIENTOS[movimientos[nodo]])
+                nodo = padres[nodo]
+            camino.reverse()
+            return camino, expandidos
+
+        cerrados[nodo] = 1
+        expandidos += 1
+        g_s = costos[nodo]
+
+        if telemetria is not None:
+            telemetria(g_s, h_actual, len(abiertos))
+        if imprimir_progreso and expandidos % frecuencia_progreso == 0:
+            print(f"[A*] Expandidos: {expandidos:,}  f={f_actual}  h={h_actual}  g={g_s}  nodos={len(codigos):,}")
+
+        if expandidos >= limite_expansiones:
+            return None, expandidos
+        if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+            return None, expandidos
+
+        tent = g_s + 1
+        for mov, j in vecinos_hueco[cero]:  # orden determinista
+            ficha = (codigo >> desp[j]) & mascara
+            vecino = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+            r = ((vecino * MULTIPLICADOR_HASH) & MASCARA_64) >> (64 - bits)
+            while True:
+                n = ranuras[r]
+                if n == 0 or codigos[n - 1] == vecino:
+                    break
+                r = (r + 1) & mascara_ranuras
+            if n:
+                n -= 1
+                if tent >= costos[n]:
+                    continue
+                costos[n], padres[n], movimientos[n] = tent, nodo, indice_movimiento[mov]
+            else:
+                n = len(codigos)
+                ranuras[r] = n + 1
+                codigos.append(vecino)
+                costos.append(tent)
+                padres.append(nodo)
+                movimientos.append(indice_movimiento[mov])
+                huecos.append(j)
+                cerrados.append(0)
+                if len(codigos) > CARGA_MAXIMA * (mascara_ranuras + 1):
+                    ranuras, bits = crecer_ranuras(ranuras, bits, codigos)
+                    mascara_ranuras = (1 << bits) - 1
+            if incremental:
+                hv = heuristica_mc_incremental_codigo(vecino, j, h_actual, ficha, mov, geo)
+            else:
+                hv = h(desempaquetar(vecino))
+            if cubetas is None:
+                contador_orden += 1
+                heapq.heappush(abiertos_heap, ((tent + hv) << 80) | (hv << 72) | (contador_orden << BITS_NODO) | n)
+            else:
+                cubetas.meter(tent + hv, hv, n)
+    return None, expandidos
+
+# ------------------------------ IDA* (memoria proporcional a la profundidad) ------------------------------
+def ida_estrella(estado_inicial, imprimir_progreso=True, limite_expansiones=LIMITE_EXPANSIONES,
+                 heuristica=heuristica_mc, timeout_segundos=None, geometria=None, telemetria=None):
+    """
+    Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si se alcanza el límite/timeout.
+    Profundización iterativa sobre f = g + h_MC. Solo guarda el camino actual: un único tablero
+    mutable donde se hace y deshace cada movimiento, sin generar nunca el inverso del anterior.
+    """
+    geo = geometria or GEOMETRIA_4x4
+    incremental = heuristica is heuristica_mc
+    h = (lambda e: heuristica_mc(e, geo)) if incremental else heuristica
+    objetivo = geo.objetivo
+    if estado_inicial == objetivo:
+        return [], 0
+
+    tablero = list(estado_inicial)
+    camino = []
+    expandidos = 0
+    umbral = h(tablero)
+    t0 = time.time()
+
+    def buscar(g, cero, ultimo, hv):
+        # Devuelve True si encontró el objetivo; si no, el menor f que superó el umbral
+        nonlocal expandidos
+        f = g + hv
+        if f > umbral:
+            return f
+        if hv == 0 and tuple(tablero) == objetivo:
+            return True
+        if expandidos >= limite_expansiones:
+            return None
+        if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+            return None
+        expandidos += 1
+        if telemetria is not None:
+            telemetria(g, hv, g)  # la "lista abierta" de IDA* es el camino actual
+        minimo = float('inf')
+        for mov, j in geo.vecinos_hueco[cero]:  # orden determinista
+            if ultimo is not None and mov == MOVIMIENTO_INVERSO[ultimo]:
+                continue
+            ficha = tablero[j]
+            tablero[cero], tablero[j] = ficha, 0   # hacer
+            camino.append(mov)
+            if incremental:
+                h_hijo = heuristica_mc_incremental(tablero, j, hv, ficha, mov, geo)
+            else:
+                h_hijo = h(tablero)
+            res = buscar(g + 1, j, mov, h_hijo)
+            if res is True or res is None:
+                return res
+            camino.pop()
+            tablero[j], tablero[cero] = tablero[cero], 0  # deshacer
+            if res < minimo:
+                minimo = res
+        return minimo
+
+    while True:
+        res = buscar(0, tablero.index(0), None, h(tablero))
+        if res is True:
+            return camino, expandidos
+        if res is None or res == float('inf'):
+            return None, expandidos
+        umbral = res
+        if imprimir_progreso:
+            print(f"[IDA*] Nuevo umbral: {umbral}  expandidos={expandidos:,}")
+
+# ------------------------------ ARA* (A* anytime con peso decreciente) ------------------------------
+def ara_estrella(estado_inicial, peso_inicial=PESO_INICIAL_ARA, paso_peso=PASO_PESO_ARA,
+                 presupuesto_segundos=PRESUPUESTO_SEGUNDOS_ARA, limite_expansiones=LIMITE_EXPANSIONES,
+                 heuristica=heuristica_mc, imprimir_progreso=True, geometria=None):
+    """
+    Devuelve (mejor_camino, nodos_expandidos, soluciones); mejor_camino es None si no hubo ninguna a tiempo.
+    soluciones: una entrada por mejora {'largo', 'peso', 'cota', 'tiempo_s', 'expandidos'}, donde cota es la
+    garantía demostrada largo <= cota * óptimo. Si el presupuesto se acaba a mitad de la primera iteración no
+    hay garantía: la entrada lleva cota=None; y si se acaba antes de la primera solución se devuelve
+    (None, expandidos, []).
+
+    Cada iteración es un A* con f = g + w*h. Al bajar w no se empieza de cero: se conservan g y predecesores,
+    los estados mejorados ya cerrados (INCONS) vuelven a abiertos y solo se reordena el heap con el nuevo peso.
+    La cota es min(w, g(objetivo) / min(g + h) sobre abiertos e INCONS).
+    """
+    geo = geometria or GEOMETRIA_4x4
+    incremental = heuristica is heuristica_mc
+    h = (lambda e: heuristica_mc(e, geo)) if incremental else heuristica
+    vecinos_hueco, desp, mascara, desempaquetar = (geo.vecinos_hueco, geo.desplazamiento_bits,
+                                                   geo.mascara_casilla, geo.desempaquetar)
+    codigo_objetivo = geo.codigo_objetivo
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    if codigo_inicial == codigo_objetivo:
+        return [], 0, [{'largo': 0, 'peso': 1.0, 'cota': 1.0, 'tiempo_s': 0.0, 'expandidos': 0}]
+
+    t0 = time.time()
+    infinito = float('inf')
+    costo_desde_inicio = {codigo_inicial: 0}         # g
+    predecesor = {codigo_inicial: (None, None)}      # codigo -> (codigo_anterior, movimiento)
+    valor_h = {codigo_inicial: h(estado_inicial)}    # h de cada estado generado (para reordenar al cambiar w)
+    hueco = {codigo_inicial: cero_inicial}
+    abiertos = {codigo_inicial}
+    cerrados = set()
+    inconsistentes = set()
+    contador_orden = 0
+    expandidos = 0
+    peso = peso_inicial
+    mejor_camino = None
+    mejor_cota = infinito
+    soluciones = []
+
+    def reordenar():
+        # El heap se reconstruye con el peso actual: (g + w*h, h, tie, codigo)
+        nonlocal contador_orden
+        heap = []
+        for c in abiertos:
+            contador_orden += 1
+            heap.append((costo_desde_inicio[c] + peso * valor_h[c], valor_h[c], contador_orden, c))
+        heapq.heapify(heap)
+        return heap
+
+    abiertos_heap = reordenar()
+    while True:
+        # ---- ImprovePath con el peso actual ----
+        sin_tiempo = False
+        while abiertos_heap:
+            if abiertos_heap[0][0] >= costo_desde_inicio.get(codigo_objetivo, infinito):
+                break
+            _, h_actual, _, codigo = heapq.heappop(abiertos_heap)
+            if codigo not in abiertos:
+                continue  # entrada vieja: el estado ya se expandió con un g mejor
+            if (time.time() - t0) >= presupuesto_segundos or expandidos >= limite_expansiones:
+                sin_tiempo = True
+                break
+            abiertos.discard(codigo)
+            cerrados.add(codigo)
+            expandidos += 1
+
+            cero = hueco[codigo]
+            tent = costo_desde_inicio[codigo] + 1
+            for mov, j in vecinos_hueco[cero]:  # orden determinista
+                ficha = (codigo >> desp[j]) & mascara
+                vecino = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+                if tent >= costo_desde_inicio.get(vecino, infinito):
+                    continue
+                costo_desde_inicio[vecino] = tent
+                predecesor[vecino] = (codigo, mov)
+                if vecino not in valor_h:
+                    if incremental:
+                        valor_h[vecino] = heuristica_mc_incremental_codigo(vecino, j, h_actual, ficha, mov, geo)
+                    else:
+                        valor_h[vecino] = h(desempaquetar(vecino))
+                    hueco[vecino] = j
+                if vecino in cerrados:
+                    inconsistentes.add(vecino)
+                else:
+                    abiertos.add(vecino)
+                    contador_orden += 1
+                    heapq.heappush(abiertos_heap, (tent + peso * valor_h[vecino], valor_h[vecino], contador_orden, vecino))
+
+        # ---- Publicar la mejora (camino más corto o cota más ajustada) ----
+        g_objetivo = costo_desde_inicio.get(codigo_objetivo, infinito)
+        if g_objetivo < infinito:
+            cota = mejor_cota
+            if not sin_tiempo:
+                pendientes = [costo_desde_inicio[c] + valor_h[c] for c in abiertos | inconsistentes]
+                minimo = min(pendientes) if pendientes else g_objetivo
+                cota = min(peso, g_objetivo / minimo) if minimo > 0 else peso
+                cota = max(cota, 1.0)
+            mejora_camino = mejor_camino is None or g_objetivo < len(mejor_camino)
+            if mejora_camino or cota < mejor_cota:
+                if mejora_camino:
+                    camino = []
+                    cur = codigo_objetivo
+                    while predecesor[cur][0] is not None:
+                        ant, mov = predecesor[cur]
+                        camino.append(mov)
+                        cur = ant
+                    camino.reverse()
+                    mejor_camino = camino
+                mejor_cota = min(mejor_cota, cota)
+                demostrada = mejor_cota < infinito  # no, si el tiempo se acabó en la primera iteración
+                soluciones.append({'largo': len(mejor_camino), 'peso': peso,
+                                   'cota': round(mejor_cota, 4) if demostrada else None,
+                                   'tiempo_s': round(time.time() - t0, 4), 'expandidos': expandidos})
+                if imprimir_progreso:
+                    texto_cota = f"cota={mejor_cota:.3f}" if demostrada else "sin cota"
+                    print(f"[ARA*] w={peso:.2f}  largo={len(mejor_camino)}  {texto_cota}  "
+                          f"expandidos={expandidos:,}  t={time.time() - t0:.2f}s")
+
+        # sin tiempo, o la iteración con w = 1 terminó / la cota ya es 1: el camino es óptimo
+        if sin_tiempo or peso <= 1.0 or mejor_cota <= 1.0:
+            break
+
+        # ---- Siguiente iteración: w menor, INCONS a abiertos, cerrados vacío ----
+        peso = max(1.0, peso - paso_peso)
+        abiertos |= inconsistentes
+        inconsistentes = set()
+        cerrados = set()
+        abiertos_heap = reordenar()
+
+    if mejor_camino is None:
+        return None, expandidos, []  # el presupuesto se acabó antes de la primera solución
+    return mejor_camino, expandidos, soluciones
+
 # ------------------------------ Parser estricto e input interactivo ------------------------------
-def parsear_tablero_estricto(texto):
-    """Devuelve tupla de 16 ints (0..15) si es válido; si no, imprime error y devuelve None."""
+def parsear_tablero_estricto(texto, geometria=None):
+    """Devuelve tupla de 16 ints (0..15) si es válido; si no, imprime error y devuelve None.
+    Con geometria se esperan filas*columnas valores (0..n-1)."""
+    n = (geometria or GEOMETRIA_4x4).num_casillas
     tokens = re.split(r"[,\s]+", texto.strip())
     tokens = [t for t in tokens if t != ""]
-    if len(tokens) != TAMANO_TABLERO * TAMANO_TABLERO:
-        print(f"\nEntrada inválida: se leyeron {len(tokens)} valores, se requieren {TAMANO_TABLERO*TAMANO_TABLERO}.")
+    if len(tokens) != n:
+        print(f"\nEntrada inválida: se leyeron {len(tokens)} valores, se requieren {n}.")
         return None
 
     valores = []
@@ -245,12 +735,12 @@ def parsear_tablero_estricto(texto):
             print(f"\nEntrada inválida: '{t}' no es un número entero.")
             return None
 
-    fuera_de_rango = [x for x in valores if not (0 <= x <= 15)]
+    fuera_de_rango = [x for x in valores if not (0 <= x <= n - 1)]
     if fuera_de_rango:
-        print("Valores fuera de rango [0..15]:", sorted(set(fuera_de_rango)))
+        print(f"Valores fuera de rango [0..{n - 1}]:", sorted(set(fuera_de_rango)))
         return None
 
-    esperados = set(range(16))
+    esperados = set(range(n))
     s = set(valores)
     duplicados = sorted([x for x in s if valores.count(x) > 1])
     faltantes = sorted(list(esperados - s))
@@ -303,13 +793,23 @@ def reproducir_movimientos(estado_inicial, lista_movimientos, pausa_segundos=PAU
         print(f"\nPaso {paso}: mover {movimiento}")
         imprimir_tablero_resaltado(estado, indice_resaltado=idx0_antes)
         if mostrar_metricas:
-            h = heuristica_mc(estado)
-            print(f"g={paso}  h={h}  f={paso + h}")
+            h0 = heuristica_mc_incremental(estado, estado.index(0), h0, estado[idx0_antes], movimiento)
+            print(f"g={paso}  h={h0}  f={paso + h0}")
         time.sleep(pausa_segundos)
     print("\nEstado completo finalizado.")
 
 # ------------------------------ Main ------------------------------
 if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ['comprobar']:
+        # python aestrella.py comprobar [pasos]: la heurística incremental contra heuristica_mc en varios tamaños
+        from geometria import obtener_geometria
+        pasos = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        for filas, columnas in ((3, 3), (4, 4), (3, 4), (5, 5)):
+            comprobar_heuristica_incremental(pasos, geometria=obtener_geometria(filas, columnas))
+            print(f"{filas}x{columnas}: heurística incremental OK en {pasos:,} pasos")
+        raise SystemExit(0)
+
     print("           15-puzzle — A* (Manhattan + Conflicto Lineal)          \n")
     tablero = pedir_tablero_interactivo()
     if tablero is None:
@@ -329,12 +829,39 @@ if __name__ == "__main__":
     h_ini = heuristica_mc(tablero)
     print(f"\nh_MC(inicio) = {h_ini}  (cota inferior de pasos restantes)")
 
-    solucion, expandidos = a_estrella(
-        tablero,
-        imprimir_progreso=True,
-        frecuencia_progreso=10000,
-        limite_expansiones=LIMITE_EXPANSIONES
-    )
+    heuristica = heuristica_mc
+    if HEURISTICA != 'mc':
+        from heuristicas import obtener_heuristica
+        heuristica = obtener_heuristica(HEURISTICA)
+        print(f"h_{HEURISTICA}(inicio) = {heuristica(tablero)}")
+
+    if USAR_ARA:
+        solucion, expandidos, soluciones = ara_estrella(
+            tablero,
+            presupuesto_segundos=PRESUPUESTO_SEGUNDOS_ARA,
+            limite_expansiones=LIMITE_EXPANSIONES,
+            heuristica=heuristica
+        )
+        if soluciones and soluciones[-1]['cota'] is not None:
+            print(f"Mejor cota demostrada: largo <= {soluciones[-1]['cota']} x óptimo")
+        elif soluciones:
+            print("Sin cota demostrada: el presupuesto se acabó en la primera iteración")
+    else:
+        buscar = ida_estrella if USAR_IDA else a_estrella
+        opciones = dict(imprimir_progreso=True, limite_expansiones=LIMITE_EXPANSIONES, heuristica=heuristica)
+        if PERIMETRO:
+            from perimetro import Perimetro, a_estrella_perimetro
+            perimetro = Perimetro(PERIMETRO)
+            buscar = lambda e, **op: a_estrella_perimetro(e, perimetro, **op)
+        elif not USAR_IDA:
+            opciones.update(frecuencia_progreso=10000, empaquetado=EMPAQUETADO, lista_abierta=LISTA_ABIERTA)
+        if USAR_CACHE:
+            from cache_soluciones import CacheSoluciones, resolver_con_cache
+            solucion, expandidos = resolver_con_cache(tablero, lambda e: buscar(e, **opciones), CacheSoluciones())
+            if expandidos == 0 and solucion:
+                print("(solución tomada de la caché)")
+        else:
+            solucion, expandidos = buscar(tablero, **opciones)
 
     if solucion is None:
         print(f"\nNo se encontró solución dentro del límite. Nodos expandidos: {expandidos:,}")
@@ -0,0 +1,332 @@
+"""
+Banco de pruebas de los solucionadores del 15-puzzle.
+
+Genera corpus deterministas de tableros resolubles (caminatas aleatorias de profundidad fija a partir
+de una semilla), corre cada solucionador con un gancho de telemetría por nodo y guarda los resultados
+en JSON para comparar entre commits.
+
+Métricas por tablero: expandidos, tiempo, nodos/s, tamaño máximo de la lista abierta, pico de memoria
+del proceso, factor de ramificación efectivo b* (N + 1 = 1 + b* + ... + b*^d) y error de la heurística
+(h* - h) en el estado inicial y en promedio sobre el camino de la solución.
+
+Uso:
+    python benchmark.py corpus  --profundidades 20 40 60 --cantidad 10 --semilla 1 > corpus.txt
+    python benchmark.py correr  --solucionadores a_estrella_empaquetado ida_estrella --profundidades 20 40 \\
+                                --cantidad 10 --semilla 1 --salida resultados.json
+    python benchmark.py correr  --filas 3 --solucionadores a_estrella bfs_numpy --profundidades 10 20
+    python benchmark.py comparar base.json nuevo.json
+
+max_abiertos solo se mide en los solucionadores que aceptan telemetría (ver SOLUCIONADORES); en el resto
+queda en null.
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+import time
+
+try:
+    import resource  # no existe en Windows: ahí no se reporta pico de memoria
+except ImportError:
+    resource = None
+
+from aestrella import a_estrella, ida_estrella
+from bfs import bfs, bfs_bidireccional, bfs_compacto
+from bfs_externo import bfs_externo
+from bfs_numpy import bfs_numpy
+from geometria import GEOMETRIA_4x4, MOVIMIENTO_INVERSO, obtener_geometria
+from heuristicas import HEURISTICAS, obtener_heuristica
+from perimetro import PROFUNDIDAD_PERIMETRO, Perimetro, a_estrella_perimetro
+
+# ------------------------------ Solucionadores ------------------------------
+# nombre -> (funcion(estado, heuristica, limite, timeout, telemetria, geometria) -> (camino, expandidos),
+#            usa_heuristica, optimo, con_telemetria)
+# Los que no aceptan telemetría (con_telemetria=False) quedan sin max_abiertos en los resultados.
+SOLUCIONADORES = {
+    'a_estrella': (lambda e, h, lim, to, tel, geo: a_estrella(e, imprimir_progreso=False, limite_expansiones=lim,
+                                                              heuristica=h, timeout_segundos=to, telemetria=tel,
+                                                              geometria=geo),
+                   True, True, True),
+    'a_estrella_empaquetado': (lambda e, h, lim, to, tel, geo: a_estrella(e, imprimir_progreso=False,
+                                                                          limite_expansiones=lim, empaquetado=True,
+                                                                          heuristica=h, timeout_segundos=to,
+                                                                          telemetria=tel, geometria=geo),
+                               True, True, True),
+    'a_estrella_cubetas': (lambda e, h, lim, to, tel, geo: a_estrella(e, imprimir_progreso=False,
+                                                                      limite_expansiones=lim, lista_abierta='cubetas',
+                                                                      heuristica=h, timeout_segundos=to,
+                                                                      telemetria=tel, geometria=geo),
+                           True, True, True),
+    'a_estrella_perimetro': (lambda e, h, lim, to, tel, geo: a_estrella_perimetro(e, obtener_perimetro(),
+                                                                                  limite_expansiones=lim, heuristica=h,
+                                                                                  timeout_segundos=to),
+                             True, True, False),
+    'ida_estrella': (lambda e, h, lim, to, tel, geo: ida_estrella(e, imprimir_progreso=False, limite_expansiones=lim,
+                                                                  heuristica=h, timeout_segundos=to, telemetria=tel,
+                                                                  geometria=geo),
+                     True, True, True),
+    'bfs_empaquetado': (lambda e, h, lim, to, tel, geo: bfs(e, limite_expansiones=lim, timeout_segundos=to,
+                                                            empaquetado=True, telemetria=tel, geometria=geo),
+                        False, True, True),
+    'bfs_bidireccional': (lambda e, h, lim, to, tel, geo: bfs_bidireccional(e, limite_expansiones=lim,
+                                                                            timeout_segundos=to, geometria=geo)[:2],
+                          False, True, False),
+    'bfs_compacto': (lambda e, h, lim, to, tel, geo: bfs_compacto(e, limite_expansiones=lim, timeout_segundos=to,
+                                                                  telemetria=tel, geometria=geo),
+                     False, True, True),
+    'bfs_externo': (lambda e, h, lim, to, tel, geo: bfs_externo(e, limite_expansiones=lim, timeout_segundos=to,
+                                                                imprimir_progreso=False, geometria=geo),
+                    False, True, False),
+    'bfs_numpy': (lambda e, h, lim, to, tel, geo: bfs_numpy(e, limite_expansiones=lim, timeout_segundos=to,
+                                                            geometria=geo),
+                  False, True, False),
+}
+SOLO_4x4 = {'a_estrella_perimetro'}  # el perímetro en disco es del 15-puzzle
+
+PERIMETROS = {}
+
+def obtener_perimetro(profundidad=PROFUNDIDAD_PERIMETRO):
+    """Perímetro mapeado una sola vez por proceso."""
+    if profundidad not in PERIMETROS:
+        PERIMETROS[profundidad] = Perimetro(profundidad)
+    return PERIMETROS[profundidad]
+
+# ------------------------------ Corpus determinista ------------------------------
+def generar_tablero(profundidad, generador, geometria=None):
+    """Caminata aleatoria de exactamente `profundidad` movimientos desde el objetivo, sin deshacer el anterior."""
+    geo = geometria or GEOMETRIA_4x4
+    estado = geo.objetivo
+    ultimo = None
+    for _ in range(profundidad):
+        opciones = [m for m, _ in geo.vecinos_hueco[estado.index(0)]
+                    if ultimo is None or m != MOVIMIENTO_INVERSO[ultimo]]
+        ultimo = generador.choice(opciones)
+        estado = geo.aplicar_movimiento(estado, ultimo)
+    return estado
+
+def generar_corpus(profundidades, cantidad, semilla, geometria=None):
+    """Lista de (profundidad, indice, tablero). Misma semilla => mismo corpus en cualquier máquina."""
+    corpus = []
+    for profundidad in profundidades:
+        generador = random.Random(f"{semilla}-{profundidad}")  # independiente de las otras profundidades
+        for indice in range(cantidad):
+            corpus.append((profundidad, indice, generar_tablero(profundidad, generador, geometria)))
+    return corpus
+
+# ------------------------------ Métricas ------------------------------
+def ramificacion_efectiva(expandidos, profundidad, tolerancia=1e-6):
+    """b* tal que expandidos + 1 = 1 + b* + b*^2 + ... + b*^profundidad (bisección)."""
+    if profundidad <= 0 or expandidos <= 0:
+        return None
+    objetivo = expandidos + 1
+
+    def total(b):
+        return sum(b ** k for k in range(profundidad + 1))
+
+    bajo, alto = 1.0, float(max(2, expandidos))
+    if total(bajo) >= objetivo:
+        return 1.0
+    while alto - bajo > tolerancia:
+        medio = (bajo + alto) / 2
+        if total(medio) < objetivo:
+            bajo = medio
+        else:
+            alto = medio
+    return round((bajo + alto) / 2, 4)
+
+def error_heuristica(estado, camino, heuristica, geometria=None):
+    """
+    (h* - h) en el inicio y promedio sobre los estados del camino óptimo (h* = pasos que faltan).
+    geometria es la del corpus (generar_corpus); None = 4x4.
+    """
+    geo = geometria or GEOMETRIA_4x4
+    if len(estado) != geo.num_casillas:
+        raise ValueError(f"El tablero tiene {len(estado)} casillas y la geometría {geo} tiene {geo.num_casillas}")
+    errores = []
+    for paso, mov in enumerate(camino + [None]):
+        errores.append(len(camino) - paso - heuristica(estado))
+        if mov is not None:
+            estado = geo.aplicar_movimiento(estado, mov)
+    return errores[0], round(sum(errores) / len(errores), 4)
+
+def pico_memoria_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024, 2)  # bytes en macOS, KB en Linux
+
+# ------------------------------ Ejecución ------------------------------
+def correr_uno(tarea):
+    """Resuelve un tablero con telemetría y devuelve el registro de métricas."""
+    nombre, nombre_heuristica, limite, timeout, (filas, columnas), profundidad, indice, tablero = tarea
+    funcion, usa_heuristica, optimo, con_telemetria = SOLUCIONADORES[nombre]
+    geo = obtener_geometria(filas, columnas)
+    heuristica = obtener_heuristica(nombre_heuristica, geo)
+
+    telemetria = {'nodos': 0, 'max_abiertos': 0}
+
+    def gancho(g, h, tam_abiertos):
+        telemetria['nodos'] += 1
+        if tam_abiertos > telemetria['max_abiertos']:
+            telemetria['max_abiertos'] = tam_abiertos
+
+    t0 = time.perf_counter()
+    camino, expandidos = funcion(tablero, heuristica, limite, timeout, gancho if con_telemetria else None, geo)
+    transcurrido = time.perf_counter() - t0
+
+    registro = {
+        'solucionador': nombre, 'heuristica': nombre_heuristica if usa_heuristica else None,
+        'profundidad': profundidad, 'indice': indice, 'tablero': list(tablero),
+        'estado': 'resuelto' if camino is not None else 'sin_solucion',
+        'largo': len(camino) if camino is not None else None,
+        'expandidos': expandidos, 'tiempo_s': round(transcurrido, 6),
+        'nodos_por_s': round(expandidos / transcurrido, 1) if transcurrido > 0 else None,
+        'max_abiertos': telemetria['max_abiertos'] if con_telemetria and telemetria['nodos'] else None,
+        'pico_memoria_mb': pico_memoria_mb(),
+        'ramificacion_efectiva': None, 'h_inicial': heuristica(tablero),
+        'error_h_inicial': None, 'error_h_medio': None,
+    }
+    if camino is not None:
+        registro['ramificacion_efectiva'] = ramificacion_efectiva(expandidos, len(camino))
+        if optimo:
+            registro['error_h_inicial'], registro['error_h_medio'] = error_heuristica(tablero, camino, heuristica, geo)
+    return registro
+
+def correr(solucionadores, profundidades, cantidad, semilla, heuristica='mc', limite=1_000_000, timeout=60.0,
+           aislar=True, imprimir_progreso=True, geometria=None):
+    """
+    Corre cada solucionador sobre el corpus. Con aislar=True cada tablero se resuelve en un proceso nuevo
+    para que el pico de memoria y el tiempo no dependan de las corridas anteriores. geometria es la del
+    corpus (None = 4x4); llega a los solucionadores, a la heurística y a error_heuristica.
+    """
+    geo = geometria or GEOMETRIA_4x4
+    if geo is not GEOMETRIA_4x4 and SOLO_4x4.intersection(solucionadores):
+        raise ValueError(f"{', '.join(sorted(SOLO_4x4.intersection(solucionadores)))} solo resuelve el 4x4")
+    corpus = generar_corpus(profundidades, cantidad, semilla, geo)
+    tamano = (geo.filas, geo.columnas)
+    tareas = [(nombre, heuristica, limite, timeout, tamano, p, i, t) for nombre in solucionadores for p, i, t in corpus]
+    registros = []
+    if aislar:
+        with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+            iterador = pool.imap(correr_uno, tareas, chunksize=1)
+            for registro in iterador:
+                registros.append(registro)
+                if imprimir_progreso:
+                    imprimir_registro(registro)
+    else:
+        for tarea in tareas:
+            registro = correr_uno(tarea)
+            registros.append(registro)
+            if imprimir_progreso:
+                imprimir_registro(registro)
+    return registros
+
+def imprimir_registro(r):
+    print(f"[{r['solucionador']}] d={r['profundidad']:>3} #{r['indice']:<3} largo={r['largo']}  "
+          f"exp={r['expandidos']:,}  {r['nodos_por_s'] or 0:,.0f} nodos/s  "
+          f"abiertos={r['max_abiertos'] if r['max_abiertos'] is not None else '-'}  mem={r['pico_memoria_mb']}MB  b*={r['ramificacion_efectiva']}",
+          file=sys.stderr)
+
+def resumir(registros):
+    """Agrega por (solucionador, profundidad)."""
+    grupos = {}
+    for r in registros:
+        grupos.setdefault((r['solucionador'], r['profundidad']), []).append(r)
+    resumen = []
+    for (nombre, profundidad), lista in sorted(grupos.items()):
+        resueltos = [r for r in lista if r['estado'] == 'resuelto']
+        tiempo = sum(r['tiempo_s'] for r in lista)
+        expandidos = sum(r['expandidos'] for r in lista)
+
+        def promedio(campo):
+            valores = [r[campo] for r in resueltos if r[campo] is not None]
+            return round(sum(valores) / len(valores), 4) if valores else None
+
+        resumen.append({
+            'solucionador': nombre, 'profundidad': profundidad, 'tableros': len(lista), 'resueltos': len(resueltos),
+            'expandidos_total': expandidos, 'tiempo_total_s': round(tiempo, 4),
+            'nodos_por_s': round(expandidos / tiempo, 1) if tiempo > 0 else None,
+            'max_abiertos': max((r['max_abiertos'] for r in lista if r['max_abiertos'] is not None), default=None),
+            'pico_memoria_mb': max((r['pico_memoria_mb'] or 0) for r in lista),
+            'ramificacion_efectiva_media': promedio('ramificacion_efectiva'),
+            'error_h_inicial_medio': promedio('error_h_inicial'),
+            'error_h_medio': promedio('error_h_medio'),
+        })
+    return resumen
+
+def metadatos(argumentos):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit or None, 'python': platform.python_version(), 'plataforma': platform.platform(),
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'), 'argumentos': argumentos}
+
+# ------------------------------ Comparación entre commits ------------------------------
+def comparar(ruta_base, ruta_nueva):
+    """Imprime, por (solucionador, profundidad), el cambio relativo en expandidos, nodos/s y memoria."""
+    with open(ruta_base, encoding='utf-8') as f:
+        base = {(r['solucionador'], r['profundidad']): r for r in json.load(f)['resumen']}
+    with open(ruta_nueva, encoding='utf-8') as f:
+        nuevo = {(r['solucionador'], r['profundidad']): r for r in json.load(f)['resumen']}
+
+    def cambio(a, b):
+        if not a or b is None:
+            return '     -'
+        return f"{100.0 * (b - a) / a:+6.1f}%"
+
+    print(f"{'solucionador':<24} {'d':>4} {'expandidos':>10} {'nodos/s':>9} {'memoria':>9} {'resueltos':>10}")
+    for clave in sorted(set(base) & set(nuevo)):
+        a, b = base[clave], nuevo[clave]
+        print(f"{clave[0]:<24} {clave[1]:>4} {cambio(a['expandidos_total'], b['expandidos_total']):>10} "
+              f"{cambio(a['nodos_por_s'], b['nodos_por_s']):>9} {cambio(a['pico_memoria_mb'], b['pico_memoria_mb']):>9} "
+              f"{a['resueltos']:>4} -> {b['resueltos']:<4}")
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los solucionadores del 15-puzzle")
+    sub = parser.add_subparsers(dest='accion', required=True)
+
+    p_corpus = sub.add_parser('corpus', help="imprime el corpus (formato de lote.py)")
+    p_correr = sub.add_parser('correr', help="corre los solucionadores y guarda JSON")
+    for p in (p_corpus, p_correr):
+        p.add_argument('--profundidades', type=int, nargs='+', default=[20, 30, 40])
+        p.add_argument('--filas', type=int, default=4)
+        p.add_argument('--columnas', type=int, default=None, help="por defecto igual a --filas")
+        p.add_argument('--cantidad', type=int, default=10)
+        p.add_argument('--semilla', type=int, default=1)
+    p_correr.add_argument('--solucionadores', nargs='+', choices=sorted(SOLUCIONADORES),
+                          default=['a_estrella_empaquetado', 'ida_estrella'])
+    p_correr.add_argument('--heuristica', choices=sorted(HEURISTICAS), default='mc')
+    p_correr.add_argument('--limite', type=int, default=1_000_000)
+    p_correr.add_argument('--timeout', type=float, default=60.0)
+    p_correr.add_argument('--sin-aislar', action='store_true', help="todo en un proceso (sin pico de memoria por tablero)")
+    p_correr.add_argument('--salida', default='benchmark.json')
+
+    p_comparar = sub.add_parser('comparar', help="compara dos archivos de resultados")
+    p_comparar.add_argument('base')
+    p_comparar.add_argument('nuevo')
+    args = parser.parse_args()
+
+    if args.accion in ('corpus', 'correr'):
+        geometria = obtener_geometria(args.filas, args.columnas or args.filas)
+        solo_4x4 = SOLO_4x4.intersection(getattr(args, 'solucionadores', ()))
+        if geometria is not GEOMETRIA_4x4 and solo_4x4:
+            parser.error(f"{', '.join(sorted(solo_4x4))} solo resuelve el 4x4")
+    if args.accion == 'corpus':
+        for profundidad, indice, tablero in generar_corpus(args.profundidades, args.cantidad, args.semilla, geometria):
+            print(f"# profundidad={profundidad} indice={indice}")
+            print(' '.join(str(x) for x in tablero))
+    elif args.accion == 'correr':
+        registros = correr(args.solucionadores, args.profundidades, args.cantidad, args.semilla, args.heuristica,
+                           args.limite, args.timeout, aislar=not args.sin_aislar, geometria=geometria)
+        resultado = {'metadatos': metadatos(vars(args)), 'resumen': resumir(registros), 'registros': registros}
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=1)
+        print(f"[benchmark] {len(registros)} corridas -> {args.salida}", file=sys.stderr)
+    else:
+        comparar(args.base, args.nuevo)
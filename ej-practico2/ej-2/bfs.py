@@ -1,13 +1,19 @@
 import re
 import time
+from array import array
 from collections import deque
+from math import factorial
+
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS, MOVIMIENTO_INVERSO
+from tabla_hash import (CARGA_MAXIMA, crear_tabla, crecer_tabla, ranura_de, leer_movimiento,
+                        escribir_movimiento)
 
 # ------------------------------ Configuración base ------------------------------
-TAMANO_TABLERO = 4
-ESTADO_OBJETIVO = tuple(list(range(1, TAMANO_TABLERO * TAMANO_TABLERO)) + [0])
-LISTA_MOVIMIENTOS = ('arriba', 'abajo', 'izquierda', 'derecha')
-DESPLAZAMIENTOS = {'arriba': -TAMANO_TABLERO, 'abajo': TAMANO_TABLERO, 'izquierda': -1, 'derecha': 1}
-POSICION_OBJETIVO = {v: (i // TAMANO_TABLERO, i % TAMANO_TABLERO) for i, v in enumerate(ESTADO_OBJETIVO)}
+# Alias del 4x4 de geometria.py (una sola definición del tablero)
+TAMANO_TABLERO = GEOMETRIA_4x4.filas
+ESTADO_OBJETIVO = GEOMETRIA_4x4.objetivo
+DESPLAZAMIENTOS = GEOMETRIA_4x4.desplazamientos
+POSICION_OBJETIVO = GEOMETRIA_4x4.posicion_objetivo
 
 # Reproducción visual
 LIMPIAR_PANTALLA = False   # True => limpia pantalla en cada paso
@@ -16,6 +22,11 @@ PAUSA_SEGUNDOS = 0.25      # pausa entre pasos
 # Límites operativos BFS (puedes ajustar estas constantes si quieres)
 LIMITE_EXPANSIONES_BFS = 1_000_000
 TIMEOUT_SEGUNDOS_BFS = 30.0  # None para desactivar timeout
+EMPAQUETADO_BFS = False      # True => estados como enteros de 64 bits (tablero_bits.py)
+BIDIRECCIONAL_BFS = False    # True => busca desde el inicio y desde el objetivo a la vez
+COMPACTO_BFS = False         # True => tabla hash de códigos + 2 bits por estado (mucha menos memoria)
+EXTERNO_BFS = False          # True => capas ordenadas en disco (bfs_externo.py), sin límite de expansiones
+NUMPY_BFS = False            # True => capas vectorizadas con NumPy (bfs_numpy.py, requiere numpy)
 
 # ------------------------------ Utilidades de tablero ------------------------------
 def indice_a_fila_columna(indice):
@@ -24,41 +35,26 @@ def indice_a_fila_columna(indice):
 def fila_columna_a_indice(fila, columna):
     return fila * TAMANO_TABLERO + columna
 
-def movimiento_valido(indice_cero, movimiento):
-    fila, columna = indice_a_fila_columna(indice_cero)
-    if movimiento == 'arriba':    return fila > 0
-    if movimiento == 'abajo':     return fila < TAMANO_TABLERO - 1
-    if movimiento == 'izquierda': return columna > 0
-    if movimiento == 'derecha':   return columna < TAMANO_TABLERO - 1
-    return False
-
-def aplicar_movimiento(estado, movimiento):
-    """Devuelve el nuevo estado al mover el 0; None si no es válido."""
-    indice_cero = estado.index(0)
-    if not movimiento_valido(indice_cero, movimiento):
-        return None
-    delta = DESPLAZAMIENTOS[movimiento]
-    # Evitar cruzar de fila en izquierda/derecha
-    if movimiento in ('izquierda', 'derecha'):
-        f0, _ = indice_a_fila_columna(indice_cero)
-        f1, _ = indice_a_fila_columna(indice_cero + delta)
-        if f0 != f1:
-            return None
-    lista = list(estado)
-    j = indice_cero + delta
-    lista[indice_cero], lista[j] = lista[j], lista[indice_cero]
-    return tuple(lista)
-
-def imprimir_tablero(estado):
-    for fila in range(TAMANO_TABLERO):
-        segmento = estado[fila * TAMANO_TABLERO:(fila + 1) * TAMANO_TABLERO]
+def movimiento_valido(indice_cero, movimiento, geometria=None):
+    # Los movimientos válidos de cada casilla ya están en la tabla de vecinos del hueco
+    return any(mov == movimiento for mov, _ in (geometria or GEOMETRIA_4x4).vecinos_hueco[indice_cero])
+
+def aplicar_movimiento(estado, movimiento, geometria=None):
+    """Devuelve el nuevo estado al mover el 0; None si no es válido (delega en Geometria.aplicar_movimiento)."""
+    return (geometria or GEOMETRIA_4x4).aplicar_movimiento(estado, movimiento)
+
+def imprimir_tablero(estado, geometria=None):
+    geo = geometria or GEOMETRIA_4x4
+    for fila in range(geo.filas):
+        segmento = estado[fila * geo.columnas:(fila + 1) * geo.columnas]
         print(' '.join(f'{x:2d}' if x != 0 else '  .' for x in segmento))
 
-def imprimir_tablero_resaltado(estado, indice_resaltado=None):
-    for fila in range(TAMANO_TABLERO):
+def imprimir_tablero_resaltado(estado, indice_resaltado=None, geometria=None):
+    geo = geometria or GEOMETRIA_4x4
+    for fila in range(geo.filas):
         celdas = []
-        for columna in range(TAMANO_TABLERO):
-            idx = fila_columna_a_indice(fila, columna)
+        for columna in range(geo.columnas):
+            idx = fila * geo.columnas + columna
             val = estado[idx]
             celda = f'{val:2d}' if val != 0 else '  .'
             if indice_resaltado is not None and idx == indice_resaltado:
@@ -95,10 +91,18 @@ def explicar_paridad(estado):
     print(f"(I + R) = {I + R}  →  {'IMPAR (RESOLUBLE)' if (I+R)%2==1 else 'PAR (NO RESOLUBLE)'}")
 
 # ------------------------------ BFS (Búsqueda en anchura) ------------------------------
-def bfs(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segundos=TIMEOUT_SEGUNDOS_BFS):
-    """Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si alcanza límite/timeout."""
-    if estado_inicial == ESTADO_OBJETIVO:
+def bfs(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segundos=TIMEOUT_SEGUNDOS_BFS,
+        empaquetado=False, geometria=None, telemetria=None):
+    """Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si alcanza límite/timeout.
+    Con empaquetado=True los estados internos son enteros de 64 bits (ver tablero_bits.py).
+    geometria (geometria.py) permite otros tamaños; None = 4x4.
+    telemetria(g, h, tam_abiertos) se llama en cada expansión si se indica (g y h son None en BFS)."""
+    geo = geometria or GEOMETRIA_4x4
+    objetivo = geo.objetivo
+    if estado_inicial == objetivo:
         return [], 0
+    if empaquetado:
+        return bfs_empaquetado(estado_inicial, limite_expansiones, timeout_segundos, geo, telemetria)
 
     t0 = time.time()
     expandidos = 0
@@ -115,20 +119,22 @@ def bfs(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segun
 
         estado = cola.popleft()
         expandidos += 1
+        if telemetria is not None:
+            telemetria(None, None, len(cola))
 
         for mov in LISTA_MOVIMIENTOS:  # orden determinista
-            sucesor = aplicar_movimiento(estado, mov)
+            sucesor = geo.aplicar_movimiento(estado, mov)
             if sucesor is None or sucesor in visitados:
                 continue
             predecesor[sucesor] = (estado, mov)
-            if sucesor == ESTADO_OBJETIVO:
+            if sucesor == objetivo:
                 # reconstruir camino
                 camino = []
                 cur = sucesor
                 while predecesor[cur][0] is not None:
                     ant, m = predecesor[cur]
                     camino.append(m or "")
-                    cur = ant or ESTADO_OBJETIVO
+                    cur = ant or objetivo
                 camino.reverse()
                 return camino, expandidos
             visitados.add(sucesor)
@@ -136,13 +142,313 @@ def bfs(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segun
 
     return None, expandidos  # no debería pasar si hay solución y sin límites
 
+def bfs_empaquetado(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segundos=TIMEOUT_SEGUNDOS_BFS,
+                    geometria=None, telemetria=None):
+    """Igual que bfs(), pero cada estado es un entero (16 nibbles) y el hueco viaja al lado en la cola."""
+    geo = geometria or GEOMETRIA_4x4
+    vecinos_hueco, desp, mascara, codigo_objetivo = (geo.vecinos_hueco, geo.desplazamiento_bits,
+                                                     geo.mascara_casilla, geo.codigo_objetivo)
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    if codigo_inicial == codigo_objetivo:
+        return [], 0
+
+    t0 = time.time()
+    expandidos = 0
+
+    cola = deque([(codigo_inicial, cero_inicial)])
+    predecesor = {codigo_inicial: (None, None)}  # codigo -> (codigo_anterior, movimiento); también hace de visitados
+
+    while cola:
+        if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+            return None, expandidos
+        if expandidos >= limite_expansiones:
+            return None, expandidos
+
+        codigo, cero = cola.popleft()
+        expandidos += 1
+        if telemetria is not None:
+            telemetria(None, None, len(cola))
+
+        for mov, j in vecinos_hueco[cero]:  # orden determinista
+            # intercambio hueco <-> ficha con desplazamientos y máscaras
+            ficha = (codigo >> desp[j]) & mascara
+            sucesor = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+            if sucesor in predecesor:
+                continue
+            predecesor[sucesor] = (codigo, mov)
+            if sucesor == codigo_objetivo:
+                camino = []
+                cur = sucesor
+                while predecesor[cur][0] is not None:
+                    ant, m = predecesor[cur]
+                    camino.append(m)
+                    cur = ant
+                camino.reverse()
+                return camino, expandidos
+            cola.append((sucesor, j))
+
+    return None, expandidos
+
+# ------------------------------ BFS compacto (tabla hash abierta + 2 bits por estado) ------------------------------
+'''
+Visitados es una tabla hash abierta (tabla_hash.py): código de 64 bits + 2 bits con el movimiento de llegada.
+La frontera se guarda por capas en arreglos (código de 8 bytes + hueco de 1 byte).
+'''
+
+def bfs_compacto(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segundos=TIMEOUT_SEGUNDOS_BFS,
+                 bits_iniciales=16, geometria=None, telemetria=None):
+    """
+    Igual que bfs(), pero sin diccionarios: visitados es una tabla hash abierta de códigos de 64 bits y de cada
+    estado solo se guarda el movimiento de llegada (2 bits). El camino se reconstruye desde el objetivo
+    aplicando el movimiento inverso de cada estado hasta volver al inicial.
+    En tableros pequeños (n! <= LIMITE_RANGO_DENSO, p.ej. 3x3) se usa bfs_compacto_rango.
+    Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si alcanza límite/timeout.
+    """
+    geo = geometria or GEOMETRIA_4x4
+    if factorial(geo.num_casillas) <= LIMITE_RANGO_DENSO:
+        return bfs_compacto_rango(estado_inicial, limite_expansiones, timeout_segundos, geo, telemetria)
+    if geo.bits_codigo > 64:
+        raise ValueError(f"{geo}: el código empaquetado ocupa {geo.bits_codigo} bits y la tabla solo admite 64")
+    vecinos_hueco, desp, mascara = geo.vecinos_hueco, geo.desplazamiento_bits, geo.mascara_casilla
+    codigo_objetivo = geo.codigo_objetivo
+
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    if codigo_inicial == codigo_objetivo:
+        return [], 0
+
+    t0 = time.time()
+    expandidos = 0
+    indice_movimiento = {m: i for i, m in enumerate(LISTA_MOVIMIENTOS)}
+
+    bits = bits_iniciales
+    claves, movimientos = crear_tabla(bits)
+    ocupadas = 1
+    claves[ranura_de(claves, bits, codigo_inicial)] = codigo_inicial
+
+    frontera, huecos = array('Q', [codigo_inicial]), bytearray([cero_inicial])
+    encontrado = False
+
+    while frontera and not encontrado:
+        siguiente, huecos_siguiente = array('Q'), bytearray()
+        for codigo, cero in zip(frontera, huecos):
+            if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+                return None, expandidos
+            if expandidos >= limite_expansiones:
+                return None, expandidos
+            expandidos += 1
+            if telemetria is not None:
+                telemetria(None, None, len(frontera) + len(siguiente))
+
+            for mov, j in vecinos_hueco[cero]:  # orden determinista
+                ficha = (codigo >> desp[j]) & mascara
+                sucesor = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+                r = ranura_de(claves, bits, sucesor)
+                if claves[r]:
+                    continue
+                claves[r] = sucesor
+                escribir_movimiento(movimientos, r, indice_movimiento[mov])
+                ocupadas += 1
+                if sucesor == codigo_objetivo:
+                    encontrado = True
+                    break
+                siguiente.append(sucesor)
+                huecos_siguiente.append(j)
+                if ocupadas > CARGA_MAXIMA * (1 << bits):
+                    claves, movimientos, bits = crecer_tabla(claves, movimientos, bits)
+            if encontrado:
+                break
+        frontera, huecos = siguiente, huecos_siguiente
+
+    if not encontrado:
+        return None, expandidos
+
+    # Reconstrucción: desde el objetivo se deshace el movimiento guardado hasta llegar al inicio
+    return reconstruir_hacia_atras(codigo_inicial, geo,
+                                   lambda codigo: leer_movimiento(movimientos, ranura_de(claves, bits, codigo))), expandidos
+
+def reconstruir_hacia_atras(codigo_inicial, geo, movimiento_de_llegada):
+    """Camino inicio -> objetivo deshaciendo, desde el objetivo, el movimiento de llegada de cada estado."""
+    camino = []
+    desp, mascara = geo.desplazamiento_bits, geo.mascara_casilla
+    codigo, cero = geo.codigo_objetivo, geo.indice_cero_objetivo
+    while codigo != codigo_inicial:
+        mov = LISTA_MOVIMIENTOS[movimiento_de_llegada(codigo)]
+        camino.append(mov)
+        anterior = cero - geo.desplazamientos[mov]  # el hueco venía de aquí
+        ficha = (codigo >> desp[anterior]) & mascara
+        codigo = codigo ^ (ficha << desp[anterior]) ^ (ficha << desp[cero])
+        cero = anterior
+    camino.reverse()
+    return camino
+
+# ------------------------------ BFS compacto por rango de permutación (tableros pequeños) ------------------------------
+LIMITE_RANGO_DENSO = factorial(10)  # hasta 10 casillas (3x3, 2x5): arreglos de n! entradas
+
+def rango_permutacion(estado):
+    """Rango lexicográfico (código de Lehmer) de la permutación: 0 .. n!-1."""
+    n = len(estado)
+    rango = 0
+    for i in range(n - 1):
+        v = estado[i]
+        menores = 0
+        for j in range(i + 1, n):
+            if estado[j] < v:
+                menores += 1
+        rango = rango * (n - i) + menores
+    return rango
+
+def bfs_compacto_rango(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS,
+                       timeout_segundos=TIMEOUT_SEGUNDOS_BFS, geometria=None, telemetria=None):
+    """
+    Variante de bfs_compacto sin claves: cada estado es directamente su rango de permutación, con
+    1 bit de visitado y 2 bits de movimiento de llegada (3 bits por estado posible del tablero).
+    """
+    geo = geometria or GEOMETRIA_4x4
+    vecinos_hueco, desp, mascara = geo.vecinos_hueco, geo.desplazamiento_bits, geo.mascara_casilla
+    codigo_objetivo, desempaquetar = geo.codigo_objetivo, geo.desempaquetar
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    if codigo_inicial == codigo_objetivo:
+        return [], 0
+
+    t0 = time.time()
+    expandidos = 0
+    indice_movimiento = {m: i for i, m in enumerate(LISTA_MOVIMIENTOS)}
+    total = factorial(geo.num_casillas)
+    visitados = bytearray((total + 7) >> 3)
+    movimientos = bytearray((total + 3) >> 2)
+    r = rango_permutacion(estado_inicial)
+    visitados[r >> 3] |= 1 << (r & 7)
+
+    frontera, huecos = [codigo_inicial], bytearray([cero_inicial])
+    while frontera:
+        siguiente, huecos_siguiente = [], bytearray()
+        for codigo, cero in zip(frontera, huecos):
+            if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+                return None, expandidos
+            if expandidos >= limite_expansiones:
+                return None, expandidos
+            expandidos += 1
+            if telemetria is not None:
+                telemetria(None, None, len(frontera) + len(siguiente))
+
+            for mov, j in vecinos_hueco[cero]:  # orden determinista
+                ficha = (codigo >> desp[j]) & mascara
+                sucesor = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+                r = rango_permutacion(desempaquetar(sucesor))
+                if visitados[r >> 3] & (1 << (r & 7)):
+                    continue
+                visitados[r >> 3] |= 1 << (r & 7)
+                escribir_movimiento(movimientos, r, indice_movimiento[mov])
+                if sucesor == codigo_objetivo:
+                    camino = reconstruir_hacia_atras(
+                        codigo_inicial, geo,
+                        lambda c: leer_movimiento(movimientos, rango_permutacion(desempaquetar(c))))
+                    return camino, expandidos
+                siguiente.append(sucesor)
+                huecos_siguiente.append(j)
+        frontera, huecos = siguiente, huecos_siguiente
+
+    return None, expandidos
+
+# ------------------------------ BFS bidireccional ------------------------------
+def expandir_capa(frontera, predecesor, predecesor_otro, geo=GEOMETRIA_4x4, restantes=None, fin=None):
+    """
+    Expande una capa completa de la frontera (lista de (codigo, indice_cero)).
+    Devuelve (nueva_frontera, mejor_encuentro, expandidos); mejor_encuentro es el código
+    compartido con la otra búsqueda que minimiza la suma de profundidades (o None).
+    Se corta a mitad de capa si se expanden `restantes` nodos o se pasa el instante `fin` (time.time());
+    entonces devuelve (None, None, expandidos).
+    """
+    vecinos_hueco, desp, mascara = geo.vecinos_hueco, geo.desplazamiento_bits, geo.mascara_casilla
+    nueva = []
+    mejor = None
+    mejor_total = None
+    for n, (codigo, cero) in enumerate(frontera):
+        if restantes is not None and n >= restantes:
+            return None, None, n
+        if fin is not None and time.time() >= fin:
+            return None, None, n
+        for mov, j in vecinos_hueco[cero]:
+            ficha = (codigo >> desp[j]) & mascara
+            sucesor = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+            if sucesor in predecesor:
+                continue
+            predecesor[sucesor] = (codigo, mov)
+            nueva.append((sucesor, j))
+            if sucesor in predecesor_otro:
+                total = profundidad_en(predecesor_otro, sucesor)
+                if mejor_total is None or total < mejor_total:
+                    mejor, mejor_total = sucesor, total
+    return nueva, mejor, len(frontera)
+
+def profundidad_en(predecesor, codigo):
+    """Número de pasos desde codigo hasta la raíz del mapa de predecesores."""
+    pasos = 0
+    while predecesor[codigo][0] is not None:
+        codigo = predecesor[codigo][0]
+        pasos += 1
+    return pasos
+
+def bfs_bidireccional(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_BFS, timeout_segundos=TIMEOUT_SEGUNDOS_BFS,
+                      geometria=None):
+    """
+    BFS desde el inicio y desde el objetivo, expandiendo siempre la frontera más pequeña (capa completa).
+    Devuelve (lista_de_movimientos, nodos_expandidos, {'adelante': n, 'atras': m}); lista None si alcanza límite/timeout.
+    El camino sigue siendo óptimo: al terminar la capa donde se tocan ambas búsquedas se toma el mejor encuentro.
+    """
+    geo = geometria or GEOMETRIA_4x4
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    por_lado = {'adelante': 0, 'atras': 0}
+    if codigo_inicial == geo.codigo_objetivo:
+        return [], 0, por_lado
+
+    fin = None if timeout_segundos is None else time.time() + timeout_segundos
+    frontera_ad = [(codigo_inicial, cero_inicial)]
+    frontera_at = [(geo.codigo_objetivo, geo.indice_cero_objetivo)]
+    pred_ad = {codigo_inicial: (None, None)}        # codigo -> (anterior desde el inicio, movimiento)
+    pred_at = {geo.codigo_objetivo: (None, None)}   # codigo -> (anterior desde el objetivo, movimiento hacia atrás)
+
+    while frontera_ad and frontera_at:
+        restantes = limite_expansiones - por_lado['adelante'] - por_lado['atras']
+        if len(frontera_ad) <= len(frontera_at):
+            frontera_ad, encuentro, n = expandir_capa(frontera_ad, pred_ad, pred_at, geo, restantes, fin)
+            por_lado['adelante'] += n
+            cortada = frontera_ad is None
+        else:
+            frontera_at, encuentro, n = expandir_capa(frontera_at, pred_at, pred_ad, geo, restantes, fin)
+            por_lado['atras'] += n
+            cortada = frontera_at is None
+        if cortada:  # límite o timeout a mitad de capa
+            return None, por_lado['adelante'] + por_lado['atras'], por_lado
+
+        if encuentro is not None:
+            # mitad hacia adelante: inicio -> encuentro
+            camino = []
+            cur = encuentro
+            while pred_ad[cur][0] is not None:
+                ant, m = pred_ad[cur]
+                camino.append(m)
+                cur = ant
+            camino.reverse()
+            # mitad hacia atrás: encuentro -> objetivo, invirtiendo cada movimiento
+            cur = encuentro
+            while pred_at[cur][0] is not None:
+                ant, m = pred_at[cur]
+                camino.append(MOVIMIENTO_INVERSO[m])
+                cur = ant
+            return camino, por_lado['adelante'] + por_lado['atras'], por_lado
+
+    return None, por_lado['adelante'] + por_lado['atras'], por_lado
+
 # ------------------------------ Parser estricto e input ------------------------------
-def parsear_tablero_estricto(texto):
-    """Devuelve tupla de 16 ints (0..15) si es válido; si no, imprime error y devuelve None."""
+def parsear_tablero_estricto(texto, geometria=None):
+    """Devuelve tupla de 16 ints (0..15) si es válido; si no, imprime error y devuelve None.
+    Con geometria se esperan filas*columnas valores (0..n-1)."""
+    n = (geometria or GEOMETRIA_4x4).num_casillas
     tokens = re.split(r"[,\s]+", texto.strip())
     tokens = [t for t in tokens if t != ""]
-    if len(tokens) != TAMANO_TABLERO * TAMANO_TABLERO:
-        print(f"\nEntrada inválida: se leyeron {len(tokens)} valores, se requieren {TAMANO_TABLERO*TAMANO_TABLERO}.")
+    if len(tokens) != n:
+        print(f"\nEntrada inválida: se leyeron {len(tokens)} valores, se requieren {n}.")
         return None
 
     valores = []
@@ -153,12 +459,12 @@ def parsear_tablero_estricto(texto):
             print(f"\nEntrada inválida: '{t}' no es un número entero.")
             return None
 
-    fuera_de_rango = [x for x in valores if not (0 <= x <= 15)]
+    fuera_de_rango = [x for x in valores if not (0 <= x <= n - 1)]
     if fuera_de_rango:
-        print("Valores fuera de rango [0..15]:", sorted(set(fuera_de_rango)))
+        print(f"Valores fuera de rango [0..{n - 1}]:", sorted(set(fuera_de_rango)))
         return None
 
-    esperados = set(range(16))
+    esperados = set(range(n))
     s = set(valores)
     duplicados = sorted([x for x in s if valores.count(x) > 1])
     faltantes = sorted(list(esperados - s))
@@ -231,11 +537,32 @@ if __name__ == "__main__":
         print("\nSolvencia: RESOLUBLE. Procediendo con BFS...")
 
     # Ejecutar BFS con límites por defecto (puedes editar las constantes arriba si necesitas)
-    camino, expandidos = bfs(
-        tablero,
-        limite_expansiones=LIMITE_EXPANSIONES_BFS,
-        timeout_segundos=TIMEOUT_SEGUNDOS_BFS
-    )
+    if BIDIRECCIONAL_BFS:
+        camino, expandidos, por_lado = bfs_bidireccional(
+            tablero,
+            limite_expansiones=LIMITE_EXPANSIONES_BFS,
+            timeout_segundos=TIMEOUT_SEGUNDOS_BFS
+        )
+        print(f"\nExpandidos: adelante={por_lado['adelante']:,}  atrás={por_lado['atras']:,}")
+    elif COMPACTO_BFS:
+        camino, expandidos = bfs_compacto(
+            tablero,
+            limite_expansiones=LIMITE_EXPANSIONES_BFS,
+            timeout_segundos=TIMEOUT_SEGUNDOS_BFS
+        )
+    elif NUMPY_BFS:
+        from bfs_numpy import bfs_numpy
+        camino, expandidos = bfs_numpy(tablero, timeout_segundos=TIMEOUT_SEGUNDOS_BFS, imprimir_progreso=True)
+    elif EXTERNO_BFS:
+        from bfs_externo import bfs_externo
+        camino, expandidos = bfs_externo(tablero, timeout_segundos=TIMEOUT_SEGUNDOS_BFS)
+    else:
+        camino, expandidos = bfs(
+            tablero,
+            limite_expansiones=LIMITE_EXPANSIONES_BFS,
+            timeout_segundos=TIMEOUT_SEGUNDOS_BFS,
+            empaquetado=EMPAQUETADO_BFS
+        )
 
     if camino is None:
         print(f"\nNo se encontró solución dentro del límite "
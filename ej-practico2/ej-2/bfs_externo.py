@@ -0,0 +1,233 @@
+"""
+BFS en memoria externa con detección diferida de duplicados.
+
+En lugar de un conjunto de visitados en RAM, cada capa de profundidad es un archivo binario ordenado de
+registros (codigo empaquetado de 8 bytes, movimiento de llegada de 1 byte). Para generar la capa d+1:
+
+    1) se leen secuencialmente los estados de la capa d y sus sucesores se acumulan en bloques de
+       registros_por_bloque; cada bloque se ordena en memoria y se escribe como un archivo de corrida;
+    2) las corridas se fusionan (heapq.merge) eliminando repetidos y restando, también por fusión,
+       las capas d y d-1. En el grafo del puzzle (no dirigido) todo sucesor de la capa d está en d-1,
+       d o d+1, así que esas dos capas bastan para descartar lo ya visitado.
+
+Solo hay lecturas y escrituras secuenciales, y la RAM usada es la de un bloque. El camino se reconstruye al
+final desde el objetivo: se deshace su movimiento de llegada y el movimiento del padre se busca por
+bisección en el archivo (ordenado, de registros de tamaño fijo) de la capa anterior.
+
+Uso:
+    python bfs_externo.py "1 2 3 4 5 6 7 8 9 10 11 12 13 0 14 15" --directorio /mnt/grande --bloque 2000000
+"""
+import argparse
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+from bfs import MOVIMIENTO_INVERSO, parsear_tablero_estricto
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS
+
+# ------------------------------ Configuración base ------------------------------
+REGISTRO = struct.Struct('<QB')    # codigo, movimiento de llegada (9 bytes)
+SIN_MOVIMIENTO = 255               # estado inicial
+REGISTROS_POR_BLOQUE = 1_000_000   # registros ordenados en RAM a la vez (~100 MB en Python)
+REGISTROS_POR_LECTURA = 65_536     # tamaño de las lecturas secuenciales
+
+# ------------------------------ Archivos de registros ------------------------------
+def leer_registros(ruta):
+    """Genera (codigo, movimiento) del archivo en orden, leyendo en trozos grandes."""
+    tam = REGISTRO.size * REGISTROS_POR_LECTURA
+    with open(ruta, 'rb') as f:
+        while True:
+            trozo = f.read(tam)
+            if not trozo:
+                return
+            yield from REGISTRO.iter_unpack(trozo)
+
+def escribir_bloque(ruta, claves):
+    """Escribe claves ya ordenadas (codigo << 2 | movimiento) como registros."""
+    with open(ruta, 'wb') as f:
+        empaquetar = REGISTRO.pack
+        f.write(b''.join(empaquetar(k >> 2, k & 3) for k in claves))
+
+def buscar_en_capa(ruta, codigo):
+    """Movimiento de llegada de codigo en la capa (bisección por desplazamientos); None si no está."""
+    tam = REGISTRO.size
+    with open(ruta, 'rb') as f:
+        bajo, alto = 0, os.path.getsize(ruta) // tam
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            f.seek(medio * tam)
+            clave, mov = REGISTRO.unpack(f.read(tam))
+            if clave == codigo:
+                return mov
+            if clave < codigo:
+                bajo = medio + 1
+            else:
+                alto = medio
+    return None
+
+# ------------------------------ Generación de una capa ------------------------------
+def hueco_de(codigo, desp, mascara):
+    for i, d in enumerate(desp):
+        if not (codigo >> d) & mascara:
+            return i
+
+def generar_corridas(ruta_capa, geo, directorio, prefijo, registros_por_bloque, restantes=None, fin=None):
+    """
+    Expande la capa y escribe los sucesores en corridas ordenadas. Devuelve (rutas, expandidos), o
+    (None, expandidos) si se expanden `restantes` estados o se pasa el instante `fin` (time.time()).
+    """
+    vecinos_hueco, desp, mascara = geo.vecinos_hueco, geo.desplazamiento_bits, geo.mascara_casilla
+    indice_movimiento = {m: i for i, m in enumerate(LISTA_MOVIMIENTOS)}
+    inverso = {i: indice_movimiento[MOVIMIENTO_INVERSO[m]] for i, m in enumerate(LISTA_MOVIMIENTOS)}
+    corridas, bloque = [], []
+    expandidos = 0
+
+    def volcar():
+        bloque.sort()
+        ruta = os.path.join(directorio, f"{prefijo}_{len(corridas)}.bin")
+        escribir_bloque(ruta, bloque)
+        corridas.append(ruta)
+        bloque.clear()
+
+    for codigo, llegada in leer_registros(ruta_capa):
+        if (restantes is not None and expandidos >= restantes) or (fin is not None and time.time() >= fin):
+            for ruta in corridas:
+                os.remove(ruta)
+            return None, expandidos
+        expandidos += 1
+        cero = hueco_de(codigo, desp, mascara)
+        prohibido = inverso.get(llegada)  # deshacer el último movimiento vuelve a la capa anterior
+        for mov, j in vecinos_hueco[cero]:
+            m = indice_movimiento[mov]
+            if m == prohibido:
+                continue
+            ficha = (codigo >> desp[j]) & mascara
+            sucesor = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+            bloque.append((sucesor << 2) | m)
+        if len(bloque) >= registros_por_bloque:
+            volcar()
+    if bloque:
+        volcar()
+    return corridas, expandidos
+
+def fusionar_capa(corridas, capas_previas, ruta_salida, codigo_objetivo):
+    """
+    Fusiona las corridas en la nueva capa, sin repetidos y sin estados de capas_previas.
+    Devuelve (tamaño_de_la_capa, movimiento_de_llegada_del_objetivo o None).
+    """
+    previas = [leer_registros(r) for r in capas_previas]
+    actuales = [next(p, None) for p in previas]
+    tam, mov_objetivo, ultimo = 0, None, None
+    escribir = REGISTRO.pack
+    buffer = []
+    with open(ruta_salida, 'wb') as f:
+        for codigo, mov in heapq.merge(*(leer_registros(r) for r in corridas)):
+            if codigo == ultimo:
+                continue  # repetido: queda el de menor movimiento
+            ultimo = codigo
+            visto = False
+            for i, p in enumerate(previas):
+                while actuales[i] is not None and actuales[i][0] < codigo:
+                    actuales[i] = next(p, None)
+                if actuales[i] is not None and actuales[i][0] == codigo:
+                    visto = True
+            if visto:
+                continue
+            if codigo == codigo_objetivo:
+                mov_objetivo = mov
+            buffer.append(escribir(codigo, mov))
+            tam += 1
+            if len(buffer) >= REGISTROS_POR_LECTURA:
+                f.write(b''.join(buffer))
+                buffer.clear()
+        f.write(b''.join(buffer))
+    return tam, mov_objetivo
+
+# ------------------------------ Búsqueda ------------------------------
+def reconstruir_camino(codigo, mov, capas, geo):
+    """Desde el objetivo (en la última capa, con su movimiento) hasta el inicial."""
+    desp, mascara = geo.desplazamiento_bits, geo.mascara_casilla
+    camino = []
+    for ruta_anterior in reversed(capas[:-1]):
+        movimiento = LISTA_MOVIMIENTOS[mov]
+        camino.append(movimiento)
+        cero = hueco_de(codigo, desp, mascara)
+        j = next(j for m, j in geo.vecinos_hueco[cero] if m == MOVIMIENTO_INVERSO[movimiento])
+        ficha = (codigo >> desp[j]) & mascara
+        codigo = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+        mov = buscar_en_capa(ruta_anterior, codigo)
+    camino.reverse()
+    return camino
+
+def bfs_externo(estado_inicial, directorio=None, registros_por_bloque=REGISTROS_POR_BLOQUE, limite_expansiones=None,
+                timeout_segundos=None, geometria=None, conservar_capas=False, imprimir_progreso=True):
+    """
+    BFS por capas en disco. Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos)
+    si alcanza límite/timeout o agota el espacio. directorio=None usa el temporal del sistema.
+    """
+    geo = geometria or GEOMETRIA_4x4
+    if geo.bits_codigo > 64:
+        raise ValueError(f"{geo}: el código empaquetado ocupa {geo.bits_codigo} bits y los registros solo admiten 64")
+    codigo_inicial, _ = geo.empaquetar(estado_inicial)
+    codigo_objetivo = geo.codigo_objetivo
+    if codigo_inicial == codigo_objetivo:
+        return [], 0
+
+    trabajo = tempfile.mkdtemp(prefix='bfs_externo_', dir=directorio)
+    capas = [os.path.join(trabajo, 'capa_0.bin')]
+    with open(capas[0], 'wb') as f:
+        f.write(REGISTRO.pack(codigo_inicial, SIN_MOVIMIENTO))
+    t0 = time.time()
+    fin = None if timeout_segundos is None else t0 + timeout_segundos
+    expandidos = 0
+    try:
+        while True:
+            d = len(capas) - 1
+            restantes = None if limite_expansiones is None else limite_expansiones - expandidos
+            corridas, n = generar_corridas(capas[-1], geo, trabajo, f"corrida_{d + 1}", registros_por_bloque,
+                                           restantes, fin)
+            expandidos += n
+            if corridas is None:  # límite o timeout a mitad de capa
+                return None, expandidos
+            ruta = os.path.join(trabajo, f"capa_{d + 1}.bin")
+            tam, mov_objetivo = fusionar_capa(corridas, capas[-2:], ruta, codigo_objetivo)
+            for c in corridas:
+                os.remove(c)
+            capas.append(ruta)
+            if imprimir_progreso:
+                print(f"[BFS externo] d={d + 1}  capa={tam:,}  expandidos={expandidos:,}  "
+                      f"corridas={len(corridas)}  ({time.time() - t0:.1f}s)")
+            if mov_objetivo is not None:
+                return reconstruir_camino(codigo_objetivo, mov_objetivo, capas, geo), expandidos
+            if tam == 0:
+                return None, expandidos
+    finally:
+        if not conservar_capas:
+            shutil.rmtree(trabajo, ignore_errors=True)
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BFS en memoria externa (capas ordenadas en disco)")
+    parser.add_argument('tablero', help="16 números separados por espacios o comas")
+    parser.add_argument('--directorio', default=None, help="dónde escribir las capas (por defecto, el temporal)")
+    parser.add_argument('--bloque', type=int, default=REGISTROS_POR_BLOQUE, help="registros ordenados en RAM a la vez")
+    parser.add_argument('--limite', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=None)
+    parser.add_argument('--conservar', action='store_true', help="no borrar las capas al terminar")
+    args = parser.parse_args()
+
+    estado = parsear_tablero_estricto(args.tablero)
+    if estado is not None:
+        if not GEOMETRIA_4x4.es_resoluble(estado):
+            print("El tablero no es resoluble.")
+        else:
+            camino, expandidos = bfs_externo(estado, args.directorio, args.bloque, args.limite, args.timeout,
+                                             conservar_capas=args.conservar)
+            if camino is None:
+                print(f"Sin solución dentro del límite/timeout ({expandidos:,} expandidos).")
+            else:
+                print(f"Solución en {len(camino)} movimientos, {expandidos:,} expandidos.")
+                print(' '.join(camino))
@@ -0,0 +1,155 @@
+"""
+BFS por capas vectorizada con NumPy (opcional: el resto del proyecto no lo necesita).
+
+La frontera es un arreglo uint64 de tableros empaquetados (tablero_bits.py) más un arreglo uint8 con la
+posición del hueco. Para cada uno de los cuatro movimientos se seleccionan los tableros donde es válido y se
+calculan todos los sucesores a la vez con desplazamientos y máscaras de nibbles:
+
+    ficha = (codigo >> 4j) & 0xF
+    sucesor = codigo ^ (ficha << 4j) ^ (ficha << 4cero)
+
+Los repetidos se eliminan con np.unique (que además deja la capa ordenada) y lo ya visitado se descarta con
+searchsorted contra las capas d y d-1 (en el grafo no dirigido del puzzle no hace falta mirar más atrás).
+De las capas viejas solo se guardan el índice del padre en la capa anterior y el movimiento de llegada
+(5 bytes por estado); con eso se reconstruye el camino al encontrar el objetivo.
+
+Uso:
+    python bfs_numpy.py "1 2 3 4 5 6 7 8 9 10 11 12 13 0 14 15"
+"""
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:  # bfs_numpy es opcional
+    np = None
+
+from bfs import MOVIMIENTO_INVERSO, parsear_tablero_estricto
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS
+
+# ------------------------------ Configuración base ------------------------------
+LIMITE_EXPANSIONES_NUMPY = 200_000_000  # ~14 bytes por estado en las dos últimas capas + 5 en las viejas
+SIN_DESTINO = -1
+
+def tablas_de_movimiento(geo):
+    """destinos[m][cero] = casilla con la que se intercambia el hueco (SIN_DESTINO si no se puede)."""
+    destinos = np.full((len(LISTA_MOVIMIENTOS), geo.num_casillas), SIN_DESTINO, dtype=np.int16)
+    for cero, vecinos in enumerate(geo.vecinos_hueco):
+        for mov, j in vecinos:
+            destinos[LISTA_MOVIMIENTOS.index(mov), cero] = j
+    inverso = np.array([LISTA_MOVIMIENTOS.index(MOVIMIENTO_INVERSO[m]) for m in LISTA_MOVIMIENTOS], dtype=np.uint8)
+    return destinos, inverso
+
+def contenidos(ordenado, valores):
+    """Máscara booleana: valores que aparecen en el arreglo ordenado."""
+    if len(ordenado) == 0:
+        return np.zeros(len(valores), dtype=bool)
+    pos = np.searchsorted(ordenado, valores)
+    pos[pos == len(ordenado)] = 0
+    return ordenado[pos] == valores
+
+def expandir_capa(codigos, huecos, llegadas, destinos, inverso, bits_casilla, mascara):
+    """
+    Todos los sucesores de la capa (sin deshacer el movimiento de llegada).
+    Devuelve (sucesores, huecos, indice_del_padre, movimiento).
+    """
+    partes = []
+    for m in range(len(LISTA_MOVIMIENTOS)):
+        j = destinos[m][huecos]
+        sel = (j != SIN_DESTINO) & (llegadas != inverso[m])
+        padres = np.nonzero(sel)[0]
+        if len(padres) == 0:
+            continue
+        j = j[sel].astype(np.uint64)
+        c = codigos[sel]
+        desplazamiento_j = j * np.uint64(bits_casilla)
+        desplazamiento_cero = huecos[sel].astype(np.uint64) * np.uint64(bits_casilla)
+        ficha = (c >> desplazamiento_j) & np.uint64(mascara)
+        sucesores = c ^ (ficha << desplazamiento_j) ^ (ficha << desplazamiento_cero)
+        partes.append((sucesores, j.astype(np.uint8), padres.astype(np.uint32), np.full(len(padres), m, np.uint8)))
+    if not partes:
+        vacio = np.empty(0, dtype=np.uint64)
+        return vacio, vacio.astype(np.uint8), vacio.astype(np.uint32), vacio.astype(np.uint8)
+    return tuple(np.concatenate(columna) for columna in zip(*partes))
+
+def bfs_numpy(estado_inicial, limite_expansiones=LIMITE_EXPANSIONES_NUMPY, timeout_segundos=None, geometria=None,
+              imprimir_progreso=False):
+    """
+    Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si alcanza límite/timeout
+    o agota el espacio. Cada capa se expande de una vez, así que se corta antes de la capa que pasaría
+    limite_expansiones (nunca se expanden más). Requiere NumPy.
+    """
+    if np is None:
+        raise ImportError("bfs_numpy necesita NumPy: pip install numpy")
+    geo = geometria or GEOMETRIA_4x4
+    if geo.bits_codigo > 64:
+        raise ValueError(f"{geo}: el código empaquetado ocupa {geo.bits_codigo} bits y uint64 solo admite 64")
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    codigo_objetivo = np.uint64(geo.codigo_objetivo)
+    if codigo_inicial == geo.codigo_objetivo:
+        return [], 0
+
+    destinos, inverso = tablas_de_movimiento(geo)
+    sin_llegada = np.uint8(255)  # distinto de cualquier inverso
+
+    codigos = np.array([codigo_inicial], dtype=np.uint64)
+    huecos = np.array([cero_inicial], dtype=np.uint8)
+    llegadas = np.array([sin_llegada], dtype=np.uint8)
+    anterior = np.empty(0, dtype=np.uint64)
+    padres_por_capa, movimientos_por_capa = [], []  # capa d -> índices en la capa d-1 y movimientos
+    expandidos = 0
+    t0 = time.time()
+
+    while len(codigos):
+        if expandidos + len(codigos) > limite_expansiones:  # la capa se expande entera o no se expande
+            return None, expandidos
+        if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+            return None, expandidos
+        expandidos += len(codigos)
+
+        sucesores, huecos_s, padres, movs = expandir_capa(codigos, huecos, llegadas, destinos, inverso,
+                                                          geo.bits_casilla, geo.mascara_casilla)
+        unicos, primeros = np.unique(sucesores, return_index=True)  # ordenados
+        nuevos = ~(contenidos(codigos, unicos) | contenidos(anterior, unicos))
+        unicos, primeros = unicos[nuevos], primeros[nuevos]
+
+        padres_por_capa.append(padres[primeros])
+        movimientos_por_capa.append(movs[primeros])
+        anterior, codigos = codigos, unicos
+        huecos, llegadas = huecos_s[primeros], movs[primeros]
+        if imprimir_progreso:
+            print(f"[BFS numpy] d={len(padres_por_capa)}  capa={len(codigos):,}  expandidos={expandidos:,}  "
+                  f"({time.time() - t0:.1f}s)")
+
+        i = np.searchsorted(codigos, codigo_objetivo)
+        if i < len(codigos) and codigos[i] == codigo_objetivo:
+            camino = []
+            for padres_capa, movs_capa in zip(reversed(padres_por_capa), reversed(movimientos_por_capa)):
+                camino.append(LISTA_MOVIMIENTOS[movs_capa[i]])
+                i = padres_capa[i]
+            camino.reverse()
+            return camino, expandidos
+    return None, expandidos
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BFS por capas vectorizada con NumPy")
+    parser.add_argument('tablero', help="16 números separados por espacios o comas")
+    parser.add_argument('--limite', type=int, default=LIMITE_EXPANSIONES_NUMPY)
+    parser.add_argument('--timeout', type=float, default=None)
+    args = parser.parse_args()
+
+    estado = parsear_tablero_estricto(args.tablero)
+    if estado is not None:
+        if not GEOMETRIA_4x4.es_resoluble(estado):
+            print("El tablero no es resoluble.")
+        else:
+            t0 = time.time()
+            camino, expandidos = bfs_numpy(estado, args.limite, args.timeout, imprimir_progreso=True)
+            transcurrido = time.time() - t0
+            if camino is None:
+                print(f"Sin solución dentro del límite/timeout ({expandidos:,} expandidos).")
+            else:
+                print(f"Solución en {len(camino)} movimientos, {expandidos:,} expandidos "
+                      f"({expandidos / max(transcurrido, 1e-9):,.0f} nodos/s).")
+                print(' '.join(camino))
@@ -0,0 +1,122 @@
+"""
+Caché persistente de soluciones óptimas (SQLite + LRU en memoria).
+
+La clave es la forma canónica del tablero bajo la reflexión por la diagonal principal: la casilla (f, c)
+pasa a (c, f) y cada ficha se renombra por la que ocupa la posición transpuesta en el objetivo, así el
+objetivo queda fijo y un camino óptimo del reflejado es un camino óptimo del original cambiando
+arriba <-> izquierda y abajo <-> derecha. De cada par (tablero, reflejado) se guarda solo el menor, con
+su camino; al leer se deshace la reflexión si hizo falta.
+
+Solo se deben guardar caminos óptimos (A*, IDA*, BFS, HDA*, tabla del 8-puzzle), no los de ARA*.
+
+Uso desde código:
+    cache = CacheSoluciones()
+    camino, expandidos = resolver_con_cache(estado, lambda e: a_estrella(e, imprimir_progreso=False), cache)
+"""
+import os
+import sqlite3
+from collections import OrderedDict
+
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS, DIRECTORIO_TABLAS
+
+# ------------------------------ Configuración base ------------------------------
+RUTA_CACHE = os.path.join(DIRECTORIO_TABLAS, 'soluciones.sqlite')
+CAPACIDAD_LRU = 10_000
+MOVIMIENTO_REFLEJADO = {'arriba': 'izquierda', 'izquierda': 'arriba', 'abajo': 'derecha', 'derecha': 'abajo'}
+
+# ------------------------------ Simetría ------------------------------
+def reflejar(estado, geometria=None):
+    """Reflexión por la diagonal principal con renombre de fichas (deja fijo el objetivo). Solo tableros cuadrados."""
+    geo = geometria or GEOMETRIA_4x4
+    n = geo.columnas
+    objetivo = geo.objetivo
+    # la ficha v (objetivo en (f, c)) pasa a ser la que el objetivo tiene en (c, f)
+    renombre = {v: objetivo[(i % n) * n + i // n] for i, v in enumerate(objetivo)}
+    return tuple(renombre[estado[(i % n) * n + i // n]] for i in range(geo.num_casillas))
+
+def forma_canonica(estado, geometria=None):
+    """Devuelve (canonico, reflejado): reflejado=True si el canónico es la imagen del estado."""
+    geo = geometria or GEOMETRIA_4x4
+    if geo.filas != geo.columnas:
+        return tuple(estado), False
+    imagen = reflejar(estado, geo)
+    if imagen < tuple(estado):
+        return imagen, True
+    return tuple(estado), False
+
+def reflejar_camino(camino):
+    return [MOVIMIENTO_REFLEJADO[m] for m in camino]
+
+# ------------------------------ Caché ------------------------------
+def codificar_camino(camino):
+    return ''.join(str(LISTA_MOVIMIENTOS.index(m)) for m in camino)
+
+def decodificar_camino(texto):
+    return [LISTA_MOVIMIENTOS[int(c)] for c in texto]
+
+class CacheSoluciones:
+    """SQLite en disco con un LRU delante. Cada proceso abre su propia conexión (varios lectores/escritores)."""
+
+    def __init__(self, ruta=RUTA_CACHE, capacidad=CAPACIDAD_LRU, geometria=None):
+        self.geometria = geometria or GEOMETRIA_4x4
+        self.capacidad = capacidad
+        self.lru = OrderedDict()  # bytes(canonico) -> camino del canónico
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        self.conexion = sqlite3.connect(ruta, timeout=30)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS soluciones ("
+                              "filas INTEGER, columnas INTEGER, tablero BLOB, camino TEXT, "
+                              "PRIMARY KEY (filas, columnas, tablero))")
+        self.conexion.commit()
+
+    def _recordar(self, clave, camino):
+        self.lru[clave] = camino
+        self.lru.move_to_end(clave)
+        if len(self.lru) > self.capacidad:
+            self.lru.popitem(last=False)
+
+    def buscar(self, estado):
+        """Camino óptimo guardado para el estado (ya mapeado por la simetría) o None."""
+        canonico, reflejado = forma_canonica(estado, self.geometria)
+        clave = bytes(canonico)
+        camino = self.lru.get(clave)
+        if camino is None:
+            fila = self.conexion.execute(
+                "SELECT camino FROM soluciones WHERE filas = ? AND columnas = ? AND tablero = ?",
+                (self.geometria.filas, self.geometria.columnas, clave)).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return None
+            camino = decodificar_camino(fila[0])
+        self._recordar(clave, camino)
+        self.aciertos += 1
+        return reflejar_camino(camino) if reflejado else list(camino)
+
+    def guardar(self, estado, camino):
+        """Guarda un camino óptimo del estado (se almacena el del canónico)."""
+        canonico, reflejado = forma_canonica(estado, self.geometria)
+        camino_canonico = reflejar_camino(camino) if reflejado else list(camino)
+        clave = bytes(canonico)
+        self.conexion.execute("INSERT OR REPLACE INTO soluciones VALUES (?, ?, ?, ?)",
+                              (self.geometria.filas, self.geometria.columnas, clave,
+                               codificar_camino(camino_canonico)))
+        self.conexion.commit()
+        self._recordar(clave, camino_canonico)
+
+    def cerrar(self):
+        self.conexion.close()
+
+def resolver_con_cache(estado, resolver, cache):
+    """
+    Busca en la caché; si no está, llama a resolver(estado) -> (camino, expandidos) y guarda el resultado.
+    En un acierto no hay búsqueda y se devuelve (camino, 0).
+    """
+    camino = cache.buscar(estado)
+    if camino is not None:
+        return camino, 0
+    camino, expandidos = resolver(estado)
+    if camino is not None:
+        cache.guardar(estado, camino)
+    return camino, expandidos
@@ -0,0 +1,175 @@
+"""
+Heurística de distancia de caminata (walking distance) para rompecabezas deslizantes.
+
+Para las filas se cuenta, en cada fila r, cuántas fichas tienen su fila objetivo en g (matriz conteo[r][g]),
+más la fila del hueco. Un movimiento vertical lleva una ficha de una fila vecina a la fila del hueco, así que
+el mínimo de movimientos verticales necesarios es la distancia en el grafo de esas matrices, calculada una
+sola vez con una BFS desde la matriz del objetivo. Lo mismo con columnas (la misma tabla con el tablero
+transpuesto). WD = distancia de filas + distancia de columnas es admisible, porque cada movimiento real
+es vertical u horizontal y cuenta en una sola de las dos.
+
+Las tablas se guardan en tablas/wd_<lineas>x<largo>.bin y se cargan en un diccionario.
+
+Uso:
+    python distancia_caminata.py construir [--filas 4] [--columnas 4]
+    python distancia_caminata.py comparar [--tableros 20] [--pasos 80] [--semilla 1]
+"""
+import argparse
+import os
+import random
+import struct
+import time
+from collections import deque
+
+from geometria import GEOMETRIA_4x4, DIRECTORIO_TABLAS, obtener_geometria
+
+# ------------------------------ Configuración base ------------------------------
+BITS_CONTEO = 3  # cada conteo vale 0..largo (hasta 7 fichas por línea)
+
+def nombre_archivo(lineas, largo, directorio=DIRECTORIO_TABLAS):
+    return os.path.join(directorio, f'wd_{lineas}x{largo}.bin')
+
+'''
+Clave de un estado (lineas x lineas conteos + línea del hueco):
+    clave = conteo[0][0] | conteo[0][1] << 3 | ... | conteo[L-1][L-1] << 3(L*L-1) | hueco << 3(L*L)
+En disco: cantidad (4 bytes), bytes por clave (1 byte) y luego cada clave seguida de su distancia (1 byte).
+'''
+
+def codificar(conteo, hueco, lineas):
+    clave = 0
+    for desplazamiento, c in enumerate(v for fila in conteo for v in fila):
+        clave |= c << (BITS_CONTEO * desplazamiento)
+    return clave | (hueco << (BITS_CONTEO * lineas * lineas))
+
+# ------------------------------ Construcción (BFS sobre matrices de conteo) ------------------------------
+def construir_tabla(lineas, largo):
+    """Devuelve {clave: movimientos mínimos a lo largo de las líneas} para tableros de lineas x largo."""
+    objetivo = tuple(tuple((largo if l < lineas - 1 else largo - 1) if g == l else 0 for g in range(lineas))
+                     for l in range(lineas))
+    inicial = (objetivo, lineas - 1)
+    tabla = {codificar(objetivo, lineas - 1, lineas): 0}
+    cola = deque([inicial])
+    while cola:
+        conteo, hueco = cola.popleft()
+        d = tabla[codificar(conteo, hueco, lineas)]
+        for vecina in (hueco - 1, hueco + 1):
+            if not 0 <= vecina < lineas:
+                continue
+            for g in range(lineas):
+                if conteo[vecina][g] == 0:
+                    continue
+                # una ficha del grupo g pasa de la línea vecina a la del hueco
+                nuevo = [list(fila) for fila in conteo]
+                nuevo[vecina][g] -= 1
+                nuevo[hueco][g] += 1
+                nuevo = tuple(tuple(fila) for fila in nuevo)
+                clave = codificar(nuevo, vecina, lineas)
+                if clave not in tabla:
+                    tabla[clave] = d + 1
+                    cola.append((nuevo, vecina))
+    return tabla
+
+def guardar_tabla(tabla, ruta):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    bytes_clave = max(1, (max(tabla).bit_length() + 7) // 8)
+    with open(ruta, 'wb') as f:
+        f.write(struct.pack('<IB', len(tabla), bytes_clave))
+        f.write(b''.join(clave.to_bytes(bytes_clave, 'little') + bytes([d]) for clave, d in sorted(tabla.items())))
+
+def leer_tabla(ruta):
+    with open(ruta, 'rb') as f:
+        cantidad, bytes_clave = struct.unpack('<IB', f.read(5))
+        datos = f.read()
+    paso = bytes_clave + 1
+    if len(datos) != cantidad * paso:
+        raise ValueError(f"Tamaño inesperado en {ruta}: {len(datos)} bytes")
+    return {int.from_bytes(datos[i:i + bytes_clave], 'little'): datos[i + bytes_clave]
+            for i in range(0, len(datos), paso)}
+
+def cargar_tabla(lineas, largo, directorio=DIRECTORIO_TABLAS):
+    """Lee la tabla de disco; si no existe la construye y la guarda (tarda menos de un segundo en 4x4)."""
+    ruta = nombre_archivo(lineas, largo, directorio)
+    if os.path.exists(ruta):
+        return leer_tabla(ruta)
+    tabla = construir_tabla(lineas, largo)
+    guardar_tabla(tabla, ruta)
+    return tabla
+
+# ------------------------------ Heurística ------------------------------
+def crear_heuristica_wd(geometria=None, directorio=DIRECTORIO_TABLAS):
+    """Devuelve h(estado) = WD de filas + WD de columnas (admisible)."""
+    geo = geometria or GEOMETRIA_4x4
+    filas, columnas = geo.filas, geo.columnas
+    tabla_filas = cargar_tabla(filas, columnas, directorio)
+    tabla_columnas = tabla_filas if filas == columnas else cargar_tabla(columnas, filas, directorio)
+    # desplazamiento de bits de conteo[linea][grupo] para cada (casilla, ficha)
+    fila_objetivo = [geo.posicion_objetivo[v][0] for v in range(geo.num_casillas)]
+    columna_objetivo = [geo.posicion_objetivo[v][1] for v in range(geo.num_casillas)]
+    desp_fila = tuple(tuple(BITS_CONTEO * ((i // columnas) * filas + fila_objetivo[v]) for v in range(geo.num_casillas))
+                      for i in range(geo.num_casillas))
+    desp_columna = tuple(tuple(BITS_CONTEO * ((i % columnas) * columnas + columna_objetivo[v])
+                               for v in range(geo.num_casillas)) for i in range(geo.num_casillas))
+    desp_hueco_fila = BITS_CONTEO * filas * filas
+    desp_hueco_columna = BITS_CONTEO * columnas * columnas
+
+    def heuristica_wd(estado):
+        clave_f = clave_c = 0
+        for i, v in enumerate(estado):
+            if v:
+                clave_f += 1 << desp_fila[i][v]
+                clave_c += 1 << desp_columna[i][v]
+            else:
+                clave_f |= (i // columnas) << desp_hueco_fila
+                clave_c |= (i % columnas) << desp_hueco_columna
+        return tabla_filas[clave_f] + tabla_columnas[clave_c]
+
+    return heuristica_wd
+
+# ------------------------------ Comparación contra heuristica_mc ------------------------------
+def comparar(tableros=20, pasos=80, semilla=1):
+    """Resuelve los mismos tableros con MC, WD y max(WD, MC) e imprime las expansiones."""
+    from aestrella import a_estrella
+    from heuristicas import obtener_heuristica
+    from patrones import tablero_aleatorio
+    nombres = ('mc', 'wd', 'max_wd_mc')
+    heuristicas = {n: obtener_heuristica(n) for n in nombres}
+    generador = random.Random(semilla)
+    totales = dict.fromkeys(nombres, 0)
+    print(f"{'#':>3} {'largo':>5} " + ' '.join(f"{'exp ' + n:>14}" for n in nombres))
+    for k in range(1, tableros + 1):
+        estado = tablero_aleatorio(pasos, generador)
+        largos, fila = set(), []
+        for n in nombres:
+            camino, expandidos = a_estrella(estado, imprimir_progreso=False, empaquetado=True, heuristica=heuristicas[n])
+            largos.add(None if camino is None else len(camino))
+            totales[n] += expandidos
+            fila.append(f"{expandidos:>14,}")
+        if len(largos) != 1:
+            raise RuntimeError(f"Longitudes distintas en el tablero {k}: {largos}")
+        print(f"{k:>3} {largos.pop()!s:>5} " + ' '.join(fila))
+    base = totales['mc']
+    print("\nTotal expandidos: " + '  '.join(f"{n}={totales[n]:,}" for n in nombres))
+    if base:
+        print("Reducción contra mc: " + '  '.join(f"{n}={100.0 * (1 - totales[n] / base):.1f}%" for n in nombres[1:]))
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tablas de distancia de caminata (walking distance)")
+    parser.add_argument('accion', choices=('construir', 'comparar'))
+    parser.add_argument('--filas', type=int, default=4)
+    parser.add_argument('--columnas', type=int, default=None)
+    parser.add_argument('--tableros', type=int, default=20)
+    parser.add_argument('--pasos', type=int, default=80)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.accion == 'construir':
+        geo = obtener_geometria(args.filas, args.columnas)
+        for lineas, largo in {(geo.filas, geo.columnas), (geo.columnas, geo.filas)}:
+            t0 = time.time()
+            tabla = construir_tabla(lineas, largo)
+            ruta = nombre_archivo(lineas, largo)
+            guardar_tabla(tabla, ruta)
+            print(f"[WD] {ruta}  ({len(tabla):,} estados, máx={max(tabla.values())}, {time.time() - t0:.1f}s)")
+    else:
+        comparar(args.tableros, args.pasos, args.semilla)
@@ -0,0 +1,111 @@
+"""
+Geometría de un rompecabezas deslizante de filas x columnas (8-puzzle, 15-puzzle, 24-puzzle, 3x4, ...).
+
+Todo lo que depende del tamaño se calcula una sola vez al crear la geometría: estado objetivo,
+desplazamientos, tabla de vecinos del hueco, posiciones objetivo, distancias Manhattan por ficha,
+índices de filas/columnas y el formato empaquetado. Los solucionadores la reciben como parámetro
+(geometria=None equivale al 4x4 de siempre).
+"""
+import os
+
+LISTA_MOVIMIENTOS = ('arriba', 'abajo', 'izquierda', 'derecha')
+MOVIMIENTO_INVERSO = {'arriba': 'abajo', 'abajo': 'arriba', 'izquierda': 'derecha', 'derecha': 'izquierda'}
+
+# Tablas precalculadas en disco (patrones, perímetro, caminata, 8-puzzle, caché de soluciones)
+DIRECTORIO_TABLAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablas')
+SIN_VALOR = 255  # byte de "sin dato" en las tablas de distancias
+
+class Geometria:
+    def __init__(self, filas, columnas=None):
+        columnas = filas if columnas is None else columnas
+        if filas < 2 or columnas < 2:
+            raise ValueError(f"Tablero demasiado pequeño: {filas}x{columnas}")
+        self.filas = filas
+        self.columnas = columnas
+        self.num_casillas = filas * columnas
+        self.objetivo = tuple(list(range(1, self.num_casillas)) + [0])
+        self.desplazamientos = {'arriba': -columnas, 'abajo': columnas, 'izquierda': -1, 'derecha': 1}
+        self.posicion_objetivo = {v: divmod(i, columnas) for i, v in enumerate(self.objetivo)}
+
+        # Vecinos del hueco por posición, en el orden de LISTA_MOVIMIENTOS
+        vecinos = []
+        for indice in range(self.num_casillas):
+            fila, columna = divmod(indice, columnas)
+            lista = []
+            if fila > 0:               lista.append(('arriba', indice - columnas))
+            if fila < filas - 1:       lista.append(('abajo', indice + columnas))
+            if columna > 0:            lista.append(('izquierda', indice - 1))
+            if columna < columnas - 1: lista.append(('derecha', indice + 1))
+            vecinos.append(tuple(lista))
+        self.vecinos_hueco = tuple(vecinos)
+
+        # DISTANCIA_FICHA[v][i]: Manhattan de la ficha v en la casilla i
+        self.distancia_ficha = tuple(
+            tuple(abs(i // columnas - self.posicion_objetivo[v][0]) + abs(i % columnas - self.posicion_objetivo[v][1])
+                  if v != 0 else 0 for i in range(self.num_casillas))
+            for v in range(self.num_casillas))
+        self.indices_fila = tuple(tuple(f * columnas + c for c in range(columnas)) for f in range(filas))
+        self.indices_columna = tuple(tuple(f * columnas + c for f in range(filas)) for c in range(columnas))
+
+        # Formato empaquetado: bits_casilla bits por casilla (4 hasta el 15-puzzle, 5 para el 24-puzzle)
+        self.bits_casilla = max(4, (self.num_casillas - 1).bit_length())
+        self.mascara_casilla = (1 << self.bits_casilla) - 1
+        self.bits_codigo = self.bits_casilla * self.num_casillas
+        self.desplazamiento_bits = tuple(self.bits_casilla * i for i in range(self.num_casillas))
+        self.codigo_objetivo, self.indice_cero_objetivo = self.empaquetar(self.objetivo)
+
+    def __repr__(self):
+        return f"Geometria({self.filas}, {self.columnas})"
+
+    # ------------------------------ Movimientos sobre tuplas ------------------------------
+    def aplicar_movimiento(self, estado, movimiento):
+        """Devuelve el nuevo estado al mover el 0; None si no es válido."""
+        indice_cero = estado.index(0)
+        for mov, j in self.vecinos_hueco[indice_cero]:
+            if mov == movimiento:
+                lista = list(estado)
+                lista[indice_cero], lista[j] = lista[j], 0
+                return tuple(lista)
+        return None
+
+    # ------------------------------ Empaquetado ------------------------------
+    def empaquetar(self, estado):
+        """Devuelve (codigo, indice_cero)."""
+        codigo = 0
+        for d, v in zip(self.desplazamiento_bits, estado):
+            codigo |= v << d
+        return codigo, estado.index(0)
+
+    def desempaquetar(self, codigo):
+        m = self.mascara_casilla
+        return tuple((codigo >> d) & m for d in self.desplazamiento_bits)
+
+    # ------------------------------ Solvencia ------------------------------
+    def calcular_inversiones_y_R(self, estado):
+        plano = [x for x in estado if x != 0]
+        inversiones = sum(1 for i in range(len(plano)) for j in range(i+1, len(plano)) if plano[i] > plano[j])
+        R = self.filas - estado.index(0) // self.columnas  # fila del 0 desde abajo: 1..filas
+        return inversiones, R
+
+    def es_resoluble(self, estado):
+        """
+        Ancho impar (3x3, 5x5): resoluble si las inversiones son pares.
+        Ancho par (4x4, 3x4): resoluble si inversiones + fila del 0 desde abajo es impar.
+        """
+        if tuple(sorted(estado)) != tuple(range(self.num_casillas)):
+            return False
+        I, R = self.calcular_inversiones_y_R(estado)
+        if self.columnas % 2 == 1:
+            return I % 2 == 0
+        return (I + R) % 2 == 1
+
+GEOMETRIAS = {}  # (filas, columnas) -> Geometria
+
+def obtener_geometria(filas, columnas=None):
+    """Geometría compartida por tamaño: las tablas se calculan una sola vez por proceso."""
+    clave = (filas, filas if columnas is None else columnas)
+    if clave not in GEOMETRIAS:
+        GEOMETRIAS[clave] = Geometria(*clave)
+    return GEOMETRIAS[clave]
+
+GEOMETRIA_4x4 = obtener_geometria(4, 4)
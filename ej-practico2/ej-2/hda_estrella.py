@@ -0,0 +1,284 @@
+"""
+A* paralelo distribuido por hash (HDA*) para el 15-puzzle.
+
+Cada trabajador es un proceso dueño de los estados cuyo hash le corresponde (dueno_de) y tiene su propia
+lista abierta y su propia tabla de g. Al expandir, los sucesores propios se insertan directamente y los
+ajenos se acumulan en un lote por destinatario que se envía a la cola de entrada del dueño.
+
+Como los nodos no llegan en orden global de f, un estado puede reabrirse si llega con menor g. La primera
+vez que el objetivo llega a su dueño se fija una cota (mejor_costo, compartida); desde ahí se descartan los
+nodos con f >= cota. La búsqueda termina cuando todos los trabajadores están ociosos (sin nodos con f < cota)
+y no hay lotes en tránsito: el coordinador lee dos veces seguidas las banderas de ocio y los contadores de
+lotes enviados/recibidos, y termina solo si ambas lecturas coinciden, todos están ociosos y enviados == recibidos
+(método de los cuatro contadores). Con h admisible el costo final es óptimo.
+
+El camino se reconstruye preguntando a cada dueño por el predecesor del estado, desde el objetivo hacia atrás.
+
+Uso:
+    python hda_estrella.py resolver "15 2 1 12 8 5 6 11 4 9 10 7 3 14 13 0" --trabajadores 4
+    python hda_estrella.py escalar --trabajadores 1 2 4 8 --profundidad 50 --cantidad 5
+"""
+import argparse
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+
+from aestrella import heuristica_mc, heuristica_mc_incremental_codigo, parsear_tablero_estricto, LIMITE_EXPANSIONES
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS
+from heuristicas import HEURISTICAS, obtener_heuristica
+from tabla_hash import MULTIPLICADOR_HASH, MASCARA_64
+
+# ------------------------------ Configuración base ------------------------------
+TAM_LOTE = 64                 # sucesores por mensaje a otro trabajador
+EXPANSIONES_POR_RONDA = 256   # expansiones entre revisiones de la cola de entrada
+PAUSA_COORDINADOR = 0.002     # segundos entre lecturas del detector de terminación
+SIN_COTA = 2 ** 31 - 1
+
+def dueno_de(codigo, trabajadores):
+    """Trabajador dueño del estado (Fibonacci hashing sobre el código, como en bfs_compacto)."""
+    return (((codigo * MULTIPLICADOR_HASH) & MASCARA_64) >> 32) % trabajadores
+
+# ------------------------------ Trabajador ------------------------------
+def trabajador(yo, entradas, resultados, compartido, nombre_heuristica):
+    """
+    Bucle de un trabajador. Mensajes en su cola de entrada:
+        ('nodos', [(codigo, cero, g, h, codigo_padre, indice_mov), ...])
+        ('padre', codigo)  -> responde ('padre', codigo_padre, indice_mov) en resultados
+        ('fin',)
+    """
+    geo = GEOMETRIA_4x4
+    n_trabajadores = len(entradas)
+    enviados, recibidos, ociosos = compartido['enviados'], compartido['recibidos'], compartido['ociosos']
+    expandidos, mejor_costo, abortar = compartido['expandidos'], compartido['mejor_costo'], compartido['abortar']
+    mi_entrada = entradas[yo]
+    vecinos_hueco, desp, mascara = geo.vecinos_hueco, geo.desplazamiento_bits, geo.mascara_casilla
+    codigo_objetivo, desempaquetar = geo.codigo_objetivo, geo.desempaquetar
+
+    h = obtener_heuristica(nombre_heuristica)
+    incremental = h is heuristica_mc
+
+    costo = {}        # codigo -> mejor g conocido
+    predecesor = {}   # codigo -> (codigo_padre, indice_mov)
+    abiertos = []     # (f, h, orden, g, codigo, cero)
+    orden = 0
+    lotes = [[] for _ in range(n_trabajadores)]
+    indice_movimiento = {m: i for i, m in enumerate(LISTA_MOVIMIENTOS)}
+
+    def insertar(codigo, cero, g, hv, padre, m):
+        nonlocal orden
+        if g >= costo.get(codigo, SIN_COTA) or g + hv >= mejor_costo.value:
+            return
+        costo[codigo] = g
+        predecesor[codigo] = (padre, m)
+        if codigo == codigo_objetivo:
+            with mejor_costo.get_lock():
+                if g < mejor_costo.value:
+                    mejor_costo.value = g
+            return
+        orden += 1
+        heapq.heappush(abiertos, (g + hv, hv, orden, g, codigo, cero))
+
+    def enviar_lotes():
+        for destino, lote in enumerate(lotes):
+            if lote:
+                enviados[yo] += 1  # antes de poner el lote: nunca hay un lote en tránsito sin contar
+                entradas[destino].put(('nodos', lote))
+                lotes[destino] = []
+
+    def atender(mensaje):
+        """Procesa un mensaje; devuelve False si hay que terminar."""
+        if mensaje[0] == 'nodos':
+            ociosos[yo] = 0
+            if not abortar.value:
+                for nodo in mensaje[1]:
+                    insertar(*nodo)
+            recibidos[yo] += 1
+        elif mensaje[0] == 'padre':
+            padre, m = predecesor[mensaje[1]]
+            resultados.put(('padre', padre, m))
+        else:
+            return False
+        return True
+
+    while True:
+        # 1) Vaciar la cola de entrada sin bloquear
+        try:
+            while True:
+                if not atender(mi_entrada.get_nowait()):
+                    mi_entrada.cancel_join_thread()
+                    return
+        except queue.Empty:
+            pass
+
+        # 2) Expandir una ronda de nodos con f < cota
+        for _ in range(EXPANSIONES_POR_RONDA):
+            if abortar.value or not abiertos:
+                break
+            f, h_actual, _, g, codigo, cero = abiertos[0]
+            if f >= mejor_costo.value:
+                abiertos.clear()  # todo lo que queda está podado
+                break
+            heapq.heappop(abiertos)
+            if g != costo[codigo]:
+                continue  # entrada vieja: el estado se reabrió con menor g
+            expandidos[yo] += 1
+            tent = g + 1
+            for mov, j in vecinos_hueco[cero]:
+                ficha = (codigo >> desp[j]) & mascara
+                vecino = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+                if incremental:
+                    hv = heuristica_mc_incremental_codigo(vecino, j, h_actual, ficha, mov, geo)
+                else:
+                    hv = h(desempaquetar(vecino))
+                destino = dueno_de(vecino, n_trabajadores)
+                nodo = (vecino, j, tent, hv, codigo, indice_movimiento[mov])
+                if destino == yo:
+                    insertar(*nodo)
+                else:
+                    lotes[destino].append(nodo)
+                    if len(lotes[destino]) >= TAM_LOTE:
+                        enviar_lotes()
+
+        # 3) Enviar lo pendiente de la ronda; sin trabajo útil, marcarse ocioso y esperar mensajes
+        enviar_lotes()
+        if abortar.value or not abiertos or abiertos[0][0] >= mejor_costo.value:
+            ociosos[yo] = 1
+            if not atender(mi_entrada.get()):
+                mi_entrada.cancel_join_thread()
+                return
+
+# ------------------------------ Coordinador ------------------------------
+def terminado(compartido, n_trabajadores):
+    """Una lectura del detector: (todos_ociosos, total_enviados, total_recibidos)."""
+    todos_ociosos = all(compartido['ociosos'][w] for w in range(n_trabajadores))
+    return todos_ociosos, sum(compartido['enviados']), sum(compartido['recibidos'])
+
+def hda_estrella(estado_inicial, trabajadores=None, limite_expansiones=LIMITE_EXPANSIONES, timeout_segundos=None,
+                 heuristica='mc'):
+    """
+    Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si alcanza límite/timeout.
+    heuristica es un nombre de heuristicas.py porque cada proceso crea la suya. Solo 4x4.
+    """
+    geo = GEOMETRIA_4x4
+    n = trabajadores or os.cpu_count() or 1
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    if codigo_inicial == geo.codigo_objetivo:
+        return [], 0
+
+    compartido = {
+        'enviados': multiprocessing.Array('q', n + 1, lock=False),  # el último es el coordinador
+        'recibidos': multiprocessing.Array('q', n, lock=False),
+        'ociosos': multiprocessing.Array('b', n, lock=False),
+        'expandidos': multiprocessing.Array('q', n, lock=False),
+        'mejor_costo': multiprocessing.Value('i', SIN_COTA),
+        'abortar': multiprocessing.Value('b', 0, lock=False),
+    }
+    entradas = [multiprocessing.Queue() for _ in range(n)]
+    resultados = multiprocessing.Queue()
+    procesos = [multiprocessing.Process(target=trabajador, args=(w, entradas, resultados, compartido, heuristica),
+                                        daemon=True) for w in range(n)]
+    for p in procesos:
+        p.start()
+
+    h0 = obtener_heuristica(heuristica)(estado_inicial)
+    compartido['enviados'][n] += 1
+    entradas[dueno_de(codigo_inicial, n)].put(('nodos', [(codigo_inicial, cero_inicial, 0, h0, None, None)]))
+
+    t0 = time.time()
+    anterior = None
+    camino = None
+    while True:
+        time.sleep(PAUSA_COORDINADOR)
+        total = sum(compartido['expandidos'])
+        if total >= limite_expansiones or (timeout_segundos is not None and time.time() - t0 >= timeout_segundos):
+            compartido['abortar'].value = 1
+            break
+        lectura = terminado(compartido, n)
+        if lectura[0] and lectura[1] == lectura[2] and lectura == anterior:
+            break
+        anterior = lectura
+
+    if not compartido['abortar'].value and compartido['mejor_costo'].value != SIN_COTA:
+        camino = []
+        codigo = geo.codigo_objetivo
+        while codigo != codigo_inicial:
+            entradas[dueno_de(codigo, n)].put(('padre', codigo))
+            _, codigo, m = resultados.get()
+            camino.append(LISTA_MOVIMIENTOS[m])
+        camino.reverse()
+
+    for entrada in entradas:
+        entrada.put(('fin',))
+    for p in procesos:
+        p.join(timeout=5)
+        if p.is_alive():
+            p.terminate()
+    return camino, sum(compartido['expandidos'])
+
+# ------------------------------ Escalado de 1 a N trabajadores ------------------------------
+def escalar(lista_trabajadores, profundidad=50, cantidad=5, semilla=1, heuristica='mc'):
+    """
+    Resuelve el mismo corpus con cada número de trabajadores y reporta aceleración y eficiencia contra 1.
+    La corrida con 1 trabajador siempre se mide (va primero aunque no esté en la lista): es la base.
+    """
+    from aestrella import a_estrella
+    from benchmark import generar_corpus
+    corpus = [t for _, _, t in generar_corpus([profundidad], cantidad, semilla)]
+    h = obtener_heuristica(heuristica)
+
+    largos = [len(a_estrella(t, imprimir_progreso=False, empaquetado=True, heuristica=h)[0]) for t in corpus]
+    lista_trabajadores = [1] + [n for n in lista_trabajadores if n != 1]
+    base = None
+    print(f"{'trabajadores':>12} {'tiempo_s':>9} {'expandidos':>11} {'aceleración':>11} {'eficiencia':>10}")
+    for n in lista_trabajadores:
+        t0 = time.time()
+        expandidos = 0
+        for tablero, largo in zip(corpus, largos):
+            camino, exp = hda_estrella(tablero, trabajadores=n, heuristica=heuristica)
+            if camino is None or len(camino) != largo:
+                raise RuntimeError(f"HDA* con {n} trabajadores no es óptimo en {tablero}: "
+                                   f"{None if camino is None else len(camino)} vs {largo}")
+            expandidos += exp
+        transcurrido = time.time() - t0
+        if base is None:
+            base = transcurrido  # 1 trabajador
+        aceleracion = base / transcurrido
+        print(f"{n:>12} {transcurrido:>9.2f} {expandidos:>11,} {aceleracion:>11.2f} {aceleracion / n:>10.2f}")
+    print(f"(CPUs disponibles: {os.cpu_count()})")
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A* paralelo distribuido por hash (HDA*)")
+    sub = parser.add_subparsers(dest='accion', required=True)
+    p_resolver = sub.add_parser('resolver')
+    p_resolver.add_argument('tablero', help="16 números separados por espacios o comas")
+    p_resolver.add_argument('--trabajadores', type=int, default=os.cpu_count())
+    p_resolver.add_argument('--heuristica', choices=sorted(HEURISTICAS), default='mc')
+    p_resolver.add_argument('--limite', type=int, default=LIMITE_EXPANSIONES)
+    p_resolver.add_argument('--timeout', type=float, default=0, help="segundos (0 = sin límite)")
+    p_escalar = sub.add_parser('escalar')
+    p_escalar.add_argument('--trabajadores', type=int, nargs='+', default=[1, 2, 4])
+    p_escalar.add_argument('--profundidad', type=int, default=50)
+    p_escalar.add_argument('--cantidad', type=int, default=5)
+    p_escalar.add_argument('--semilla', type=int, default=1)
+    p_escalar.add_argument('--heuristica', choices=sorted(HEURISTICAS), default='mc')
+    args = parser.parse_args()
+
+    if args.accion == 'resolver':
+        estado = parsear_tablero_estricto(args.tablero)
+        if estado is not None:
+            if not GEOMETRIA_4x4.es_resoluble(estado):
+                print("El tablero no es resoluble.")
+            else:
+                t0 = time.time()
+                camino, expandidos = hda_estrella(estado, args.trabajadores, args.limite, args.timeout or None,
+                                                  args.heuristica)
+                if camino is None:
+                    print(f"Sin solución dentro del límite/timeout ({expandidos:,} expandidos).")
+                else:
+                    print(f"Largo {len(camino)}  expandidos={expandidos:,}  {time.time() - t0:.2f}s")
+                    print(' '.join(camino))
+    else:
+        escalar(args.trabajadores, args.profundidad, args.cantidad, args.semilla, args.heuristica)
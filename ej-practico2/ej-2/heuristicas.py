@@ -0,0 +1,57 @@
+"""
+Registro de heurísticas para los solucionadores informados (A*, IDA*, ARA*, HDA*).
+
+Cada heurística se registra por nombre con una fábrica fabrica(geometria) -> h(estado). Los CLIs ofrecen
+sorted(HEURISTICAS) como opciones y construyen la función con obtener_heuristica(nombre, geometria).
+Para 'mc' se devuelve heuristica_mc tal cual en 4x4, así a_estrella/ida_estrella siguen usando su versión
+incremental. Registrar una nueva:
+
+    @registrar_heuristica('mi_h')
+    def crear_mi_h(geometria):
+        return lambda estado: ...
+"""
+from aestrella import heuristica_mc
+from geometria import GEOMETRIA_4x4
+
+HEURISTICAS = {}  # nombre -> fabrica(geometria) -> h(estado)
+
+def registrar_heuristica(nombre):
+    def decorador(fabrica):
+        HEURISTICAS[nombre] = fabrica
+        return fabrica
+    return decorador
+
+def obtener_heuristica(nombre, geometria=None):
+    """Construye la heurística registrada con ese nombre para la geometría (None = 4x4)."""
+    if nombre not in HEURISTICAS:
+        raise ValueError(f"Heurística desconocida: {nombre!r} (disponibles: {', '.join(sorted(HEURISTICAS))})")
+    return HEURISTICAS[nombre](geometria or GEOMETRIA_4x4)
+
+def combinar_maximo(*heuristicas):
+    """max de heurísticas admisibles: sigue siendo admisible y domina a cada una."""
+    def heuristica_maximo(estado):
+        return max(h(estado) for h in heuristicas)
+    return heuristica_maximo
+
+# ------------------------------ Heurísticas incluidas ------------------------------
+@registrar_heuristica('mc')
+def crear_mc(geometria):
+    if geometria is GEOMETRIA_4x4:
+        return heuristica_mc
+    return lambda estado: heuristica_mc(estado, geometria)
+
+@registrar_heuristica('pdb')
+def crear_pdb(geometria):
+    if geometria is not GEOMETRIA_4x4:
+        raise ValueError("Las tablas de patrones solo existen para el 15-puzzle (4x4)")
+    from patrones import crear_heuristica_pdb
+    return crear_heuristica_pdb()
+
+@registrar_heuristica('wd')
+def crear_wd(geometria):
+    from distancia_caminata import crear_heuristica_wd
+    return crear_heuristica_wd(geometria)
+
+@registrar_heuristica('max_wd_mc')
+def crear_max_wd_mc(geometria):
+    return combinar_maximo(crear_wd(geometria), crear_mc(geometria))
@@ -0,0 +1,206 @@
+"""
+Resolución por lotes del 15-puzzle (sin interacción).
+
+Lee tableros de un archivo o de stdin, uno por línea, en el mismo formato que parsear_tablero_estricto
+(16 números separados por espacios o comas). Las líneas vacías y las que empiezan con '#' se ignoran.
+Cada tablero se revisa con la regla de solvencia de su geometría (la de es_resoluble_4x4 en 4x4) y se
+reparte a un pool de procesos; los resultados se escriben en JSONL conforme van terminando (no en el
+orden de entrada: usar el campo "linea"). Con --filas/--columnas se resuelven 8-puzzle, 24-puzzle, etc.
+En 3x3, --algoritmo tabla responde leyendo la tabla completa de distancias (ver ocho_puzzle.py).
+Con --cache los tableros ya resueltos (o su reflejo por la diagonal) salen de cache_soluciones.py sin buscar.
+
+Uso:
+    python lote.py tableros.txt --algoritmo a_estrella --procesos 8 --limite 1000000 --timeout 30
+    python lote.py ocho_puzzle.txt --filas 3 --columnas 3
+    python lote.py veinticuatro.txt --filas 5 --columnas 5
+    python lote.py ocho_puzzle.txt --filas 3 --algoritmo tabla
+    cat tableros.txt | python lote.py - --salida resultados.jsonl
+    python lote.py tableros.txt --cache tablas/soluciones.sqlite
+
+Campos de cada resultado:
+    linea, tablero, estado ('resuelto' | 'no_resoluble' | 'limite' | 'timeout' | 'invalido' | 'error'),
+    camino, largo, expandidos, tiempo_s, cache (True si salió de la caché), [error]
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from aestrella import a_estrella, ida_estrella, heuristica_mc, parsear_tablero_estricto, LIMITE_EXPANSIONES
+from heuristicas import HEURISTICAS, obtener_heuristica
+from bfs import bfs, bfs_bidireccional, TIMEOUT_SEGUNDOS_BFS
+from geometria import GEOMETRIA_4x4, obtener_geometria
+
+ALGORITMOS = ('a_estrella', 'ida_estrella', 'bfs', 'bfs_bidireccional', 'tabla')
+
+# Configuración de cada proceso del pool (la fija inicializar_proceso)
+CONFIG = {'algoritmo': 'a_estrella', 'limite': LIMITE_EXPANSIONES, 'timeout': TIMEOUT_SEGUNDOS_BFS,
+          'heuristica': heuristica_mc, 'geometria': GEOMETRIA_4x4, 'tabla': None,
+          'cache': None}
+
+def comprobar_configuracion(algoritmo, nombre_heuristica, filas=4, columnas=4, ruta_cache=None):
+    """
+    Valida la configuración una vez, en el proceso principal y antes de crear el pool: un error dentro de
+    inicializar_proceso no se reporta (el pool reinicia el proceso para siempre). Lanza ValueError o
+    FileNotFoundError con el motivo.
+    """
+    geo = obtener_geometria(filas, columnas)
+    if ruta_cache:
+        from cache_soluciones import CacheSoluciones
+        CacheSoluciones(ruta_cache, geometria=geo).cerrar()
+    if algoritmo == 'tabla':
+        from ocho_puzzle import GEOMETRIA_3x3, cargar_tabla
+        if geo is not GEOMETRIA_3x3:
+            raise ValueError("La tabla completa de distancias solo existe para el 8-puzzle (3x3): usa --filas 3")
+        cargar_tabla().close()  # existe y tiene el tamaño correcto
+    if nombre_heuristica != 'mc':
+        obtener_heuristica(nombre_heuristica, geo)  # nombre desconocido, tabla faltante o geometría sin tablas
+
+def inicializar_proceso(algoritmo, limite, timeout, nombre_heuristica, filas=4, columnas=4, ruta_cache=None):
+    """Instala la configuración en el proceso del pool (ya validada por comprobar_configuracion)."""
+    CONFIG['algoritmo'] = algoritmo
+    CONFIG['limite'] = limite
+    CONFIG['timeout'] = timeout
+    CONFIG['geometria'] = obtener_geometria(filas, columnas)
+    if ruta_cache:
+        from cache_soluciones import CacheSoluciones
+        CONFIG['cache'] = CacheSoluciones(ruta_cache, geometria=CONFIG['geometria'])  # una conexión por proceso
+    if algoritmo == 'tabla':
+        from ocho_puzzle import cargar_tabla
+        CONFIG['tabla'] = cargar_tabla()  # un mmap por proceso (no se puede pasar desde el principal)
+    if nombre_heuristica == 'mc':
+        CONFIG['heuristica'] = heuristica_mc  # los solucionadores le aplican la geometría (versión incremental)
+    else:
+        # Cada proceso mapea sus tablas (PDB, WD); que existan ya lo comprobó el principal
+        CONFIG['heuristica'] = obtener_heuristica(nombre_heuristica, CONFIG['geometria'])
+
+def resolver(estado):
+    """Corre el algoritmo configurado y devuelve (camino, expandidos)."""
+    algoritmo, limite, timeout, geo = CONFIG['algoritmo'], CONFIG['limite'], CONFIG['timeout'], CONFIG['geometria']
+    empaquetado = geo.bits_codigo <= 64  # 5x5 o más no cabe en 64 bits: estados como tuplas
+    if algoritmo == 'a_estrella':
+        return a_estrella(estado, imprimir_progreso=False, limite_expansiones=limite, empaquetado=empaquetado,
+                          heuristica=CONFIG['heuristica'], timeout_segundos=timeout, geometria=geo)
+    if algoritmo == 'ida_estrella':
+        return ida_estrella(estado, imprimir_progreso=False, limite_expansiones=limite,
+                            heuristica=CONFIG['heuristica'], timeout_segundos=timeout, geometria=geo)
+    if algoritmo == 'tabla':
+        from ocho_puzzle import resolver_con_tabla
+        return resolver_con_tabla(estado, CONFIG['tabla'])
+    if algoritmo == 'bfs':
+        return bfs(estado, limite_expansiones=limite, timeout_segundos=timeout, empaquetado=empaquetado, geometria=geo)
+    camino, expandidos, _ = bfs_bidireccional(estado, limite_expansiones=limite, timeout_segundos=timeout,
+                                              geometria=geo)
+    return camino, expandidos
+
+def resolver_linea(trabajo):
+    """Procesa una línea de entrada y devuelve el diccionario de resultado (se ejecuta en el pool)."""
+    numero, texto = trabajo
+    resultado = {'linea': numero, 'tablero': None, 'estado': None, 'camino': None, 'largo': None,
+                 'expandidos': 0, 'tiempo_s': 0.0, 'cache': False}
+
+    # El parser reporta errores con print; se capturan para no ensuciar la salida JSONL
+    mensajes = io.StringIO()
+    with contextlib.redirect_stdout(mensajes):
+        estado = parsear_tablero_estricto(texto, CONFIG['geometria'])
+    if estado is None:
+        resultado['estado'] = 'invalido'
+        resultado['error'] = ' '.join(mensajes.getvalue().split())
+        return resultado
+    resultado['tablero'] = list(estado)
+
+    if not CONFIG['geometria'].es_resoluble(estado):
+        resultado['estado'] = 'no_resoluble'
+        return resultado
+
+    if CONFIG['cache'] is not None:
+        camino = CONFIG['cache'].buscar(estado)
+        if camino is not None:
+            resultado.update(estado='resuelto', camino=camino, largo=len(camino), cache=True)
+            return resultado
+
+    t0 = time.time()
+    try:
+        camino, expandidos = resolver(estado)
+    except Exception as e:  # un tablero problemático no debe tumbar el lote
+        resultado['estado'] = 'error'
+        resultado['error'] = f"{type(e).__name__}: {e}"
+        resultado['tiempo_s'] = round(time.time() - t0, 4)
+        return resultado
+    transcurrido = time.time() - t0
+
+    resultado['expandidos'] = expandidos
+    resultado['tiempo_s'] = round(transcurrido, 4)
+    if camino is not None:
+        resultado['estado'] = 'resuelto'
+        resultado['camino'] = camino
+        resultado['largo'] = len(camino)
+        if CONFIG['cache'] is not None:
+            CONFIG['cache'].guardar(estado, camino)
+    elif CONFIG['timeout'] is not None and transcurrido >= CONFIG['timeout']:
+        resultado['estado'] = 'timeout'
+    else:
+        resultado['estado'] = 'limite'
+    return resultado
+
+def leer_trabajos(entrada):
+    """Genera (numero_de_linea, texto) para cada línea con contenido."""
+    for numero, linea in enumerate(entrada, start=1):
+        texto = linea.strip()
+        if not texto or texto.startswith('#'):
+            continue
+        yield numero, texto
+
+def resolver_lote(entrada, salida, algoritmo='a_estrella', procesos=None, limite=LIMITE_EXPANSIONES,
+                  timeout=TIMEOUT_SEGUNDOS_BFS, heuristica='mc', filas=4, columnas=4, ruta_cache=None):
+    """
+    Resuelve todas las líneas de entrada y escribe una línea JSON por tablero. Devuelve conteo por estado.
+    Una configuración inválida (tamaño, tabla o heurística inexistente) lanza ValueError/FileNotFoundError.
+    """
+    comprobar_configuracion(algoritmo, heuristica, filas, columnas, ruta_cache)
+    conteo = {}
+    argumentos = (algoritmo, limite, timeout, heuristica, filas, columnas, ruta_cache)
+    with multiprocessing.Pool(processes=procesos, initializer=inicializar_proceso, initargs=argumentos) as pool:
+        for resultado in pool.imap_unordered(resolver_linea, leer_trabajos(entrada), chunksize=1):
+            salida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+            salida.flush()
+            conteo[resultado['estado']] = conteo.get(resultado['estado'], 0) + 1
+    return conteo
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolución por lotes del 15-puzzle (salida JSONL)")
+    parser.add_argument('entrada', help="archivo con un tablero por línea, o '-' para stdin")
+    parser.add_argument('--salida', default='-', help="archivo JSONL de salida, o '-' para stdout")
+    parser.add_argument('--algoritmo', choices=ALGORITMOS, default='a_estrella')
+    parser.add_argument('--heuristica', choices=sorted(HEURISTICAS), default='mc')
+    parser.add_argument('--filas', type=int, default=4)
+    parser.add_argument('--columnas', type=int, default=None, help="por defecto igual a --filas")
+    parser.add_argument('--cache', default=None, help="archivo SQLite de soluciones ya calculadas")
+    parser.add_argument('--procesos', type=int, default=os.cpu_count())
+    parser.add_argument('--limite', type=int, default=LIMITE_EXPANSIONES, help="expansiones máximas por tablero")
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_SEGUNDOS_BFS,
+                        help="segundos máximos por tablero (0 = sin límite)")
+    args = parser.parse_args()
+
+    timeout = args.timeout if args.timeout > 0 else None
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, encoding='utf-8')
+    salida = sys.stdout if args.salida == '-' else open(args.salida, 'w', encoding='utf-8')
+    t0 = time.time()
+    try:
+        conteo = resolver_lote(entrada, salida, args.algoritmo, args.procesos, args.limite, timeout, args.heuristica,
+                               args.filas, args.columnas or args.filas, args.cache)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"[lote] {e}", file=sys.stderr)
+        raise SystemExit(2)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    resumen = '  '.join(f"{k}={v}" for k, v in sorted(conteo.items()))
+    print(f"[lote] {sum(conteo.values())} tableros en {time.time() - t0:.1f}s  {resumen}", file=sys.stderr)
@@ -0,0 +1,151 @@
+"""
+Tabla completa de distancias del 8-puzzle (3x3).
+
+El espacio alcanzable del 8-puzzle tiene solo 9!/2 = 181.440 estados, así que se recorre entero una
+vez con una BFS desde el objetivo (mismos movimientos del hueco que aplicar_movimiento en bfs.py) y se
+guarda la distancia óptima de cada estado en un arreglo de bytes indexado por el rango de permutación
+(rango_permutacion de bfs.py, 0 .. 9!-1). Los rangos no alcanzables quedan en SIN_VALOR.
+
+Para resolver se mapea el archivo en memoria y se reconstruye el camino de forma voraz: desde el
+estado de distancia d siempre hay un vecino de distancia d-1. Son O(d) lecturas de la tabla, sin
+búsqueda, y sirve de oráculo para verificar los otros solucionadores.
+
+Uso:
+    python ocho_puzzle.py construir
+    python ocho_puzzle.py verificar [--tableros 200] [--semilla 1]
+"""
+import argparse
+import mmap
+import os
+import random
+import time
+from collections import deque
+from math import factorial
+
+from bfs import rango_permutacion
+from geometria import DIRECTORIO_TABLAS, SIN_VALOR, obtener_geometria
+
+# ------------------------------ Configuración base ------------------------------
+GEOMETRIA_3x3 = obtener_geometria(3, 3)
+NUM_RANGOS = factorial(GEOMETRIA_3x3.num_casillas)  # 362.880 bytes en disco
+RUTA_TABLA = os.path.join(DIRECTORIO_TABLAS, 'ocho_puzzle.bin')
+
+# ------------------------------ Construcción (BFS desde el objetivo) ------------------------------
+def construir_tabla(imprimir_progreso=True):
+    """Devuelve un bytearray con la distancia óptima al objetivo de cada rango (SIN_VALOR si no es alcanzable)."""
+    geo = GEOMETRIA_3x3
+    tabla = bytearray([SIN_VALOR]) * NUM_RANGOS
+    objetivo = geo.objetivo
+    tabla[rango_permutacion(objetivo)] = 0
+    cola = deque([(objetivo, geo.indice_cero_objetivo)])
+    t0 = time.time()
+
+    while cola:
+        estado, indice_cero = cola.popleft()
+        d = tabla[rango_permutacion(estado)]
+        for _, j in geo.vecinos_hueco[indice_cero]:
+            lista = list(estado)
+            lista[indice_cero], lista[j] = lista[j], 0
+            sucesor = tuple(lista)
+            rango = rango_permutacion(sucesor)
+            if tabla[rango] == SIN_VALOR:
+                tabla[rango] = d + 1
+                cola.append((sucesor, j))
+
+    if imprimir_progreso:
+        alcanzables = NUM_RANGOS - tabla.count(SIN_VALOR)
+        print(f"[8-puzzle] {alcanzables:,} estados alcanzables, "
+              f"máx={max(v for v in tabla if v != SIN_VALOR)}  ({time.time() - t0:.1f}s)")
+    return tabla
+
+def guardar_tabla(ruta=RUTA_TABLA, imprimir_progreso=True):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla = construir_tabla(imprimir_progreso)
+    with open(ruta, 'wb') as f:
+        f.write(tabla)
+    if imprimir_progreso:
+        print(f"[8-puzzle] {ruta}  ({len(tabla):,} bytes)")
+
+# ------------------------------ Carga y resolución ------------------------------
+def cargar_tabla(ruta=RUTA_TABLA):
+    """Mapea en memoria la tabla de distancias (solo lectura)."""
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No existe {ruta}. Ejecuta: python ocho_puzzle.py construir")
+    with open(ruta, 'rb') as f:
+        tabla = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(tabla) != NUM_RANGOS:
+        raise ValueError(f"Tamaño inesperado en {ruta}: {len(tabla)} bytes")
+    return tabla
+
+def distancia(estado, tabla):
+    """Distancia óptima al objetivo; None si el estado no es alcanzable."""
+    d = tabla[rango_permutacion(estado)]
+    return None if d == SIN_VALOR else d
+
+def resolver_con_tabla(estado, tabla=None):
+    """
+    Camino óptimo leyendo la tabla: en cada paso se elige el primer vecino (en orden de LISTA_MOVIMIENTOS)
+    que está un paso más cerca. Devuelve (camino, lecturas) con el mismo contrato que los otros
+    solucionadores; camino es None si el tablero no es resoluble.
+    """
+    tabla = tabla if tabla is not None else cargar_tabla()
+    geo = GEOMETRIA_3x3
+    d = tabla[rango_permutacion(estado)]
+    lecturas = 1
+    if d == SIN_VALOR:
+        return None, lecturas
+
+    camino = []
+    indice_cero = estado.index(0)
+    while d > 0:
+        for mov, j in geo.vecinos_hueco[indice_cero]:
+            lista = list(estado)
+            lista[indice_cero], lista[j] = lista[j], 0
+            sucesor = tuple(lista)
+            lecturas += 1
+            if tabla[rango_permutacion(sucesor)] == d - 1:
+                camino.append(mov)
+                estado, indice_cero, d = sucesor, j, d - 1
+                break
+        else:
+            raise ValueError("Tabla inconsistente: ningún vecino está un paso más cerca")
+    return camino, lecturas
+
+# ------------------------------ Verificación contra A* ------------------------------
+def verificar(tableros=200, semilla=1, ruta=RUTA_TABLA):
+    """Compara el largo de la tabla con el de A* (heuristica_mc) sobre tableros aleatorios resolubles."""
+    from aestrella import a_estrella
+    tabla = cargar_tabla(ruta)
+    geo = GEOMETRIA_3x3
+    generador = random.Random(semilla)
+    for n in range(1, tableros + 1):
+        estado = list(geo.objetivo)
+        while True:
+            generador.shuffle(estado)
+            if geo.es_resoluble(tuple(estado)):
+                break
+        estado = tuple(estado)
+        camino_tabla, _ = resolver_con_tabla(estado, tabla)
+        camino_a, _ = a_estrella(estado, imprimir_progreso=False, empaquetado=True, geometria=geo)
+        if len(camino_tabla) != len(camino_a):
+            raise RuntimeError(f"Largo distinto en el tablero {n} {estado}: tabla={len(camino_tabla)} A*={len(camino_a)}")
+        final = estado
+        for mov in camino_tabla:
+            final = geo.aplicar_movimiento(final, mov)
+        if final != geo.objetivo:
+            raise RuntimeError(f"El camino de la tabla no llega al objetivo en el tablero {n} {estado}")
+    print(f"[8-puzzle] {tableros} tableros verificados contra A*")
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tabla completa de distancias del 8-puzzle")
+    parser.add_argument('accion', choices=('construir', 'verificar'))
+    parser.add_argument('--ruta', default=RUTA_TABLA)
+    parser.add_argument('--tableros', type=int, default=200)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.accion == 'construir':
+        guardar_tabla(args.ruta)
+    else:
+        verificar(args.tableros, args.semilla, args.ruta)
@@ -0,0 +1,188 @@
+"""
+Bases de datos de patrones (PDB) aditivas y disjuntas para el 15-puzzle.
+
+Las 15 fichas se reparten en grupos disjuntos (por ejemplo 5-5-5 o 6-6-3). Para cada grupo se hace
+una BFS retrógrada desde el objetivo donde solo cuentan los movimientos de las fichas del grupo
+(mover el hueco sobre cualquier otra ficha cuesta 0). Como cada movimiento real mueve una sola
+ficha, la suma de los valores de los grupos sigue siendo admisible.
+
+Cada tabla se guarda en disco como un arreglo de bytes indexado por las posiciones de las fichas
+del grupo (4 bits por ficha) y se mapea en memoria al cargarla: una consulta es un índice y una lectura.
+
+Uso:
+    python patrones.py construir [--particion 5-5-5]
+    python patrones.py comparar  [--particion 5-5-5] [--tableros 20] [--pasos 80] [--semilla 1]
+"""
+import argparse
+import mmap
+import os
+import random
+import time
+from collections import deque
+
+from geometria import DIRECTORIO_TABLAS, SIN_VALOR
+from tablero_bits import VECINOS_HUECO, NUM_CASILLAS
+
+# ------------------------------ Configuración base ------------------------------
+PARTICIONES = {
+    '5-5-5': ((1, 2, 3, 4, 7), (5, 6, 9, 10, 13), (8, 11, 12, 14, 15)),
+    '6-6-3': ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),  # ~270 MB de RAM al construir
+}
+PARTICION_POR_DEFECTO = '5-5-5'
+
+'''
+Índice de un grupo (fichas t0, t1, ..., tk-1):
+    indice = pos(t0) | pos(t1) << 4 | ... | pos(tk-1) << 4(k-1)
+Son 16^k entradas de un byte (5 fichas -> 1 MB, 6 fichas -> 16 MB). Las combinaciones imposibles
+(dos fichas en la misma casilla) quedan en SIN_VALOR y nunca se consultan.
+'''
+
+def nombre_archivo(fichas, directorio=DIRECTORIO_TABLAS):
+    return os.path.join(directorio, 'pdb_' + '-'.join(str(t) for t in fichas) + '.bin')
+
+# ------------------------------ Construcción (BFS retrógrada 0-1) ------------------------------
+def construir_tabla(fichas, imprimir_progreso=True):
+    """Devuelve un bytearray con el mínimo número de movimientos de las fichas del grupo hasta el objetivo."""
+    k = len(fichas)
+    desplazamiento_hueco = 4 * k
+    mascara_fichas = (1 << desplazamiento_hueco) - 1
+
+    tabla = bytearray([SIN_VALOR]) * (1 << desplazamiento_hueco)
+    distancia = bytearray([SIN_VALOR]) * (1 << (desplazamiento_hueco + 4))  # (fichas, hueco)
+
+    # En el objetivo la ficha t está en la casilla t-1 y el hueco en la última
+    inicial = 0
+    for s, t in enumerate(fichas):
+        inicial |= (t - 1) << (4 * s)
+    inicial |= (NUM_CASILLAS - 1) << desplazamiento_hueco
+
+    distancia[inicial] = 0
+    cola = deque([inicial])
+    procesados = 0
+    t0 = time.time()
+
+    while cola:
+        codigo = cola.popleft()
+        d = distancia[codigo]
+        posiciones = codigo & mascara_fichas
+        hueco = codigo >> desplazamiento_hueco
+        if d < tabla[posiciones]:
+            tabla[posiciones] = d
+
+        procesados += 1
+        if imprimir_progreso and procesados % 1_000_000 == 0:
+            print(f"[PDB {fichas}] Procesados: {procesados:,}  d={d}  ({time.time() - t0:.1f}s)")
+
+        ocupadas = {(posiciones >> (4 * s)) & 0xF: s for s in range(k)}
+        for _, j in VECINOS_HUECO[hueco]:
+            s = ocupadas.get(j)
+            if s is None:
+                # el hueco pasa sobre una ficha ajena al grupo: costo 0
+                nuevo = posiciones | (j << desplazamiento_hueco)
+                if d < distancia[nuevo]:
+                    distancia[nuevo] = d
+                    cola.appendleft(nuevo)
+            else:
+                # la ficha s del grupo ocupa la casilla del hueco: costo 1
+                nuevo = (posiciones & ~(0xF << (4 * s))) | (hueco << (4 * s)) | (j << desplazamiento_hueco)
+                if d + 1 < distancia[nuevo]:
+                    distancia[nuevo] = d + 1
+                    cola.append(nuevo)
+    return tabla
+
+def construir_particion(particion=PARTICION_POR_DEFECTO, directorio=DIRECTORIO_TABLAS, imprimir_progreso=True):
+    """Construye y guarda en disco las tablas de todos los grupos de la partición."""
+    os.makedirs(directorio, exist_ok=True)
+    for fichas in PARTICIONES[particion]:
+        t0 = time.time()
+        tabla = construir_tabla(fichas, imprimir_progreso=imprimir_progreso)
+        ruta = nombre_archivo(fichas, directorio)
+        with open(ruta, 'wb') as f:
+            f.write(tabla)
+        if imprimir_progreso:
+            print(f"[PDB] {ruta}  ({len(tabla):,} bytes, máx={max(v for v in tabla if v != SIN_VALOR)}, "
+                  f"{time.time() - t0:.1f}s)")
+
+# ------------------------------ Carga y heurística ------------------------------
+def cargar_tablas(particion=PARTICION_POR_DEFECTO, directorio=DIRECTORIO_TABLAS):
+    """Mapea en memoria las tablas de la partición. Devuelve lista de (fichas, tabla)."""
+    tablas = []
+    for fichas in PARTICIONES[particion]:
+        ruta = nombre_archivo(fichas, directorio)
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"No existe {ruta}. Ejecuta: python patrones.py construir --particion {particion}")
+        with open(ruta, 'rb') as f:
+            tabla = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(tabla) != 1 << (4 * len(fichas)):
+            raise ValueError(f"Tamaño inesperado en {ruta}: {len(tabla)} bytes")
+        tablas.append((fichas, tabla))
+    return tablas
+
+def crear_heuristica_pdb(particion=PARTICION_POR_DEFECTO, directorio=DIRECTORIO_TABLAS):
+    """Devuelve una función h(estado) con la suma de las PDB de la partición (admisible)."""
+    grupos = [(tuple((t, 4 * s) for s, t in enumerate(fichas)), tabla)
+              for fichas, tabla in cargar_tablas(particion, directorio)]
+
+    def heuristica_pdb(estado):
+        posicion = [0] * NUM_CASILLAS
+        for i, v in enumerate(estado):
+            posicion[v] = i
+        total = 0
+        for desplazamientos, tabla in grupos:
+            indice = 0
+            for t, d in desplazamientos:
+                indice |= posicion[t] << d
+            total += tabla[indice]
+        return total
+
+    return heuristica_pdb
+
+# ------------------------------ Comparación contra heuristica_mc ------------------------------
+def tablero_aleatorio(pasos, generador):
+    """Tablero resoluble obtenido desordenando el objetivo con movimientos aleatorios."""
+    from aestrella import ESTADO_OBJETIVO, LISTA_MOVIMIENTOS, aplicar_movimiento
+    estado = ESTADO_OBJETIVO
+    for _ in range(pasos):
+        nuevo = aplicar_movimiento(estado, generador.choice(LISTA_MOVIMIENTOS))
+        if nuevo is not None:
+            estado = nuevo
+    return estado
+
+def comparar(particion=PARTICION_POR_DEFECTO, tableros=20, pasos=80, semilla=1, directorio=DIRECTORIO_TABLAS):
+    """Resuelve los mismos tableros con h_MC y con h_PDB e imprime la reducción de expansiones."""
+    from aestrella import a_estrella, heuristica_mc
+    h_pdb = crear_heuristica_pdb(particion, directorio)
+    generador = random.Random(semilla)
+    total_mc = total_pdb = 0
+    print(f"{'#':>3} {'largo':>5} {'exp MC':>10} {'exp PDB':>10} {'t MC':>7} {'t PDB':>7}")
+    for n in range(1, tableros + 1):
+        estado = tablero_aleatorio(pasos, generador)
+        t0 = time.time()
+        camino_mc, exp_mc = a_estrella(estado, imprimir_progreso=False, empaquetado=True, heuristica=heuristica_mc)
+        t1 = time.time()
+        camino_pdb, exp_pdb = a_estrella(estado, imprimir_progreso=False, empaquetado=True, heuristica=h_pdb)
+        t2 = time.time()
+        if camino_mc is not None and camino_pdb is not None and len(camino_mc) != len(camino_pdb):
+            raise RuntimeError(f"Longitudes distintas en el tablero {n}: {len(camino_mc)} vs {len(camino_pdb)}")
+        largo = len(camino_pdb) if camino_pdb is not None else '-'
+        print(f"{n:>3} {largo:>5} {exp_mc:>10,} {exp_pdb:>10,} {t1 - t0:>7.2f} {t2 - t1:>7.2f}")
+        total_mc += exp_mc
+        total_pdb += exp_pdb
+    reduccion = 100.0 * (1 - total_pdb / total_mc) if total_mc else 0.0
+    print(f"\nTotal expandidos: MC={total_mc:,}  PDB={total_pdb:,}  reducción={reduccion:.1f}%")
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bases de datos de patrones para el 15-puzzle")
+    parser.add_argument('accion', choices=('construir', 'comparar'))
+    parser.add_argument('--particion', choices=sorted(PARTICIONES), default=PARTICION_POR_DEFECTO)
+    parser.add_argument('--directorio', default=DIRECTORIO_TABLAS)
+    parser.add_argument('--tableros', type=int, default=20)
+    parser.add_argument('--pasos', type=int, default=80)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.accion == 'construir':
+        construir_particion(args.particion, args.directorio)
+    else:
+        comparar(args.particion, args.tableros, args.pasos, args.semilla, args.directorio)
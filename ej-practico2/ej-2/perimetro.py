@@ -0,0 +1,230 @@
+"""
+Búsqueda con perímetro: tabla de todos los estados a distancia <= d del objetivo.
+
+Se construye una vez con una BFS desde el objetivo y se guarda en disco como una tabla hash abierta (mismo
+sondeo lineal que bfs_compacto) de códigos empaquetados, con un byte por ranura:
+
+    info = distancia << 2 | índice (en LISTA_MOVIMIENTOS) del movimiento que acerca al objetivo
+
+a_estrella_perimetro usa h'(s) = distancia exacta si s está en el perímetro y max(h(s), d + 1) si no
+(fuera del perímetro la distancia real es al menos d + 1), que sigue siendo admisible. Cuando sale de
+la lista abierta un estado del perímetro, su f es exacta y mínima: el camino hasta él más el resto
+leído de la tabla es óptimo, sin expandir los últimos movimientos.
+
+Uso:
+    python perimetro.py construir --profundidad 16
+    python perimetro.py comparar --profundidad 16 [--tableros 20] [--pasos 80]
+"""
+import argparse
+import heapq
+import mmap
+import os
+import random
+import struct
+import time
+
+from aestrella import heuristica_mc, heuristica_mc_incremental_codigo, LIMITE_EXPANSIONES
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS, MOVIMIENTO_INVERSO, DIRECTORIO_TABLAS
+from tabla_hash import CARGA_MAXIMA, crear_tabla, ranura_de
+
+# ------------------------------ Configuración base ------------------------------
+PROFUNDIDAD_PERIMETRO = 16   # ~ 240 mil estados, ~ 4.7 MB en disco (d=14: ~ 62 mil, 1.2 MB)
+CABECERA = struct.Struct('<BB6x')  # bits de la tabla, profundidad
+
+def nombre_archivo(profundidad, directorio=DIRECTORIO_TABLAS):
+    return os.path.join(directorio, f'perimetro_4x4_d{profundidad}.bin')
+
+# ------------------------------ Construcción ------------------------------
+def construir_perimetro(profundidad=PROFUNDIDAD_PERIMETRO, imprimir_progreso=True):
+    """BFS desde el objetivo hasta la profundidad dada. Devuelve (claves, info, bits)."""
+    geo = GEOMETRIA_4x4
+    vecinos_hueco, desp, mascara = geo.vecinos_hueco, geo.desplazamiento_bits, geo.mascara_casilla
+    indice_movimiento = {m: i for i, m in enumerate(LISTA_MOVIMIENTOS)}
+    visitados = {geo.codigo_objetivo: 0}  # codigo -> info
+    frontera = [(geo.codigo_objetivo, geo.indice_cero_objetivo)]
+    t0 = time.time()
+    for d in range(1, profundidad + 1):
+        siguiente = []
+        for codigo, cero in frontera:
+            for mov, j in vecinos_hueco[cero]:
+                ficha = (codigo >> desp[j]) & mascara
+                sucesor = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+                if sucesor not in visitados:
+                    # desde el sucesor, deshacer mov acerca al objetivo
+                    visitados[sucesor] = (d << 2) | indice_movimiento[MOVIMIENTO_INVERSO[mov]]
+                    siguiente.append((sucesor, j))
+        frontera = siguiente
+        if imprimir_progreso:
+            print(f"[Perímetro] d={d}  capa={len(frontera):,}  total={len(visitados):,}  ({time.time() - t0:.1f}s)")
+
+    bits = 4
+    while len(visitados) > CARGA_MAXIMA * (1 << bits):
+        bits += 1
+    claves, _ = crear_tabla(bits)
+    info = bytearray(1 << bits)
+    for codigo, valor in visitados.items():
+        r = ranura_de(claves, bits, codigo)
+        claves[r] = codigo
+        info[r] = valor
+    return claves, info, bits
+
+def guardar_perimetro(profundidad=PROFUNDIDAD_PERIMETRO, directorio=DIRECTORIO_TABLAS, imprimir_progreso=True):
+    claves, info, bits = construir_perimetro(profundidad, imprimir_progreso)
+    ruta = nombre_archivo(profundidad, directorio)
+    os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'wb') as f:
+        f.write(CABECERA.pack(bits, profundidad))
+        f.write(claves.tobytes())
+        f.write(info)
+    if imprimir_progreso:
+        print(f"[Perímetro] {ruta}  ({os.path.getsize(ruta):,} bytes)")
+    return ruta
+
+class Perimetro:
+    """Tabla del perímetro mapeada en memoria (solo lectura)."""
+
+    def __init__(self, profundidad=PROFUNDIDAD_PERIMETRO, directorio=DIRECTORIO_TABLAS):
+        ruta = nombre_archivo(profundidad, directorio)
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"No existe {ruta}. Ejecuta: python perimetro.py construir --profundidad {profundidad}")
+        with open(ruta, 'rb') as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.bits, self.profundidad = CABECERA.unpack_from(self.mapa)
+        n = 1 << self.bits
+        if len(self.mapa) != CABECERA.size + 9 * n:
+            raise ValueError(f"Tamaño inesperado en {ruta}: {len(self.mapa)} bytes")
+        self.claves = memoryview(self.mapa)[CABECERA.size:CABECERA.size + 8 * n].cast('Q')
+        self.info = memoryview(self.mapa)[CABECERA.size + 8 * n:]
+
+    def buscar(self, codigo):
+        """info del estado (distancia << 2 | movimiento) o None si está fuera del perímetro."""
+        r = ranura_de(self.claves, self.bits, codigo)
+        return self.info[r] if self.claves[r] else None
+
+    def camino_restante(self, codigo):
+        """Movimientos óptimos desde un estado del perímetro hasta el objetivo."""
+        geo = GEOMETRIA_4x4
+        desp, mascara = geo.desplazamiento_bits, geo.mascara_casilla
+        cero = next(i for i, d in enumerate(desp) if not (codigo >> d) & mascara)
+        camino = []
+        valor = self.buscar(codigo)
+        while valor >> 2:
+            mov = LISTA_MOVIMIENTOS[valor & 3]
+            j = next(j for m, j in geo.vecinos_hueco[cero] if m == mov)
+            ficha = (codigo >> desp[j]) & mascara
+            codigo = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+            cero = j
+            camino.append(mov)
+            valor = self.buscar(codigo)
+        return camino
+
+# ------------------------------ A* con perímetro ------------------------------
+def a_estrella_perimetro(estado_inicial, perimetro, imprimir_progreso=False, limite_expansiones=LIMITE_EXPANSIONES,
+                         heuristica=heuristica_mc, timeout_segundos=None):
+    """
+    Devuelve (lista_de_movimientos, nodos_expandidos) o (None, nodos_expandidos) si alcanza límite/timeout.
+    Termina al sacar de la lista abierta el primer estado del perímetro.
+    """
+    geo = GEOMETRIA_4x4
+    incremental = heuristica is heuristica_mc
+    vecinos_hueco, desp, mascara, desempaquetar = (geo.vecinos_hueco, geo.desplazamiento_bits,
+                                                   geo.mascara_casilla, geo.desempaquetar)
+    fuera = perimetro.profundidad + 1  # cota inferior para los estados fuera del perímetro
+
+    def h_perimetro(codigo, h_base):
+        valor = perimetro.buscar(codigo)
+        return valor >> 2 if valor is not None else max(h_base, fuera)
+
+    codigo_inicial, cero_inicial = geo.empaquetar(estado_inicial)
+    costo_desde_inicio = {codigo_inicial: 0}
+    predecesor = {codigo_inicial: (None, None)}
+    cerrados = set()
+    h_base0 = heuristica(estado_inicial)
+    h0 = h_perimetro(codigo_inicial, h_base0)
+    abiertos_heap = [(h0, h0, 0, codigo_inicial, cero_inicial, h_base0)]  # (f, h', tie, codigo, cero, h_base)
+    contador_orden = 0
+    expandidos = 0
+    t0 = time.time()
+
+    while abiertos_heap:
+        f_actual, h_actual, _, codigo, cero, h_base = heapq.heappop(abiertos_heap)
+        if codigo in cerrados:
+            continue
+
+        if perimetro.buscar(codigo) is not None:
+            camino = []
+            cur = codigo
+            while predecesor[cur][0] is not None:
+                ant, mov = predecesor[cur]
+                camino.append(mov)
+                cur = ant
+            camino.reverse()
+            return camino + perimetro.camino_restante(codigo), expandidos
+
+        cerrados.add(codigo)
+        expandidos += 1
+        if imprimir_progreso and expandidos % 10000 == 0:
+            print(f"[A* perímetro] Expandidos: {expandidos:,}  f={f_actual}  h={h_actual}")
+        if expandidos >= limite_expansiones:
+            return None, expandidos
+        if timeout_segundos is not None and (time.time() - t0) >= timeout_segundos:
+            return None, expandidos
+
+        tent = costo_desde_inicio[codigo] + 1
+        for mov, j in vecinos_hueco[cero]:
+            ficha = (codigo >> desp[j]) & mascara
+            vecino = codigo ^ (ficha << desp[j]) ^ (ficha << desp[cero])
+            if tent >= costo_desde_inicio.get(vecino, float('inf')):
+                continue
+            costo_desde_inicio[vecino] = tent
+            predecesor[vecino] = (codigo, mov)
+            if incremental:
+                hb = heuristica_mc_incremental_codigo(vecino, j, h_base, ficha, mov, geo)
+            else:
+                hb = heuristica(desempaquetar(vecino))
+            hv = h_perimetro(vecino, hb)
+            contador_orden += 1
+            heapq.heappush(abiertos_heap, (tent + hv, hv, contador_orden, vecino, j, hb))
+    return None, expandidos
+
+# ------------------------------ Comparación contra A* ------------------------------
+def comparar(profundidad=PROFUNDIDAD_PERIMETRO, tableros=20, pasos=80, semilla=1):
+    """Mismos tableros con A* (empaquetado) y con A* + perímetro: largo igual, menos expansiones."""
+    from aestrella import a_estrella
+    from patrones import tablero_aleatorio
+    perimetro = Perimetro(profundidad)
+    generador = random.Random(semilla)
+    total_a = total_p = 0
+    print(f"{'#':>3} {'largo':>5} {'exp A*':>10} {'exp perím.':>10}")
+    for n in range(1, tableros + 1):
+        estado = tablero_aleatorio(pasos, generador)
+        camino_a, exp_a = a_estrella(estado, imprimir_progreso=False, empaquetado=True)
+        camino_p, exp_p = a_estrella_perimetro(estado, perimetro)
+        if camino_a is not None and camino_p is not None and len(camino_a) != len(camino_p):
+            raise RuntimeError(f"Longitudes distintas en el tablero {n}: {len(camino_a)} vs {len(camino_p)}")
+        final = estado
+        for mov in camino_p or []:
+            final = GEOMETRIA_4x4.aplicar_movimiento(final, mov)
+        if camino_p is not None and final != GEOMETRIA_4x4.objetivo:
+            raise RuntimeError(f"El camino con perímetro no llega al objetivo en el tablero {n}")
+        print(f"{n:>3} {len(camino_p) if camino_p is not None else '-':>5} {exp_a:>10,} {exp_p:>10,}")
+        total_a += exp_a
+        total_p += exp_p
+    reduccion = 100.0 * (1 - total_p / total_a) if total_a else 0.0
+    print(f"\nTotal expandidos: A*={total_a:,}  perímetro={total_p:,}  reducción={reduccion:.1f}%")
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Búsqueda con perímetro alrededor del objetivo")
+    parser.add_argument('accion', choices=('construir', 'comparar'))
+    parser.add_argument('--profundidad', type=int, default=PROFUNDIDAD_PERIMETRO)
+    parser.add_argument('--directorio', default=DIRECTORIO_TABLAS)
+    parser.add_argument('--tableros', type=int, default=20)
+    parser.add_argument('--pasos', type=int, default=80)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.accion == 'construir':
+        guardar_perimetro(args.profundidad, args.directorio)
+    else:
+        comparar(args.profundidad, args.tableros, args.pasos, args.semilla)
@@ -0,0 +1,45 @@
+"""
+Tabla hash abierta de códigos empaquetados (sondeo lineal, Fibonacci hashing sobre 64 bits).
+
+Cada estado visitado ocupa una ranura de la tabla:
+    claves[r]      -> código empaquetado de 64 bits (0 = ranura libre; ningún tablero vale 0)
+    movimientos    -> 2 bits por ranura con el índice (en LISTA_MOVIMIENTOS) del movimiento que llevó a ese estado
+Unos 8-12 bytes por estado contra los cientos de bytes de una tupla + la entrada en visitados y predecesor.
+
+La usan bfs_compacto (bfs.py) y perimetro.py; aestrella.py y hda_estrella.py comparten las constantes.
+"""
+from array import array
+
+MULTIPLICADOR_HASH = 0x9E3779B97F4A7C15  # Fibonacci hashing sobre el código de 64 bits
+MASCARA_64 = (1 << 64) - 1
+CARGA_MAXIMA = 0.7
+
+def ranura_de(claves, bits, codigo):
+    """Ranura donde está codigo o la primera libre de su secuencia de sondeo lineal."""
+    mascara = (1 << bits) - 1
+    r = ((codigo * MULTIPLICADOR_HASH) & MASCARA_64) >> (64 - bits)
+    while True:
+        k = claves[r]
+        if k == codigo or k == 0:
+            return r
+        r = (r + 1) & mascara
+
+def leer_movimiento(movimientos, r):
+    return (movimientos[r >> 2] >> ((r & 3) << 1)) & 3
+
+def escribir_movimiento(movimientos, r, m):
+    desplazamiento = (r & 3) << 1
+    movimientos[r >> 2] = (movimientos[r >> 2] & ~(3 << desplazamiento)) | (m << desplazamiento)
+
+def crear_tabla(bits):
+    return array('Q', bytes(8 << bits)), bytearray((1 << bits) >> 2 or 1)
+
+def crecer_tabla(claves, movimientos, bits):
+    """Duplica la tabla y reinserta todos los estados con su movimiento."""
+    nuevas_claves, nuevos_movimientos = crear_tabla(bits + 1)
+    for r, codigo in enumerate(claves):
+        if codigo:
+            nr = ranura_de(nuevas_claves, bits + 1, codigo)
+            nuevas_claves[nr] = codigo
+            escribir_movimiento(nuevos_movimientos, nr, leer_movimiento(movimientos, r))
+    return nuevas_claves, nuevos_movimientos, bits + 1
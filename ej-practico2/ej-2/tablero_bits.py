@@ -0,0 +1,58 @@
+"""
+Representación empaquetada del 15-puzzle.
+
+El tablero completo cabe en un solo entero de 64 bits: cada casilla ocupa 4 bits (un nibble)
+y la casilla i se guarda en los bits 4*i .. 4*i+3. El hueco (0) es un nibble en cero, así que
+mover el hueco equivale a copiar un nibble de una posición a otra.
+
+La posición del hueco viaja junto al entero (no dentro de él) para no tener que buscarla.
+"""
+from geometria import GEOMETRIA_4x4, LISTA_MOVIMIENTOS
+
+# ------------------------------ Configuración base ------------------------------
+# Las tablas salen de la geometría 4x4 (geometria.py); para otros tamaños usar Geometria directamente.
+TAMANO_TABLERO = GEOMETRIA_4x4.columnas
+NUM_CASILLAS = GEOMETRIA_4x4.num_casillas
+BITS_CASILLA = GEOMETRIA_4x4.bits_casilla
+MASCARA_CASILLA = GEOMETRIA_4x4.mascara_casilla  # 0xF
+
+# ------------------------------ Conversión tupla <-> entero ------------------------------
+def empaquetar(estado):
+    """Devuelve (codigo, indice_cero) a partir de la tupla de 16 valores."""
+    return GEOMETRIA_4x4.empaquetar(estado)
+
+def desempaquetar(codigo):
+    """Devuelve la tupla de 16 valores (para imprimir_tablero, heurísticas, etc.)."""
+    return GEOMETRIA_4x4.desempaquetar(codigo)
+
+def ficha_en(codigo, indice):
+    return (codigo >> (BITS_CASILLA * indice)) & MASCARA_CASILLA
+
+# ------------------------------ Tabla de vecinos del hueco ------------------------------
+# Para cada posición del hueco, la lista de (movimiento, indice_destino) válidos,
+# en el mismo orden determinista que LISTA_MOVIMIENTOS.
+VECINOS_HUECO = GEOMETRIA_4x4.vecinos_hueco
+
+'''
+Ejemplo: hueco en el índice 5 (fila 1, columna 1)
+VECINOS_HUECO[5] = (('arriba', 1), ('abajo', 9), ('izquierda', 4), ('derecha', 6))
+Hueco en el índice 15 (esquina inferior derecha)
+VECINOS_HUECO[15] = (('arriba', 11), ('izquierda', 14))
+'''
+
+def mover_hueco(codigo, indice_cero, indice_destino):
+    """
+    Devuelve el código tras intercambiar el hueco con la ficha en indice_destino.
+    Como el nibble del hueco vale 0, basta con quitar la ficha de su sitio y ponerla en el del hueco.
+    """
+    ficha = (codigo >> (indice_destino << 2)) & MASCARA_CASILLA
+    return codigo ^ (ficha << (indice_destino << 2)) ^ (ficha << (indice_cero << 2))
+
+def sucesores(codigo, indice_cero):
+    """Genera (movimiento, codigo_sucesor, indice_cero_sucesor) en orden determinista."""
+    for mov, j in VECINOS_HUECO[indice_cero]:
+        yield mov, mover_hueco(codigo, indice_cero, j), j
+
+# ------------------------------ Objetivo empaquetado ------------------------------
+ESTADO_OBJETIVO = GEOMETRIA_4x4.objetivo
+CODIGO_OBJETIVO, INDICE_CERO_OBJETIVO = GEOMETRIA_4x4.codigo_objetivo, GEOMETRIA_4x4.indice_cero_objetivo
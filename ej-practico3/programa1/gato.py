@@ -1,4 +1,5 @@
-import time, random
+import time, random, os
+import multiprocessing
 
 N = 4                # Tamaño del tablero (4x4)
 HUM = 'X'            # Símbolo del humano
@@ -7,6 +8,9 @@ AI = 'O'             # Símbolo de la IA
 MAX_TIME_SEC = 4.5   # Tiempo máximo por jugada de la IA (segundos)
 MAX_DEPTH = 8        # Profundidad máxima de búsqueda en minimax
 INF = 10**9          # Valor infinito para comparación
+USAR_TABLA = True    # Jugar con la tabla de juego perfecto (tabla_gato.py) si ya fue construida
+TRABAJADORES = os.cpu_count() or 1   # Procesos para la búsqueda en paralelo
+PARALELO = False                     # Repartir las jugadas de la raíz entre procesos (ver comparar_paralelo)
 
 # Tablero y utilidades
 
@@ -75,25 +79,6 @@ def mostrar_tablero(tablero):
         print(f"{i}  " + " ".join(fila)) # join() une los elementos de un iterable en una única cadena.
     print()
 
-def movimientos_posibles(tablero):
-    # Devuelve lista de casillas vacías
-    movs = []
-    for i in range(N):
-        for j in range(N):
-            if tablero[i][j] == ' ': # Si la celda [i][j] esta vacia
-                movs.append((i, j))  # Guarda ese valor en movs.
-    return movs                      # Regresa en una lista de tuplas los espacios vacios, indicando la fil y columna.
-'''
-Recordando que crear tablero, returna un tablero que es una lista de listas
-tablero = [
-    ['X',' ','O',' '],
-    [' ','X',' ',' '],
-    [' ',' ','O',' '],
-    [' ',' ',' ',' '],
-]
-Con esto devuelve: [(0,1),(0,3),(1,0),(1,2),(1,3),(2,0),(2,1),(2,3),(3,0),(3,1),(3,2),(3,3)]
-
-'''
 def tablero_lleno(tablero):
     # Verifica si el tablero está lleno
     for i in range(N):
@@ -236,12 +221,132 @@ def ordenar_movimientos(movs):
     return movs_ordenados
 
 
+# Tablero de bits
+
+'''
+La búsqueda no usa la lista de listas: cada jugador es una máscara de 16 bits y la casilla (i, j)
+es el bit i*N + j.
+
+    bit:   0  1  2  3
+           4  5  6  7
+           8  9 10 11
+          12 13 14 15
+
+Ejemplo: X en (0,0) y (1,1), O en (0,1)  →  humano = 0b100001 (bits 0 y 5), ia = 0b10 (bit 1)
+
+Poner una ficha es un OR (no hay que deshacerla al volver de la recursión), una línea completa es
+(fichas & linea) == linea y las casillas vacías son los bits apagados de humano | ia.
+'''
+TABLERO_COMPLETO = (1 << (N * N)) - 1   # 0xFFFF: las 16 casillas ocupadas
+
+def bit(i, j):
+    # Máscara de la casilla (i, j)
+    return 1 << (i * N + j)
+
+MASCARAS_LINEAS = []  # Las 10 LINEAS como máscaras
+for linea in LINEAS:
+    mascara = 0
+    for i, j in linea:
+        mascara |= bit(i, j)
+    MASCARAS_LINEAS.append(mascara)
+
+# Índices de bit en el orden de ordenar_movimientos (centros, esquinas y luego bordes)
+ORDEN_CASILLAS = []
+for i, j in ordenar_movimientos([(i, j) for i in range(N) for j in range(N)]):
+    ORDEN_CASILLAS.append(i * N + j)
+
+def a_bits(tablero):
+    # Convierte la lista de listas en (humano, ia)
+    humano = 0
+    ia = 0
+    for i in range(N):
+        for j in range(N):
+            if tablero[i][j] == HUM:
+                humano |= bit(i, j)
+            elif tablero[i][j] == AI:
+                ia |= bit(i, j)
+    return humano, ia
+
+def gana_bits(fichas):
+    # 10 comparaciones AND en lugar de recorrer filas, columnas y diagonales
+    for linea in MASCARAS_LINEAS:
+        if fichas & linea == linea:
+            return True
+    return False
+
+def casillas_libres(humano, ia):
+    # Índices de bit vacíos, ya en el orden de ORDEN_CASILLAS
+    ocupadas = humano | ia
+    libres = []
+    for c in ORDEN_CASILLAS:
+        if not ocupadas >> c & 1:
+            libres.append(c)
+    return libres
+
+# Simetrías
+
+'''
+LINEAS, CENTROS y ESQUINAS no cambian al rotar o reflejar el tablero, así que las 8 simetrías
+del cuadrado dejan igual el valor de una posición. Cada simetría es una permutación de casillas
+(SIMETRIAS[s][c] = casilla a la que va c) y, para aplicarla a una máscara sin recorrer los 16 bits,
+se precalcula la imagen de cada byte: transformar(m, s) = BYTE_BAJO[s][m & 255] | BYTE_ALTO[s][m >> 8].
+'''
+SIMETRIAS = []
+for f in (lambda i, j: (i, j),             # identidad
+          lambda i, j: (j, N-1-i),         # rotación 90°
+          lambda i, j: (N-1-i, N-1-j),     # rotación 180°
+          lambda i, j: (N-1-j, i),         # rotación 270°
+          lambda i, j: (i, N-1-j),         # reflejo horizontal
+          lambda i, j: (N-1-i, j),         # reflejo vertical
+          lambda i, j: (j, i),             # diagonal principal
+          lambda i, j: (N-1-j, N-1-i)):    # diagonal secundaria
+    permutacion = []
+    for c in range(N * N):
+        i, j = f(c // N, c % N)
+        permutacion.append(i * N + j)
+    SIMETRIAS.append(permutacion)
+
+def _imagenes_de_bytes(permutacion, desde):
+    imagenes = []
+    for byte in range(256):
+        m = 0
+        for k in range(8):
+            if byte >> k & 1:
+                m |= 1 << permutacion[desde + k]
+        imagenes.append(m)
+    return imagenes
+
+INVERSAS = []  # INVERSAS[s][SIMETRIAS[s][c]] = c
+for permutacion in SIMETRIAS:
+    inversa = [0] * (N * N)
+    for c in range(N * N):
+        inversa[permutacion[c]] = c
+    INVERSAS.append(inversa)
+
+BYTE_BAJO = [_imagenes_de_bytes(p, 0) for p in SIMETRIAS]
+BYTE_ALTO = [_imagenes_de_bytes(p, 8) for p in SIMETRIAS]
+
+def transformar(mascara, s):
+    # Imagen de una máscara de 16 bits por la simetría s
+    return BYTE_BAJO[s][mascara & 255] | BYTE_ALTO[s][mascara >> 8]
+
+def canonica(humano, ia):
+    # Representante de la posición entre sus 8 simetrías: (clave mínima, simetría que lleva a ella)
+    mejor = None
+    mejor_s = 0
+    for s in range(len(SIMETRIAS)):
+        clave = transformar(humano, s) | transformar(ia, s) << 16
+        if mejor is None or clave < mejor:
+            mejor = clave
+            mejor_s = s
+    return mejor, mejor_s
+
 # Ponderaciones según cantidad de fichas propias en una línea abierta
 PESO = {0:0, 1:1, 2:4, 3:9}
 
 
 '''
-La funcion toma el estado actual del tablero y devuelve un único número 
+La funcion toma el estado actual del tablero y devuelve un único número
 que indica qué tan favorable es esa posición para la IA
 
 CASO 1: Si una línea contiene tanto fichas de la IA ('O') como fichas del humano ('X'), se considera bloqueada.
@@ -251,19 +356,15 @@ Si solo hay fichas de la IA (os > 0 y xs = 0), la puntuación del tablero aument
 Si solo hay fichas del humano (xs > 0 y os = 0), la puntuación del tablero disminuye (se resta) según el valor de PESO
 
 Al final, la suma de todas estas ponderaciones es el puntaje final que Minimax usará para decidir qué tan buena es esa posición
+
+Con máscaras, contar las fichas de un jugador en una línea es un popcount: (ia & linea).bit_count()
 '''
-def evaluar(tablero):
+def evaluar(humano, ia):
     # Evalúa el tablero para posiciones no terminales
     puntaje = 0
-    for linea in LINEAS:
-        xs = 0
-        os = 0
-        for pos in linea:
-            i, j = pos
-            if tablero[i][j] == AI:
-                os += 1
-            elif tablero[i][j] == HUM:
-                xs += 1
+    for linea in MASCARAS_LINEAS:
+        xs = (humano & linea).bit_count()
+        os = (ia & linea).bit_count()
         if xs and os:
             continue  # Línea bloqueada, no suma
         if os:
@@ -272,135 +373,499 @@ def evaluar(tablero):
             puntaje -= PESO[xs]
     return puntaje
 
-# Transposición (memoización)
+# Transposición (tabla Zobrist de tamaño fijo)
 
-def clave_estado(tablero, turno_max, profundidad):
-    # Genera una clave única para el estado actual del tablero
-    filas = []
-    for i in range(N):
-        fila = ""
-        for j in range(N):
-            fila += tablero[i][j]
-        filas.append(fila)
-    clave = "|".join(filas) + f"|T{1 if turno_max else 0}|D{profundidad}"
-    return clave
+'''
+Cada (casilla, jugador) tiene un número aleatorio de 64 bits y el hash de una posición es el XOR de
+los números de sus fichas. Poner una ficha es un XOR más, así que minimax recibe el hash del padre y
+lo actualiza sin recorrer el tablero. El turno no entra en el hash: con el humano empezando siempre,
+las fichas en el tablero ya dicen a quién le toca.
+
+Para que las 8 simetrías de una posición compartan entrada, el hash lleva 8 carriles de 64 bits en un
+solo entero: el carril s es el hash de la posición transformada por SIMETRIAS[s]. Una jugada sigue
+siendo un solo XOR (ZOBRIST_HUM[c] tiene en el carril s el número de la casilla SIMETRIAS[s][c]) y la
+clave de la TT es el menor de los 8 carriles, el mismo para toda la clase de simetría. La mejor casilla
+se guarda vista desde esa simetría y se devuelve a coordenadas reales con INVERSAS.
+
+TT es una lista de TAMANO_TT entradas (clave, profundidad, valor, tipo, mejor casilla, edad) indexada
+por los bits bajos de la clave. Como hay poda alfa-beta, el valor guardado no siempre es exacto:
+
+    EXACTA    el valor cayó dentro de (alpha, beta)
+    INFERIOR  hubo corte beta: el valor real es >= valor
+    SUPERIOR  ninguna jugada superó alpha: el valor real es <= valor
+
+Reemplazo por profundidad: una entrada de esta misma jugada solo se pisa con una búsqueda al menos
+igual de profunda; las de jugadas anteriores (otra edad) se pisan siempre. La tabla no se vacía entre
+profundidades ni entre jugadas, así cada iteración arranca con lo que dejó la anterior.
+'''
+TAMANO_TT = 1 << 18     # Entradas de la tabla de transposición (potencia de 2)
+EXACTA, INFERIOR, SUPERIOR = 0, 1, 2
+
+_azar = random.Random(4)  # Semilla fija: los mismos números en cada ejecución
+_numeros_hum = [_azar.getrandbits(64) for _ in range(N * N)]
+_numeros_ai = [_azar.getrandbits(64) for _ in range(N * N)]
+MASCARA_64 = (1 << 64) - 1
+
+def _carriles(numeros, c):
+    h = 0
+    for s, permutacion in enumerate(SIMETRIAS):
+        h |= numeros[permutacion[c]] << (64 * s)
+    return h
+
+ZOBRIST_HUM = [_carriles(_numeros_hum, c) for c in range(N * N)]
+ZOBRIST_AI = [_carriles(_numeros_ai, c) for c in range(N * N)]
+
+def clave_canonica(h):
+    # (menor de los 8 carriles, simetría de ese carril)
+    clave = h & MASCARA_64
+    s_clave = 0
+    for s in range(1, len(SIMETRIAS)):
+        carril = h >> (64 * s) & MASCARA_64
+        if carril < clave:
+            clave = carril
+            s_clave = s
+    return clave, s_clave
+
+def hash_zobrist(humano, ia):
+    # Hash (8 carriles) de una posición desde cero (en minimax se actualiza con un XOR por jugada)
+    h = 0
+    for c in range(N * N):
+        if humano >> c & 1:
+            h ^= ZOBRIST_HUM[c]
+        elif ia >> c & 1:
+            h ^= ZOBRIST_AI[c]
+    return h
+
+TT = [None] * TAMANO_TT
+edad_tt = 0  # Se incrementa en cada llamada a mejor_movimiento
+
+def guardar_tt(clave, profundidad, valor, tipo, mejor):
+    indice = clave & (TAMANO_TT - 1)
+    entrada = TT[indice]
+    if entrada is None or entrada[5] != edad_tt or profundidad >= entrada[1]:
+        TT[indice] = (clave, profundidad, valor, tipo, mejor, edad_tt)
 
-TT = {}  # Diccionario de transposición para guardar valores ya calculados
+'''
+Una victoria a k jugadas de distancia vale GANA - k, medido desde el nodo y no desde la raíz, para
+que el mismo valor sirva al encontrar la posición por otro camino o en otra jugada. Al subir un nivel
+la victoria queda una jugada más lejos (un_paso_mas) y la ventana que se le pasa al hijo se corre al
+revés (un_paso_menos).
+'''
+GANA = 100000
+UMBRAL_GANA = GANA - N * N   # Más allá de esto el valor es una victoria, no una evaluación
 
-# Minimax con alfa-beta, tope de tiempo y memorización 
+def un_paso_mas(valor):
+    if UMBRAL_GANA <= valor <= GANA:
+        return valor - 1
+    if -GANA <= valor <= -UMBRAL_GANA:
+        return valor + 1
+    return valor
 
-def minimax(tablero, profundidad, turno_max, alpha, beta, t0, tlim):
-    # Algoritmo minimax con poda alfa-beta y límite de tiempo
-    if time.time() - t0 > tlim:
-        raise TimeoutError
+def un_paso_menos(valor):
+    if UMBRAL_GANA - 1 <= valor <= GANA:
+        return valor + 1
+    if -GANA <= valor <= -UMBRAL_GANA + 1:
+        return valor - 1
+    return valor
+
+# Ordenamiento dinámico de jugadas
+
+'''
+ordenar_movimientos es un orden fijo: centro, esquinas, bordes. Con ORDEN_DINAMICO, cada nodo ordena
+con lo que la búsqueda ya aprendió:
 
-    if hay_ganador(tablero, AI):
-        return 100000 - profundidad
-    if hay_ganador(tablero, HUM):
-        return -100000 + profundidad
-    if tablero_lleno(tablero) or profundidad == 0:
-        return evaluar(tablero)
+    1) la mejor jugada guardada en la TT: la de la variante principal de la iteración anterior
+    2) después, por clase de casilla (centro, esquina, borde) y dentro de cada clase primero las dos
+       jugadas asesinas del nivel (las últimas que provocaron un corte con k fichas en el tablero) y
+       luego por HISTORIA: cada corte suma profundidad² a la casilla del jugador que cortó
 
-    clave = clave_estado(tablero, turno_max, profundidad)
-    if clave in TT:
-        return TT[clave]
+En el 4x4 la clase de casilla pesa más que cualquier cosa aprendida: poner asesinas o historia por
+encima de ella visitaba más nodos que el orden fijo. Por lo mismo la raíz no adelanta la mejor jugada
+de la iteración anterior (cambia entre profundidades pares e impares).
 
-    movs = ordenar_movimientos(movimientos_posibles(tablero))
+Encima va PVS: la primera jugada se busca con la ventana completa y las demás con ventana nula, solo
+para probar que no son mejores; si alguna lo es, se vuelve a buscar con la ventana completa (rebusqueda).
+
+ESTADISTICAS cuenta nodos, cortes, cortes con la primera jugada y rebúsquedas de la última llamada a
+mejor_movimiento; python gato.py comparar muestra los nodos con y sin ordenamiento dinámico.
+'''
+ORDEN_DINAMICO = True         # False: orden fijo + jugada de la TT, sin PVS (para comparar)
+MOSTRAR_ESTADISTICAS = False  # Imprime ESTADISTICAS después de cada jugada de la IA
+ESTADISTICAS = {'nodos': 0, 'cortes': 0, 'cortes_primera': 0, 'rebusquedas': 0}
+
+CLASE = []  # 0 centro, 1 esquina, 2 borde
+for c in range(N * N):
+    casilla = (c // N, c % N)
+    CLASE.append(0 if casilla in CENTROS else 1 if casilla in ESQUINAS else 2)
+
+ASESINAS = [[-1, -1] for _ in range(N * N + 1)]  # Por cantidad de fichas en el tablero
+HISTORIA = [[0] * (N * N) for _ in range(2)]      # [0] humano, [1] IA
+
+def ordenar_dinamico(movs, primera, fichas, historia):
+    asesinas = ASESINAS[fichas]
+    def prioridad(c):
+        if c == primera: return -INF
+        if c in asesinas: return CLASE[c] * INF - INF // 2
+        return CLASE[c] * INF - historia[c]
+    return sorted(movs, key=prioridad)
+
+def registrar_corte(fichas, historia, c, profundidad):
+    asesinas = ASESINAS[fichas]
+    if asesinas[0] != c:
+        asesinas[1] = asesinas[0]
+        asesinas[0] = c
+    historia[c] += profundidad * profundidad
+
+def reiniciar_busqueda():
+    # Vacía TT, asesinas e historia (para medir desde cero)
+    TT[:] = [None] * TAMANO_TT
+    for asesinas in ASESINAS:
+        asesinas[0] = asesinas[1] = -1
+    for historia in HISTORIA:
+        historia[:] = [0] * (N * N)
+
+# Minimax con alfa-beta, tope de tiempo y memorización
+
+def minimax(humano, ia, h, profundidad, turno_max, alpha, beta, t0, tlim):
+    # Algoritmo minimax con poda alfa-beta (PVS), límite de tiempo y tabla de transposición
+    if time.time() - t0 > tlim:
+        raise TimeoutError
+    ESTADISTICAS['nodos'] += 1
+
+    if gana_bits(ia):
+        return GANA
+    if gana_bits(humano):
+        return -GANA
+    if humano | ia == TABLERO_COMPLETO or profundidad == 0:
+        return evaluar(humano, ia)
+
+    movs = casillas_libres(humano, ia)
+    clave, s = clave_canonica(h)
+    mejor_tt = -1
+    entrada = TT[clave & (TAMANO_TT - 1)]
+    if entrada is not None and entrada[0] == clave:
+        _, prof_tt, valor_tt, tipo_tt, mejor_tt, _ = entrada
+        if prof_tt >= profundidad:
+            if tipo_tt == EXACTA:
+                return valor_tt
+            if tipo_tt == INFERIOR and valor_tt > alpha:
+                alpha = valor_tt
+            elif tipo_tt == SUPERIOR and valor_tt < beta:
+                beta = valor_tt
+            if alpha >= beta:
+                return valor_tt
+        mejor_tt = INVERSAS[s][mejor_tt]
+    fichas = (humano | ia).bit_count()
+    historia = HISTORIA[1 if turno_max else 0]
+    if ORDEN_DINAMICO:
+        movs = ordenar_dinamico(movs, mejor_tt, fichas, historia)
+    elif mejor_tt in movs:
+        # La mejor jugada de la búsqueda anterior va primero
+        movs.remove(mejor_tt)
+        movs.insert(0, mejor_tt)
+    alpha_inicial, beta_inicial = alpha, beta
+    mejor_casilla = -1
 
     if turno_max:
         mejor = -INF
         # Busca jugadas ganadoras inmediatas
-        for mov in movs:
-            i, j = mov
-            tablero[i][j] = AI
-            if hay_ganador(tablero, AI):
-                tablero[i][j] = ' '
-                TT[clave] = 100000 - (MAX_DEPTH - profundidad)
-                return TT[clave]
-            tablero[i][j] = ' '
-        for mov in movs:
-            i, j = mov
-            tablero[i][j] = AI
-            try:
-                valor = minimax(tablero, profundidad-1, False, alpha, beta, t0, tlim)
-            finally:
-                tablero[i][j] = ' '
+        for c in movs:
+            if gana_bits(ia | 1 << c):
+                guardar_tt(clave, profundidad, GANA - 1, EXACTA, SIMETRIAS[s][c])
+                return GANA - 1
+        for n, c in enumerate(movs):
+            hijo_ia, hijo_h = ia | 1 << c, h ^ ZOBRIST_AI[c]
+            if n == 0 or not ORDEN_DINAMICO:
+                valor = un_paso_mas(minimax(humano, hijo_ia, hijo_h, profundidad-1, False,
+                                            un_paso_menos(alpha), un_paso_menos(beta), t0, tlim))
+            else:
+                # Ventana nula: ¿supera a alpha?
+                valor = un_paso_mas(minimax(humano, hijo_ia, hijo_h, profundidad-1, False,
+                                            un_paso_menos(alpha), un_paso_menos(alpha + 1), t0, tlim))
+                if alpha < valor < beta:
+                    ESTADISTICAS['rebusquedas'] += 1
+                    valor = un_paso_mas(minimax(humano, hijo_ia, hijo_h, profundidad-1, False,
+                                                un_paso_menos(alpha), un_paso_menos(beta), t0, tlim))
             if valor > mejor:
                 mejor = valor
+                mejor_casilla = c
             if mejor > alpha:
                 alpha = mejor
             if beta <= alpha:
+                ESTADISTICAS['cortes'] += 1
+                ESTADISTICAS['cortes_primera'] += n == 0
+                registrar_corte(fichas, historia, c, profundidad)
                 break
-        TT[clave] = mejor
-        return mejor
     else:
-        peor = INF
+        mejor = INF
         # Busca bloqueos inmediatos si el humano puede ganar
-        for mov in movs:
-            i, j = mov
-            tablero[i][j] = HUM
-            if hay_ganador(tablero, HUM):
-                tablero[i][j] = ' '
-                TT[clave] = -100000 + (MAX_DEPTH - profundidad)
-                return TT[clave]
-            tablero[i][j] = ' '
-        for mov in movs:
-            i, j = mov
-            tablero[i][j] = HUM
-            try:
-                valor = minimax(tablero, profundidad-1, True, alpha, beta, t0, tlim)
-            finally:
-                tablero[i][j] = ' '
-            if valor < peor:
-                peor = valor
-            if peor < beta:
-                beta = peor
+        for c in movs:
+            if gana_bits(humano | 1 << c):
+                guardar_tt(clave, profundidad, -GANA + 1, EXACTA, SIMETRIAS[s][c])
+                return -GANA + 1
+        for n, c in enumerate(movs):
+            hijo_humano, hijo_h = humano | 1 << c, h ^ ZOBRIST_HUM[c]
+            if n == 0 or not ORDEN_DINAMICO:
+                valor = un_paso_mas(minimax(hijo_humano, ia, hijo_h, profundidad-1, True,
+                                            un_paso_menos(alpha), un_paso_menos(beta), t0, tlim))
+            else:
+                # Ventana nula: ¿queda por debajo de beta?
+                valor = un_paso_mas(minimax(hijo_humano, ia, hijo_h, profundidad-1, True,
+                                            un_paso_menos(beta - 1), un_paso_menos(beta), t0, tlim))
+                if alpha < valor < beta:
+                    ESTADISTICAS['rebusquedas'] += 1
+                    valor = un_paso_mas(minimax(hijo_humano, ia, hijo_h, profundidad-1, True,
+                                                un_paso_menos(alpha), un_paso_menos(beta), t0, tlim))
+            if valor < mejor:
+                mejor = valor
+                mejor_casilla = c
+            if mejor < beta:
+                beta = mejor
             if beta <= alpha:
+                ESTADISTICAS['cortes'] += 1
+                ESTADISTICAS['cortes_primera'] += n == 0
+                registrar_corte(fichas, historia, c, profundidad)
                 break
-        TT[clave] = peor
-        return peor
+
+    if mejor <= alpha_inicial:
+        tipo = SUPERIOR
+    elif mejor >= beta_inicial:
+        tipo = INFERIOR
+    else:
+        tipo = EXACTA
+    guardar_tt(clave, profundidad, mejor, tipo, SIMETRIAS[s][mejor_casilla])
+    return mejor
+
+# Tabla de juego perfecto
+
+'''
+tabla_gato.py resuelve el 4x4 completo una sola vez (python tabla_gato.py construir) y deja el resultado
+y la mejor jugada de cada posición en tablas/gato_4x4.bin. Si el archivo existe, mejor_movimiento
+lo mapea en memoria la primera vez y responde con una lectura; si no, busca con minimax como siempre.
+'''
+TABLA_PERFECTA = None  # mmap de la tabla; False si no se encontró el archivo
+
+def jugada_de_tabla(humano, ia):
+    # Casilla de juego perfecto para la IA, o None si no hay tabla
+    global TABLA_PERFECTA
+    if TABLA_PERFECTA is None:
+        from tabla_gato import cargar_tabla
+        try:
+            TABLA_PERFECTA = cargar_tabla()
+        except FileNotFoundError:
+            TABLA_PERFECTA = False
+    if not TABLA_PERFECTA:
+        return None
+    from tabla_gato import consultar
+    respuesta = consultar(TABLA_PERFECTA, humano, ia)
+    return None if respuesta is None else respuesta[1]
 
 def mejor_movimiento(tablero):
     # Busca el mejor movimiento para la IA usando minimax con iterative deepening
+    global edad_tt
     t0 = time.time()
     limite = MAX_TIME_SEC
-    movs = ordenar_movimientos(movimientos_posibles(tablero))
+    humano, ia = a_bits(tablero)
+    h = hash_zobrist(humano, ia)
+    movs = casillas_libres(humano, ia)
     if not movs:
         return None
+    if USAR_TABLA:
+        c = jugada_de_tabla(humano, ia)
+        if c is not None:
+            return divmod(c, N)
+    edad_tt += 1
+    for clave_estadistica in ESTADISTICAS:
+        ESTADISTICAS[clave_estadistica] = 0
+    for historia in HISTORIA:
+        # La historia de jugadas anteriores sirve, pero pesa menos
+        historia[:] = [v // 2 for v in historia]
+
+    # Jugadas que dejan posiciones simétricas valen lo mismo: se busca solo la primera de cada clase
+    # (sigue siendo una casilla real, no hay que transformar la respuesta)
+    unicas = []
+    vistas = set()
+    for c in movs:
+        clave = clave_canonica(h ^ ZOBRIST_AI[c])[0]
+        if clave not in vistas:
+            vistas.add(clave)
+            unicas.append(c)
+    movs = unicas
+    if PARALELO and len(movs) > 1:
+        return divmod(buscar_en_paralelo(humano, ia, h, movs, t0, limite), N)
 
     mejor_mov = random.choice(movs)
-    mejor_val = -INF
 
-    # Búsqueda iterativa por profundidad creciente
+    # Búsqueda iterativa por profundidad creciente (la TT se conserva entre iteraciones)
     for d in range(1, MAX_DEPTH + 1):
         if time.time() - t0 > limite:
             break
-        TT.clear()
         mov_local = mejor_mov
         val_local = -INF
-        for mov in movs:
-            i, j = mov
-            if time.time() - t0 > limite:
-                break
-            tablero[i][j] = AI
+        completa = True
+        for n, c in enumerate(movs):
             try:
-                valor = minimax(tablero, d-1, False, -INF, INF, t0, limite)
+                if n == 0 or not ORDEN_DINAMICO:
+                    # Con la ventana (val_local, INF) el hijo puede cortar en cuanto no supere a la mejor
+                    valor = un_paso_mas(minimax(humano, ia | 1 << c, h ^ ZOBRIST_AI[c], d-1, False,
+                                                un_paso_menos(val_local), INF, t0, limite))
+                else:
+                    valor = un_paso_mas(minimax(humano, ia | 1 << c, h ^ ZOBRIST_AI[c], d-1, False,
+                                                un_paso_menos(val_local), un_paso_menos(val_local + 1), t0, limite))
+                    if valor > val_local:
+                        ESTADISTICAS['rebusquedas'] += 1
+                        valor = un_paso_mas(minimax(humano, ia | 1 << c, h ^ ZOBRIST_AI[c], d-1, False,
+                                                    un_paso_menos(val_local), INF, t0, limite))
             except TimeoutError:
-                tablero[i][j] = ' '
+                completa = False
                 break
-            tablero[i][j] = ' '
             if valor > val_local:
                 val_local = valor
-                mov_local = (i, j)
+                mov_local = c
         # Si terminamos bien esta profundidad, actualizamos mejor global
-        if time.time() - t0 <= limite and val_local > -INF:
-            mejor_val = val_local
+        if completa and val_local > -INF:
             mejor_mov = mov_local
         else:
             break
 
+    return divmod(mejor_mov, N)  # Índice de bit → (fila, columna)
+
+# Búsqueda en paralelo (división de la raíz)
+
+'''
+Con PARALELO, cada iteración de profundidad reparte las jugadas de la raíz entre TRABAJADORES procesos
+(un Pool que vive toda la partida). Todos comparten:
+
+    - la cota alpha (ALFA_COMPARTIDO, un multiprocessing.Value): cada trabajador busca su jugada con
+      la ventana (alpha, INF) leída al empezar y la sube si encuentra algo mejor, así las jugadas que
+      empiezan después cortan antes, como en la búsqueda secuencial;
+    - el plazo: t0 y el límite son de reloj de pared, así que todos lanzan TimeoutError en el mismo momento.
+
+Cada proceso tiene su propia TT (no compartida) que se conserva entre iteraciones y jugadas. Una
+iteración cuenta solo si terminaron todas sus jugadas; la respuesta es la mejor de la última profundidad
+completa (en empate, la primera en el orden de la raíz). Las ESTADISTICAS de los trabajadores se suman.
+
+Está apagado por defecto: la raíz en paralelo pierde la ventana nula (PVS) y lo que la iteración anterior
+dejó en la TT del proceso principal, y no se midió ninguna mejora (solo una CPU disponible). Activarlo
+después de comprobar con python gato.py paralelo que rinde en la máquina.
+'''
+POOL = None
+ALFA_COMPARTIDO = None
+
+def _iniciar_trabajador(alfa):
+    global ALFA_COMPARTIDO
+    ALFA_COMPARTIDO = alfa
+
+def _buscar_jugada_raiz(tarea):
+    # Trabajador: valor de una jugada de la raíz a profundidad d, o None si se acabó el tiempo
+    global edad_tt
+    humano, ia, h, c, d, t0, limite, edad = tarea
+    edad_tt = edad
+    for clave_estadistica in ESTADISTICAS:
+        ESTADISTICAS[clave_estadistica] = 0
+    alpha = ALFA_COMPARTIDO.value
+    try:
+        valor = un_paso_mas(minimax(humano, ia | 1 << c, h ^ ZOBRIST_AI[c], d-1, False,
+                                    un_paso_menos(alpha), INF, t0, limite))
+    except TimeoutError:
+        return c, None, dict(ESTADISTICAS)
+    with ALFA_COMPARTIDO.get_lock():
+        if valor > ALFA_COMPARTIDO.value:
+            ALFA_COMPARTIDO.value = valor
+    return c, valor, dict(ESTADISTICAS)
+
+def obtener_pool():
+    global POOL, ALFA_COMPARTIDO
+    if POOL is None:
+        ALFA_COMPARTIDO = multiprocessing.Value('q', -INF)
+        POOL = multiprocessing.Pool(TRABAJADORES, initializer=_iniciar_trabajador, initargs=(ALFA_COMPARTIDO,))
+    return POOL
+
+def cerrar_pool():
+    global POOL
+    if POOL is not None:
+        POOL.terminate()
+        POOL.join()
+        POOL = None
+
+def buscar_en_paralelo(humano, ia, h, movs, t0, limite):
+    # Iterative deepening con las jugadas de la raíz repartidas entre procesos; devuelve la casilla
+    pool = obtener_pool()
+    mejor_mov = random.choice(movs)
+    for d in range(1, MAX_DEPTH + 1):
+        if time.time() - t0 > limite:
+            break
+        ALFA_COMPARTIDO.value = -INF
+        tareas = [(humano, ia, h, c, d, t0, limite, edad_tt) for c in movs]
+        resultados = pool.map(_buscar_jugada_raiz, tareas, chunksize=1)
+        for _, _, estadisticas in resultados:
+            for clave_estadistica, cantidad in estadisticas.items():
+                ESTADISTICAS[clave_estadistica] += cantidad
+        if any(valor is None for _, valor, _ in resultados):
+            break
+        val_local = -INF
+        for c, valor, _ in resultados:  # map conserva el orden de movs
+            if valor > val_local:
+                val_local = valor
+                mejor_mov = c
     return mejor_mov
 
+def comparar_paralelo():
+    # Tiempo y nodos de mejor_movimiento en secuencial y en paralelo (sin tabla perfecta)
+    global USAR_TABLA, PARALELO
+    usar_tabla, paralelo = USAR_TABLA, PARALELO
+    USAR_TABLA = False
+    posiciones = [[(0, 0)], [(1, 2)], [(0, 0), (1, 1), (2, 2)], [(0, 1), (1, 1), (3, 2)],
+                  [(0, 1), (1, 1), (3, 2), (2, 2), (0, 3)]]
+    print(f"Trabajadores: {TRABAJADORES}")
+    print(f"{'fichas':>6} {'s secuencial':>13} {'s paralelo':>11} {'nodos sec.':>11} {'nodos par.':>11} "
+          f"{'cortes sec.':>12} {'cortes par.':>12}")
+    for jugadas in posiciones:
+        tablero = crear_tablero()
+        for n, (i, j) in enumerate(jugadas):
+            tablero[i][j] = HUM if n % 2 == 0 else AI
+        tiempos, nodos, cortes = [], [], []
+        for PARALELO in (False, True):
+            reiniciar_busqueda()
+            if PARALELO:
+                cerrar_pool()  # trabajadores nuevos, con la TT vacía
+            t0 = time.time()
+            mejor_movimiento(tablero)
+            tiempos.append(time.time() - t0)
+            nodos.append(ESTADISTICAS['nodos'])
+            cortes.append(ESTADISTICAS['cortes'])
+        print(f"{len(jugadas):>6} {tiempos[0]:>13.2f} {tiempos[1]:>11.2f} {nodos[0]:>11,} {nodos[1]:>11,} "
+              f"{cortes[0]:>12,} {cortes[1]:>12,}")
+    cerrar_pool()
+    USAR_TABLA, PARALELO = usar_tabla, paralelo
+
+def comparar_ordenamiento():
+    # Nodos visitados por mejor_movimiento con orden fijo y con orden dinámico + PVS (sin tabla perfecta)
+    global USAR_TABLA, ORDEN_DINAMICO, PARALELO
+    usar_tabla, orden_dinamico, paralelo = USAR_TABLA, ORDEN_DINAMICO, PARALELO
+    USAR_TABLA = PARALELO = False
+    posiciones = [[(0, 0)], [(1, 2)], [(0, 0), (1, 1), (2, 2)], [(1, 2), (0, 0), (2, 1)], [(0, 1), (1, 1), (3, 2)],
+                  [(0, 1), (1, 1), (3, 2), (2, 2), (0, 3)], [(0, 0), (0, 1), (1, 0), (1, 1), (2, 3)],
+                  [(0, 0), (1, 1), (3, 3), (0, 3), (3, 0), (2, 2), (1, 2)]]
+    total = [0, 0]
+    print(f"{'fichas':>6} {'nodos fijo':>11} {'nodos dinámico':>15} {'reducción':>10} {'s fijo':>7} {'s dinámico':>11}")
+    for jugadas in posiciones:
+        tablero = crear_tablero()
+        for n, (i, j) in enumerate(jugadas):
+            tablero[i][j] = HUM if n % 2 == 0 else AI
+        nodos, tiempos = [], []
+        for ORDEN_DINAMICO in (False, True):
+            reiniciar_busqueda()
+            t0 = time.time()
+            mejor_movimiento(tablero)
+            tiempos.append(time.time() - t0)
+            nodos.append(ESTADISTICAS['nodos'])
+            total[ORDEN_DINAMICO] += ESTADISTICAS['nodos']
+        reduccion = 100.0 * (1 - nodos[1] / nodos[0]) if nodos[0] else 0.0
+        print(f"{len(jugadas):>6} {nodos[0]:>11,} {nodos[1]:>15,} {reduccion:>9.1f}% {tiempos[0]:>7.2f} {tiempos[1]:>11.2f}")
+    print(f"Total: fijo={total[0]:,}  dinámico={total[1]:,}  reducción={100.0 * (1 - total[1] / total[0]):.1f}%")
+    USAR_TABLA, ORDEN_DINAMICO, PARALELO = usar_tabla, orden_dinamico, paralelo
+
 # Entrada/Salida
 
 def leer_par_coordenadas():
@@ -445,6 +910,8 @@ def jugar():
         else:
             print("Turno de la IA (O)...")
             mov = mejor_movimiento(tablero)
+            if MOSTRAR_ESTADISTICAS:
+                print(f"[Búsqueda] {ESTADISTICAS}")
             if mov is None:
                 print("Empate.")
                 break
@@ -459,4 +926,14 @@ def jugar():
                 break
             turno = HUM
 
-jugar()
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ['comparar']:
+        comparar_ordenamiento()
+    elif sys.argv[1:] == ['paralelo']:
+        comparar_paralelo()
+    else:
+        try:
+            jugar()
+        finally:
+            cerrar_pool()
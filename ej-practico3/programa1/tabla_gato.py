@@ -0,0 +1,211 @@
+"""
+Tabla de juego perfecto del gato 4x4 (X empieza).
+
+El árbol completo del 4x4 cabe en memoria si se juntan las posiciones equivalentes por las 8 simetrías
+del tablero (canonica en gato.py): son ~1,2 millones de posiciones canónicas. Se resuelve por análisis
+retrógrado en dos pasadas:
+
+    1) hacia adelante, por cantidad de fichas k = 0..16, se enumeran las posiciones canónicas
+       alcanzables (las que ya tienen una línea completa no se expanden);
+    2) hacia atrás, de k = 16 a k = 0, el puntaje de cada posición sale de los de sus hijos en k + 1:
+       gana en p jugadas = 100 - p, empate = 0, pierde en p jugadas = -100 + p (para el que mueve).
+
+El resultado y la mejor jugada se guardan para las 8 imágenes de cada posición canónica en un arreglo de
+bytes indexado por rango, así que consultar no necesita canonizar:
+
+    rango = DESPLAZAMIENTO[k] + rango(casillas ocupadas entre las 16) * C(k, fichas de X) + rango(cuáles son de X)
+    byte  = resultado << 4 | casilla   (resultado: GANA / EMPATE / PIERDE para el que mueve; 0 = sin dato)
+
+Son 10.165.779 bytes en disco; las posiciones terminales e ilegales quedan en SIN_DATO.
+
+Uso:
+    python tabla_gato.py construir
+    python tabla_gato.py verificar [--posiciones 300] [--semilla 1]
+"""
+import argparse
+import mmap
+import os
+import random
+import time
+from math import comb
+
+from gato import (N, TABLERO_COMPLETO, ORDEN_CASILLAS, SIMETRIAS, gana_bits, casillas_libres, canonica,
+                  transformar)
+
+# ------------------------------ Configuración base ------------------------------
+RUTA_TABLA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablas', 'gato_4x4.bin')
+SIN_DATO, GANA, EMPATE, PIERDE = 0, 1, 2, 3   # resultado para el jugador al que le toca
+NOMBRES_RESULTADO = {GANA: 'gana', EMPATE: 'empate', PIERDE: 'pierde'}
+PUNTAJE_GANA = 100   # gana en p jugadas = PUNTAJE_GANA - p
+
+# ------------------------------ Rango de una posición ------------------------------
+'''
+rango_combinacion(m) es el rango de la máscara m entre las de su misma cantidad de bits (sistema
+combinatorio: suma de C(posición, orden + 1) por cada bit encendido). Se suma por bytes con tablas:
+el byte alto depende de cuántos bits tenía el bajo. COMPRIMIR[ocupadas][fichas] junta los bits de
+fichas que caen en las casillas ocupadas (por byte), para numerar cuáles de las k fichas son de X.
+'''
+FICHAS_X = [(k + 1) // 2 for k in range(N * N + 1)]
+COMBINACIONES_X = [comb(k, FICHAS_X[k]) for k in range(N * N + 1)]
+DESPLAZAMIENTO = [0]
+for k in range(N * N + 1):
+    DESPLAZAMIENTO.append(DESPLAZAMIENTO[-1] + comb(N * N, k) * COMBINACIONES_X[k])
+NUM_RANGOS = DESPLAZAMIENTO.pop()
+
+RANGO_BAJO = [sum(comb(p, orden + 1) for orden, p in enumerate(q for q in range(8) if b >> q & 1))
+              for b in range(256)]
+RANGO_ALTO = [[sum(comb(8 + p, previos + orden + 1) for orden, p in enumerate(q for q in range(8) if b >> q & 1))
+               for b in range(256)] for previos in range(9)]
+COMPRIMIR = [[sum(1 << orden for orden, p in enumerate(q for q in range(8) if ocupadas >> q & 1) if fichas >> p & 1)
+              for fichas in range(256)] for ocupadas in range(256)]
+
+def rango_combinacion(m):
+    bajo = m & 255
+    return RANGO_BAJO[bajo] + RANGO_ALTO[bajo.bit_count()][m >> 8]
+
+def rango(humano, ia):
+    """Índice de la posición en la tabla (humano = X, ia = O)."""
+    ocupadas = humano | ia
+    bajo = ocupadas & 255
+    de_x = COMPRIMIR[bajo][humano & 255] | COMPRIMIR[ocupadas >> 8][humano >> 8] << bajo.bit_count()
+    k = ocupadas.bit_count()
+    return DESPLAZAMIENTO[k] + rango_combinacion(ocupadas) * COMBINACIONES_X[k] + rango_combinacion(de_x)
+
+# ------------------------------ Construcción (análisis retrógrado) ------------------------------
+def hijos(humano, ia):
+    """(casilla, clave canónica del hijo) en el orden de ORDEN_CASILLAS."""
+    mueve_x = (humano | ia).bit_count() % 2 == 0
+    for c in casillas_libres(humano, ia):
+        if mueve_x:
+            yield c, canonica(humano | 1 << c, ia)[0]
+        else:
+            yield c, canonica(humano, ia | 1 << c)[0]
+
+def es_terminal(humano, ia):
+    return gana_bits(humano) or gana_bits(ia) or humano | ia == TABLERO_COMPLETO
+
+def construir_tabla(imprimir_progreso=True):
+    """Devuelve (tabla, puntaje de la posición inicial) con la tabla como bytearray de NUM_RANGOS bytes."""
+    t0 = time.time()
+    niveles = [{0}]
+    for k in range(N * N):
+        siguiente = set()
+        for clave in niveles[k]:
+            humano, ia = clave & 0xFFFF, clave >> 16
+            if not es_terminal(humano, ia):
+                siguiente.update(hijo for _, hijo in hijos(humano, ia))
+        niveles.append(siguiente)
+        if imprimir_progreso:
+            print(f"[Gato] k={k + 1:>2}  canónicas={len(siguiente):,}  ({time.time() - t0:.1f}s)")
+
+    tabla = bytearray(NUM_RANGOS)
+    puntajes_hijos = {}
+    for k in range(N * N, -1, -1):
+        puntajes = {}
+        for clave in niveles[k]:
+            humano, ia = clave & 0xFFFF, clave >> 16
+            if gana_bits(humano) or gana_bits(ia):
+                puntajes[clave] = -PUNTAJE_GANA  # el rival acaba de completar una línea
+                continue
+            if humano | ia == TABLERO_COMPLETO:
+                puntajes[clave] = 0
+                continue
+            mejor, mejor_casilla = None, None
+            for c, hijo in hijos(humano, ia):
+                p = puntajes_hijos[hijo]
+                # lo que es bueno para el hijo es malo para el que mueve, y una jugada más lejos
+                valor = -p + (1 if p > 0 else -1 if p < 0 else 0)
+                if mejor is None or valor > mejor:
+                    mejor, mejor_casilla = valor, c
+            puntajes[clave] = mejor
+            resultado = GANA if mejor > 0 else PIERDE if mejor < 0 else EMPATE
+            for s, permutacion in enumerate(SIMETRIAS):
+                tabla[rango(transformar(humano, s), transformar(ia, s))] = resultado << 4 | permutacion[mejor_casilla]
+        puntajes_hijos = puntajes
+        if imprimir_progreso:
+            print(f"[Gato] resuelto k={k:>2}  ({time.time() - t0:.1f}s)")
+    return tabla, puntajes_hijos[0]
+
+def guardar_tabla(ruta=RUTA_TABLA, imprimir_progreso=True):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla, puntaje = construir_tabla(imprimir_progreso)
+    with open(ruta, 'wb') as f:
+        f.write(tabla)
+    if imprimir_progreso:
+        resultado = 'gana X' if puntaje > 0 else 'gana O' if puntaje < 0 else 'empate'
+        print(f"[Gato] {ruta}  ({len(tabla):,} bytes)  posición inicial: {resultado}")
+
+# ------------------------------ Carga y consulta ------------------------------
+def cargar_tabla(ruta=RUTA_TABLA):
+    """Mapea en memoria la tabla de juego perfecto (solo lectura)."""
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No existe {ruta}. Ejecuta: python tabla_gato.py construir")
+    with open(ruta, 'rb') as f:
+        tabla = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(tabla) != NUM_RANGOS:
+        raise ValueError(f"Tamaño inesperado en {ruta}: {len(tabla)} bytes")
+    return tabla
+
+def consultar(tabla, humano, ia):
+    """(resultado, casilla) para el jugador al que le toca; None si la posición es terminal o ilegal."""
+    byte = tabla[rango(humano, ia)]
+    return None if byte == SIN_DATO else (byte >> 4, byte & 15)
+
+# ------------------------------ Verificación contra minimax ------------------------------
+def posicion_aleatoria(fichas, generador):
+    """Posición legal no terminal con esa cantidad de fichas (None si el sorteo completó una línea)."""
+    casillas = list(range(N * N))
+    generador.shuffle(casillas)
+    humano = ia = 0
+    for n, c in enumerate(casillas[:fichas]):
+        if n % 2 == 0:
+            humano |= 1 << c
+        else:
+            ia |= 1 << c
+    return None if es_terminal(humano, ia) else (humano, ia)
+
+def verificar(posiciones=300, semilla=1, ruta=RUTA_TABLA):
+    """
+    Compara con minimax de gato.py a profundidad completa en posiciones con 7 a 10 fichas: el resultado
+    debe coincidir y la jugada de la tabla debe conservarlo (el hijo queda con el resultado opuesto).
+    """
+    import gato
+    tabla = cargar_tabla(ruta)
+    generador = random.Random(semilla)
+    opuesto = {GANA: PIERDE, EMPATE: EMPATE, PIERDE: GANA}
+    n = 0
+    while n < posiciones:
+        posicion = posicion_aleatoria(generador.randint(7, 10), generador)
+        if posicion is None:
+            continue
+        humano, ia = posicion
+        n += 1
+        resultado, casilla = consultar(tabla, humano, ia)
+        turno_max = (humano | ia).bit_count() % 2 == 1  # le toca a O (la IA de gato.py)
+        valor = gato.minimax(humano, ia, gato.hash_zobrist(humano, ia), N * N, turno_max, -gato.INF, gato.INF,
+                             time.time(), float('inf'))
+        esperado = EMPATE if abs(valor) < gato.UMBRAL_GANA else GANA if (valor > 0) == turno_max else PIERDE
+        if resultado != esperado:
+            raise RuntimeError(f"Posición {n} (X={humano:#06x}, O={ia:#06x}): tabla={NOMBRES_RESULTADO[resultado]} "
+                               f"minimax={NOMBRES_RESULTADO[esperado]}")
+        if turno_max:
+            ia |= 1 << casilla
+        else:
+            humano |= 1 << casilla
+        if not es_terminal(humano, ia) and consultar(tabla, humano, ia)[0] != opuesto[resultado]:
+            raise RuntimeError(f"Posición {n}: la jugada de la tabla ({divmod(casilla, N)}) no conserva el resultado")
+    print(f"[Gato] {posiciones} posiciones verificadas contra minimax")
+
+# ------------------------------ Main ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tabla de juego perfecto del gato 4x4")
+    parser.add_argument('accion', choices=('construir', 'verificar'))
+    parser.add_argument('--ruta', default=RUTA_TABLA)
+    parser.add_argument('--posiciones', type=int, default=300)
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.accion == 'construir':
+        guardar_tabla(args.ruta)
+    else:
+        verificar(args.posiciones, args.semilla, args.ruta)